@@ -0,0 +1,10 @@
+"""Reproducible benchmarks of TextParser.
+
+Usage::
+
+    python -m benchmarks --langs RU EN --output benchmarks/results
+    python -m benchmarks --langs RU --baseline benchmarks/results
+    python -m benchmarks.homographer --windows none 20 10 5
+    python -m benchmarks.encoder --langs RU EN
+
+"""
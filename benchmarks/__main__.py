@@ -0,0 +1,63 @@
+import json
+import argparse
+
+from pathlib import Path
+
+from benchmarks.corpora import CORPORA, PROFILES
+from benchmarks.runner import compare, run_benchmark
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TextParser benchmark")
+    parser.add_argument(
+        "--langs", nargs="+", default=list(CORPORA), choices=list(CORPORA)
+    )
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=PROFILES)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument(
+        "--output", type=Path, default=None, help="directory for JSON results"
+    )
+    parser.add_argument(
+        "--baseline", type=Path, default=None, help="directory with saved results"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+
+    num_regressions = 0
+    for lang in args.langs:
+        result = run_benchmark(lang, args.profiles, args.repeats, args.device)
+
+        print(f"{lang}: init {result['cold']['init_ms']} ms")
+        for profile, stat in result["warm"].items():
+            latency = stat["latency_ms"]
+            print(
+                f"  {profile:>10}: {stat['docs_per_sec']:>8} docs/s, "
+                f"p50 {latency['p50']} ms, p95 {latency['p95']} ms, p99 {latency['p99']} ms"
+            )
+
+        if args.output is not None:
+            args.output.mkdir(parents=True, exist_ok=True)
+            path = args.output / f"{lang}.json"
+            path.write_text(
+                json.dumps(result, indent=2, sort_keys=True, ensure_ascii=False) + "\n",
+                encoding="utf-8",
+            )
+
+        if args.baseline is not None:
+            path = args.baseline / f"{lang}.json"
+            if not path.exists():
+                print(f"  no baseline {path}")
+                continue
+
+            baseline = json.loads(path.read_text(encoding="utf-8"))
+            for name, old, new in compare(baseline, result, args.tolerance):
+                print(f"  regression {name}: {old} -> {new}")
+                num_regressions += 1
+
+    if num_regressions:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+import typing as tp
+
+__all__ = ["CORPORA", "PROFILES", "MULTILANG", "LONG_SENTENCES_RU"]
+
+PROFILES = ("short", "numeric", "ssml", "paragraph")
+
+# language used to benchmark the multilingual (eSpeak) pipeline
+MULTILANG = "DE"
+
+# Corpora are fixed: changing a text invalidates all saved baselines.
+CORPORA: tp.Dict[str, tp.Dict[str, tp.List[str]]] = {
+    "RU": {
+        "short": [
+            "Привет!",
+            "Какая сегодня погода?",
+            "Включи музыку погромче.",
+            "Сколько времени?",
+            "Позвони маме.",
+            "Напомни купить хлеб.",
+            "Где ближайшая аптека?",
+            "Спасибо, всё понятно.",
+        ],
+        "numeric": [
+            "Объём продаж одноразовых масок в России снизился на 19% за 1,5 месяца.",
+            "Заседание перенесли с 12.03.2021 на 15:30 25 марта.",
+            "Позвоните по номеру +7 (495) 123-45-67 до 18:00.",
+            "Курс вырос на 2,35 руб., до 74,12 руб. за $1.",
+            "В 1889 г. население города составляло 1 265 000 чел.",
+            "Счёт матча 2:1, на 45+3 минуте забил игрок под №10.",
+            "Площадь участка — 12,5 га, а стоимость — 3,2 млн руб.",
+            "С 1990-х по 2000-е годы выпуск вырос в 3-4 раза.",
+        ],
+        "ssml": [
+            '<speak>Добрый день! <break time="300ms"/> Вас приветствует автоответчик.</speak>',
+            '<speak><say-as interpret-as="date" format="dmy">01.02.2021</say-as> '
+            "состоится встреча.</speak>",
+            '<speak>Ваш номер <say-as interpret-as="telephone">89542344213</say-as>.'
+            "</speak>",
+            '<speak><sub alias="Всемирная организация здравоохранения">ВОЗ</sub> '
+            "опубликовала отчёт.</speak>",
+            "<speak><p>Первый абзац.</p> <p>Второй абзац.</p></speak>",
+            '<speak><prosody rate="slow">Говорите медленнее.</prosody></speak>',
+        ],
+        "paragraph": [
+            "Объем валовой добавленной стоимости в сельском хозяйстве, охоте и лесном "
+            "хозяйстве России — 1,53 трлн руб. По данным Росстата, в 2007 г. общий "
+            "валовой продукт сельского хозяйства России составил 2099,6 млрд руб., из "
+            "которых на растениеводство (земледелие) приходилось 1174,9 млрд руб. "
+            "(55,96%), а на животноводство — 924,7 млрд руб.",
+            "Фото на стр. 5 ярко иллюстрирует упомянутый выше феномен, который в 1889 "
+            "году в ходе экспериментов наблюдал Эрнст Мах. На рис.3 изображена Валерия "
+            "с тремя золотыми и одной серебряной медалью, которые она завоевала в "
+            "Токио, прославив страну и родной регион.",
+            "PR-менеджер – это специалист по связям с общественностью, который "
+            "отвечает за создание и поддержание благоприятного имиджа компании. Он "
+            "готовит пресс-релизы, организует мероприятия и отвечает на вопросы "
+            "журналистов.",
+            "Был тот час, когда солнце уже село, но ещё не стемнело. Над рекой стоял "
+            "туман, и в деревне одно за другим зажигались окна. Старик вышел на "
+            "крыльцо, долго смотрел на дорогу и, не дождавшись никого, вернулся в дом.",
+        ],
+    },
+    "EN": {
+        "short": [
+            "Hello!",
+            "What's the weather like today?",
+            "Turn up the music.",
+            "What time is it?",
+            "Call mom.",
+            "Remind me to buy bread.",
+            "Where is the nearest pharmacy?",
+            "Thanks, got it.",
+        ],
+        "numeric": [
+            "The company reported revenue of $4.5 billion, up 12% from 2019.",
+            "The meeting was moved from 03/12/2021 to 3:30 pm on March 25th.",
+            "Call +1 (555) 123-4567 before 6 pm.",
+            "It covers over 17,125,191 square kilometres (6,612,073 sq mi).",
+            "The population was 145.5 million in 2021.",
+            "The score was 2:1 and player No. 10 scored in the 93rd minute.",
+            "Prices rose by 3.2% in Q3, the highest since the 1990s.",
+            "Take 2-3 tablets of 250 mg every 8 hours.",
+        ],
+        "ssml": [
+            '<speak>Good afternoon! <break time="300ms"/> You have reached the '
+            "answering machine.</speak>",
+            '<speak><say-as interpret-as="date" format="mdy">02/01/2021</say-as> '
+            "is the deadline.</speak>",
+            '<speak>Your number is <say-as interpret-as="telephone">5551234567'
+            "</say-as>.</speak>",
+            '<speak><sub alias="World Health Organization">WHO</sub> published a '
+            "report.</speak>",
+            "<speak><p>First paragraph.</p> <p>Second paragraph.</p></speak>",
+            '<speak><prosody rate="slow">Please speak slowly.</prosody></speak>',
+        ],
+        "paragraph": [
+            "Russia, or the Russian Federation, is a transcontinental country spanning "
+            "Eastern Europe and Northern Asia. It is the largest country in the world "
+            "by area, covering over 17,125,191 square kilometres, and encompassing "
+            "one-eighth of Earth's inhabitable landmass.",
+            "Russia extends across eleven time zones and borders sixteen sovereign "
+            "nations, the most of any country in the world. It is the ninth-most "
+            "populous country and the most populous country in Europe, with a "
+            "population of 145.5 million.",
+            "Moscow, the capital, is the largest city entirely within Europe, while "
+            "Saint Petersburg is the country's second-largest city and cultural "
+            "centre. Other major urban areas include Novosibirsk, Yekaterinburg, "
+            "Nizhny Novgorod and Kazan.",
+            "It was the hour when the sun had already set but it was not yet dark. A "
+            "mist stood over the river, and one after another the windows lit up in "
+            "the village. The old man went out onto the porch, looked at the road for "
+            "a long time and, having waited for no one, returned to the house.",
+        ],
+    },
+    "PT-BR": {
+        "short": [
+            "Olá!",
+            "Como está o tempo hoje?",
+            "Aumente a música.",
+            "Que horas são?",
+            "Ligue para a mamãe.",
+            "Obrigado, entendi.",
+        ],
+        "numeric": [
+            "Ela nasceu 2.08.1993 e mora no Brasil há 15 anos.",
+            "O preço subiu 3,5% e chegou a R$ 1.250,00.",
+            "A reunião foi marcada para as 15:30 do dia 25/03/2021.",
+            "O 1º lugar ficou com a equipe de 12 pessoas.",
+            "Ligue para (11) 91234-5678 até as 18h.",
+            "Entre 1990 e 1995 a produção cresceu 3 vezes.",
+        ],
+        "ssml": [
+            '<speak>Boa tarde! <break time="300ms"/> Aqui é a secretária '
+            "eletrônica.</speak>",
+            '<speak><sub alias="Organização Mundial da Saúde">OMS</sub> publicou um '
+            "relatório.</speak>",
+            "<speak><p>Primeiro parágrafo.</p> <p>Segundo parágrafo.</p></speak>",
+            '<speak><prosody rate="slow">Fale mais devagar.</prosody></speak>',
+        ],
+        "paragraph": [
+            "Era uma época de grandes transformações sociais - o começo dos anos "
+            "setenta - e não havia ainda publicações sérias a respeito de Alquimia.",
+            "O Brasil é o maior país da América do Sul e da América Latina, sendo o "
+            "quinto maior do mundo em área territorial e o sétimo em população, com "
+            "mais de 203 milhões de habitantes.",
+            "Já era a hora em que o sol se pôs, mas ainda não escurecera. Sobre o rio "
+            "pairava a neblina, e na aldeia as janelas se acendiam uma após a outra.",
+        ],
+    },
+    "KK": {
+        "short": [
+            "Сәлем!",
+            "Бүгін ауа райы қандай?",
+            "Рахмет, түсінікті.",
+            "Сағат неше?",
+        ],
+        "numeric": [
+            "4-шi жеке механикаландырылған бригадасы 1992 жылы құрылды.",
+            "Баға 23% өсіп, $ 10 болды.",
+            "Кездесу 03.31.2001 күні өтті.",
+            "1990-1995 жылдары өндіріс 3 есе өсті.",
+        ],
+        "ssml": [
+            '<speak>Сәлеметсіз бе! <break time="300ms"/> Сізді автожауапбер '
+            "қарсы алады.</speak>",
+            "<speak><p>Бірінші абзац.</p> <p>Екінші абзац.</p></speak>",
+        ],
+        "paragraph": [
+            "155-ші мотоатқыш дивизиясы, қысқаша 155-ші мад — КСРО Қарулы Күштері "
+            "Құрлық әскерлері мен Қазақстан Республикасы Қарулы Күштерінің Құрлық "
+            "әскерлері құрамындағы құрама. 4-шi жеке механикаландырылған бригадасы — "
+            "4-ші жмехбр болып жаңадан жасақталды.",
+        ],
+    },
+    "KY": {
+        "short": [
+            "Салам!",
+            "Бүгүн аба ырайы кандай?",
+            "Рахмат, түшүнүктүү.",
+            "Саат канча?",
+        ],
+        "numeric": [
+            "Ал 2001-жылы 25-декабрда төрөлгөн.",
+            "Ал 25.12.2001 төрөлгөн.",
+            "1-орунду 12 адамдан турган команда алды.",
+            "Баасы 2,5 эсеге өстү.",
+        ],
+        "ssml": [
+            '<speak>Саламатсызбы! <break time="300ms"/> Сизди автожооп берүүчү '
+            "тосуп алат.</speak>",
+            "<speak><p>Биринчи абзац.</p> <p>Экинчи абзац.</p></speak>",
+        ],
+        "paragraph": [
+            "— Дагы, куйчу! — Э, Кид, ашык болуп кетти го дейм? Виски менен спирт "
+            "аралашканда оңой иш болбойт, анын үстүнө коньяк да, перцовка да, анан... "
+            "— Куй дегенде, куя берсеңчи! Ичкилик камдап жаткан ким, менби же сенби?",
+        ],
+    },
+    MULTILANG: {
+        "short": [
+            "Hallo!",
+            "Wie ist das Wetter heute?",
+            "Danke, alles klar.",
+            "Wie spät ist es?",
+        ],
+        "numeric": [
+            "Ich bin 15 Jahre alt und habe 2 Geschwister.",
+            "Der Preis stieg um 3,5% auf 1.250 Euro.",
+            "Das Treffen findet am 25.03.2021 um 15:30 statt.",
+            "Zwischen 1990 und 1995 wuchs die Produktion um das 3-fache.",
+        ],
+        "ssml": [
+            '<speak>Guten Tag! <break time="300ms"/> Sie sind mit dem '
+            "Anrufbeantworter verbunden.</speak>",
+            "<speak><p>Erster Absatz.</p> <p>Zweiter Absatz.</p></speak>",
+        ],
+        "paragraph": [
+            "Mein Name ist Anna. Ich komme aus Österreich und lebe seit drei Jahren in "
+            "Deutschland. Ich bin 15 Jahre alt und habe zwei Geschwister: Meine "
+            "Schwester heißt Klara und ist 13 Jahre alt, mein Bruder Michael ist 18 "
+            "Jahre alt. Wir wohnen mit unseren Eltern in einem Haus in der Nähe von "
+            "München. Meine Mutter ist Köchin, mein Vater arbeitet in einer Bank.",
+        ],
+    },
+}
+
+# long sentences with several homographs for the benchmark of HomographerRU
+LONG_SENTENCES_RU: tp.List[str] = [
+    "Старик, который всю жизнь прожил в старом замке на берегу реки, каждый вечер "
+    "обходил двор, проверял, крепко ли заперт тяжёлый замок на воротах, смотрел, "
+    "не идёт ли кто по дороге, и только потом, когда дорога совсем пустела, "
+    "возвращался в дом, где его ждали ужин, старая собака и письма от детей.",
+    "Хотя эта книга была ему очень дорога как память о матери, он всё же отдал её "
+    "сестре, потому что у неё не было ни одной книги, а дорога до ближайшей "
+    "библиотеки занимала почти три часа, и зимой, когда снег заметал все пути, "
+    "добраться туда было невозможно.",
+    "Девочка с длинными светлыми волосами, которая ни на волос не отступала от "
+    "правил, прочитала в старом журнале, что в средние века каждый замок "
+    "охранялся днём и ночью, и решила, что когда вырастет, обязательно поедет "
+    "смотреть на замки и узнает, какой замок был самым неприступным.",
+    "Все опустили головы, когда учитель сказал, что у него больше нет ни одного "
+    "ответа на этот вопрос, что дела в школе идут плохо, что денег на ремонт "
+    "нет, а до конца года осталось мало времени, и попросил каждого подумать, "
+    "чем он может помочь.",
+    "В маленьком городе, где все знали друг друга, мука на мельнице всегда была "
+    "свежей, но жизнь мельника была настоящая мука, потому что каждое утро он "
+    "вставал до рассвета, шёл по тёмной дороге к реке, открывал замок на двери и "
+    "до вечера не выходил наружу.",
+    "Когда мы подъехали к воротам усадьбы, оказалось, что ворота заперты, замок "
+    "давно заржавел, а сторож уехал в город по делам, так что пришлось обойти "
+    "весь сад по узкой тропинке, перелезть через низкий забор и постучать в окно "
+    "кухни, где горел свет.",
+]
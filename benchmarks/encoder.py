@@ -0,0 +1,169 @@
+import time
+import typing as tp
+import argparse
+import resource
+import multiprocessing as mp
+
+from benchmarks.corpora import CORPORA, LONG_SENTENCES_RU
+from benchmarks.runner import _ms, percentile
+from multilingual_text_parser.utils.fs import get_root_dir
+
+__all__ = ["run_encoder_benchmark", "ENCODERS", "MODES"]
+
+# model and tokenizer directories of the homograph encoders
+ENCODERS = {
+    "RU": ("data/ru/homo_classifier/ruRoBerta", "data/ru/homo_classifier/tokenizer"),
+    "EN": (
+        "data/en/homo_classifier/albert-base-v2",
+        "data/en/tokenizer/albert-base-v2",
+    ),
+}
+
+# "hidden_states" is the former way: all hidden states are returned and one is
+# selected, "layer" is LayerEncoder
+MODES = ("hidden_states", "layer")
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def _texts(lang: str) -> tp.List[str]:
+    if lang == "RU":
+        return list(LONG_SENTENCES_RU)
+    return list(CORPORA[lang]["paragraph"])
+
+
+def _run_mode(
+    lang: str, mode: str, num_layer: tp.Optional[int], repeats: int, device: str
+) -> dict:
+    """Load the encoder and time forward passes, runs in a fresh process, so
+    the peak RSS belongs to this mode only."""
+    import torch
+
+    from transformers import AutoTokenizer
+
+    from multilingual_text_parser.utils.model_loaders import (
+        LayerEncoder,
+        load_transformer_model,
+    )
+
+    model_dir, tokenizer_dir = (get_root_dir() / path for path in ENCODERS[lang])
+    tokenizer = AutoTokenizer.from_pretrained(
+        tokenizer_dir, use_fast=True, add_prefix_space=True
+    )
+    inputs = tokenizer(
+        _texts(lang), padding=True, truncation=True, max_length=512, return_tensors="pt"
+    )
+    input_ids = inputs["input_ids"].to(device)
+    attention_mask = inputs["attention_mask"].to(device)
+
+    rss_before_load = _rss_mb()
+    if mode == "layer":
+        model = LayerEncoder(load_transformer_model(model_dir), num_layer=num_layer)
+        layer = model.num_layer
+    else:
+        model = load_transformer_model(model_dir, output_hidden_states=True)
+        layer = num_layer if num_layer is not None else model.config.num_hidden_layers
+    model.to(device).eval()
+    rss_after_load = _rss_mb()
+
+    def forward() -> torch.Tensor:
+        with torch.inference_mode():
+            if mode == "layer":
+                return model(input_ids, attention_mask)
+            outputs = model(input_ids=input_ids, attention_mask=attention_mask)
+            return outputs.hidden_states[layer]
+
+    # the first pass is not timed
+    hidden = forward()
+    if device.startswith("cuda"):
+        torch.cuda.synchronize()
+        torch.cuda.reset_peak_memory_stats()
+
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        forward()
+        if device.startswith("cuda"):
+            torch.cuda.synchronize()
+        latencies.append(time.perf_counter() - start)
+
+    result = {
+        "layer": layer,
+        "batch": list(input_ids.shape),
+        "rss_load_mb": round(rss_after_load - rss_before_load, 1),
+        "peak_rss_mb": _rss_mb(),
+        "latency_ms": {
+            "mean": _ms(sum(latencies) / len(latencies)),
+            "p50": _ms(percentile(latencies, 50)),
+            "p95": _ms(percentile(latencies, 95)),
+        },
+        "output": hidden.float().cpu().numpy(),
+    }
+    if device.startswith("cuda"):
+        result["peak_cuda_mb"] = round(torch.cuda.max_memory_allocated() / 2**20, 1)
+    return result
+
+
+def run_encoder_benchmark(
+    lang: str = "RU",
+    num_layer: tp.Optional[int] = None,
+    repeats: int = 10,
+    device: str = "cpu",
+) -> dict:
+    """Compare peak memory and latency of the homograph encoder returning all
+    hidden states with LayerEncoder.
+
+    Every mode runs in its own spawned process, because the peak RSS of a
+    process never decreases. ``max_abs_diff`` is the largest difference of
+    the outputs of the modes, it must be close to zero.
+
+    :param num_layer: layer of the encoder, the last one by default
+
+    """
+    ctx = mp.get_context("spawn")
+    results = {}
+    for mode in MODES:
+        with ctx.Pool(1) as pool:
+            results[mode] = pool.apply(
+                _run_mode, (lang, mode, num_layer, repeats, device)
+            )
+
+    outputs = [results[mode].pop("output") for mode in MODES]
+    max_abs_diff = float(abs(outputs[0] - outputs[1]).max())
+    return {
+        "lang": lang,
+        "device": device,
+        "repeats": repeats,
+        "max_abs_diff": max_abs_diff,
+        "modes": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Homograph encoder benchmark")
+    parser.add_argument("--langs", nargs="+", default=list(ENCODERS), choices=ENCODERS)
+    parser.add_argument("--num_layer", type=int, default=None)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--device", type=str, default="cpu")
+    args = parser.parse_args()
+
+    for lang in args.langs:
+        result = run_encoder_benchmark(lang, args.num_layer, args.repeats, args.device)
+        print(f"{lang}: max abs diff {result['max_abs_diff']:.2e}")
+        for mode, stat in result["modes"].items():
+            latency = stat["latency_ms"]
+            cuda = (
+                f", peak cuda {stat['peak_cuda_mb']} MB" if "peak_cuda_mb" in stat else ""
+            )
+            print(
+                f"  {mode:>13}: layer {stat['layer']}, batch {stat['batch']}, "
+                f"peak rss {stat['peak_rss_mb']} MB{cuda}, "
+                f"p50 {latency['p50']} ms, p95 {latency['p95']} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
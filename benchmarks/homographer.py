@@ -0,0 +1,109 @@
+import time
+import typing as tp
+import argparse
+
+from benchmarks.corpora import LONG_SENTENCES_RU
+from benchmarks.runner import _ms, percentile
+from multilingual_text_parser.data_types import Doc
+from multilingual_text_parser.parser import TextParser
+from multilingual_text_parser.processors import HomographerRU
+
+__all__ = ["run_homographer_benchmark"]
+
+
+def _prepare_docs(texts: tp.List[str], device: str) -> tp.List[Doc]:
+    pipe = TextParser.pipe_ru[: TextParser.pipe_ru.index("HomographerRU")]
+    parser = TextParser(lang="RU", device=device, cfg={"pipe": pipe})
+    return [parser.process(Doc(text)) for text in texts]
+
+
+def _stresses(docs: tp.List[Doc]) -> tp.List[tp.Optional[str]]:
+    return [token.stress for doc in docs for token in doc.tokens]
+
+
+def run_homographer_benchmark(
+    windows: tp.Sequence[tp.Optional[int]] = (None, 20, 10, 5),
+    merge_gap: int = 0,
+    repeats: int = 5,
+    device: str = "cpu",
+    texts: tp.Sequence[str] = LONG_SENTENCES_RU,
+) -> dict:
+    """Compare context windows of HomographerRU on long sentences.
+
+    Every window setting processes each document ``repeats`` times, the
+    agreement is the fraction of homographs resolved as with the first setting
+    (whole sentences by default).
+
+    """
+    docs = _prepare_docs(list(texts), device)
+    homographer = HomographerRU(device=device, merge_gap=merge_gap)
+
+    reference = None
+    results: tp.Dict[str, dict] = {}
+    for window in windows:
+        homographer.window = window
+        # the first pass is not timed
+        resolved = _stresses(homographer.process_batch([doc.copy() for doc in docs]))
+
+        latencies = []
+        for _ in range(repeats):
+            for doc in docs:
+                doc = doc.copy()
+                start = time.perf_counter()
+                homographer.process_batch([doc])
+                latencies.append(time.perf_counter() - start)
+
+        if reference is None:
+            reference = resolved
+        pairs = [(r, s) for r, s in zip(reference, resolved) if r is not None]
+        agreement = sum(r == s for r, s in pairs) / len(pairs) if pairs else 1.0
+
+        results[str(window)] = {
+            "docs_per_sec": round(len(latencies) / sum(latencies), 2),
+            "latency_ms": {
+                "mean": _ms(sum(latencies) / len(latencies)),
+                "p50": _ms(percentile(latencies, 50)),
+                "p95": _ms(percentile(latencies, 95)),
+            },
+            "homographs": len(pairs),
+            "agreement": round(agreement, 4),
+        }
+
+    return {
+        "device": device,
+        "repeats": repeats,
+        "merge_gap": merge_gap,
+        "docs": len(docs),
+        "tokens": sum(len(doc.tokens) for doc in docs),
+        "windows": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HomographerRU window benchmark")
+    parser.add_argument(
+        "--windows",
+        nargs="+",
+        default=["none", "20", "10", "5"],
+        help="context sizes, 'none' for whole sentences, the first one is the reference",
+    )
+    parser.add_argument("--merge_gap", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--device", type=str, default="cpu")
+    args = parser.parse_args()
+
+    windows = [None if w.lower() == "none" else int(w) for w in args.windows]
+    result = run_homographer_benchmark(windows, args.merge_gap, args.repeats, args.device)
+
+    print(f"{result['docs']} docs, {result['tokens']} tokens")
+    for window, stat in result["windows"].items():
+        latency = stat["latency_ms"]
+        print(
+            f"  window {window:>5}: {stat['docs_per_sec']:>8} docs/s, "
+            f"p50 {latency['p50']} ms, p95 {latency['p95']} ms, "
+            f"agreement {stat['agreement']} ({stat['homographs']} homographs)"
+        )
+
+
+if __name__ == "__main__":
+    main()
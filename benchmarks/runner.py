@@ -0,0 +1,155 @@
+import sys
+import math
+import time
+import typing as tp
+import platform
+
+from benchmarks.corpora import CORPORA, PROFILES
+from multilingual_text_parser._version import __version__
+from multilingual_text_parser.data_types import Doc
+from multilingual_text_parser.parser import TextParser
+from multilingual_text_parser.utils.metrics import MetricsRegistry
+
+__all__ = ["run_benchmark", "compare", "percentile"]
+
+
+def percentile(values: tp.Sequence[float], q: float) -> float:
+    """Nearest-rank percentile, q in [0, 100]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def _stage_breakdown(metrics: MetricsRegistry, lang: str) -> tp.Dict[str, dict]:
+    stages = metrics.to_dict().get(lang, {})
+    return {
+        name: {
+            "count": stat["count"],
+            "errors": stat["errors"],
+            "mean_ms": _ms(stat["sum"] / stat["count"]) if stat["count"] else 0.0,
+            "p50_ms": _ms(stat["p50"]),
+            "p95_ms": _ms(stat["p95"]),
+            "p99_ms": _ms(stat["p99"]),
+        }
+        for name, stat in stages.items()
+        if name != MetricsRegistry.PIPELINE
+    }
+
+
+def _run_profile(parser: TextParser, texts: tp.List[str], repeats: int) -> dict:
+    latencies = []
+    errors = 0
+    num_chars = 0
+
+    begin_time = time.perf_counter()
+    for _ in range(repeats):
+        for text in texts:
+            start = time.perf_counter()
+            try:
+                parser.process(Doc(text), copy=False)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+            num_chars += len(text)
+    elapsed = time.perf_counter() - begin_time
+
+    return {
+        "docs": len(latencies),
+        "errors": errors,
+        "docs_per_sec": round(len(latencies) / elapsed, 2),
+        "chars_per_sec": round(num_chars / elapsed, 1),
+        "latency_ms": {
+            "mean": _ms(sum(latencies) / len(latencies)),
+            "p50": _ms(percentile(latencies, 50)),
+            "p95": _ms(percentile(latencies, 95)),
+            "p99": _ms(percentile(latencies, 99)),
+            "max": _ms(max(latencies)),
+        },
+    }
+
+
+def run_benchmark(
+    lang: str,
+    profiles: tp.Sequence[str] = PROFILES,
+    repeats: int = 5,
+    device: str = "cpu",
+) -> dict:
+    """Benchmark TextParser on the fixed corpora of one language.
+
+    The cold run measures the construction of the parser and the first pass
+    over every text, which includes lazy loading of the models. The warm run
+    repeats each profile ``repeats`` times on the same parser.
+
+    """
+    corpus = CORPORA[lang]
+    profiles = [name for name in profiles if name in corpus]
+
+    metrics = MetricsRegistry()
+    start = time.perf_counter()
+    parser = TextParser(lang=lang, device=device, metrics=metrics)
+    init_time = time.perf_counter() - start
+
+    cold = {"init_ms": _ms(init_time), "profiles": {}}
+    for name in profiles:
+        cold["profiles"][name] = _run_profile(parser, corpus[name], repeats=1)
+    cold["stages"] = _stage_breakdown(metrics, parser.lang)
+
+    warm: tp.Dict[str, dict] = {}
+    for name in profiles:
+        metrics.reset()
+        warm[name] = _run_profile(parser, corpus[name], repeats)
+        warm[name]["stages"] = _stage_breakdown(metrics, parser.lang)
+
+    return {
+        "lang": lang,
+        "version": __version__,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "device": device,
+        "repeats": repeats,
+        "cold": cold,
+        "warm": warm,
+    }
+
+
+def compare(
+    baseline: dict, current: dict, tolerance: float = 0.1
+) -> tp.List[tp.Tuple[str, float, float]]:
+    """Find warm latencies which became worse than the baseline by more than
+    ``tolerance`` (a fraction).
+
+    :return: list of (metric path, baseline value, current value)
+
+    """
+    regressions = []
+    for profile, result in current.get("warm", {}).items():
+        base = baseline.get("warm", {}).get(profile)
+        if base is None:
+            continue
+
+        pairs = [
+            (f"{profile}.latency_ms.{k}", base["latency_ms"].get(k), v)
+            for k, v in result["latency_ms"].items()
+        ]
+        for stage, stat in result["stages"].items():
+            base_stat = base["stages"].get(stage)
+            if base_stat is not None:
+                pairs.append(
+                    (
+                        f"{profile}.stages.{stage}.p50_ms",
+                        base_stat["p50_ms"],
+                        stat["p50_ms"],
+                    )
+                )
+
+        for path, old, new in pairs:
+            if old and new > old * (1 + tolerance):
+                regressions.append((path, old, new))
+
+    return regressions
@@ -0,0 +1,140 @@
+import asyncio
+import typing as tp
+import logging
+import functools
+import threading
+
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from contextlib import contextmanager
+
+from multilingual_text_parser.data_types import Doc
+from multilingual_text_parser.parser import TextParser
+
+__all__ = ["AsyncTextParser"]
+
+LOGGER = logging.getLogger("root")
+
+
+class AsyncTextParser:
+    """Asyncio front-end for TextParser.
+
+    The pipeline runs in an executor, so the event loop is not blocked by
+    the parser. Every stage is guarded by its own lock: with several worker
+    threads different documents pass through the pipeline concurrently, but
+    each processor handles one document at a time. ``max_concurrency`` limits
+    the number of documents accepted by ``parse`` at once. When the awaiting
+    task is cancelled, processing stops before the next stage.
+
+    """
+
+    def __init__(
+        self,
+        lang: tp.Optional[str] = None,
+        device: str = "cpu",
+        cfg: tp.Optional[dict] = None,
+        parser: tp.Optional[TextParser] = None,
+        executor: tp.Optional[ThreadPoolExecutor] = None,
+        max_workers: int = 1,
+        max_concurrency: tp.Optional[int] = None,
+    ):
+        """
+        :param lang: language of the TextParser (ignored if parser is passed)
+        :param parser: existing TextParser instance
+        :param executor: ThreadPoolExecutor to run the pipeline in, a thread pool
+            with max_workers threads is created by default; the pipeline shares
+            the parser and its locks, so it can not run in a process pool
+        :param max_concurrency: maximum number of documents processed at once,
+            by default it is equal to the number of workers
+
+        """
+        if executor is not None and not isinstance(executor, ThreadPoolExecutor):
+            raise ValueError("executor must be a ThreadPoolExecutor")
+        if parser is None:
+            if lang is None:
+                raise ValueError("lang or parser must be specified")
+            parser = TextParser(lang=lang, device=device, cfg=cfg)
+
+        self._parser = parser
+        self._own_executor = executor is None
+        self._executor = (
+            executor
+            if executor is not None
+            else ThreadPoolExecutor(max_workers, thread_name_prefix="text_parser")
+        )
+        self._max_concurrency = max_concurrency if max_concurrency else max_workers
+        self._semaphore: tp.Optional[asyncio.Semaphore] = None
+        self._locks = {name: threading.Lock() for name in parser.stages}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def parser(self) -> TextParser:
+        return self._parser
+
+    @property
+    def lang(self) -> str:
+        return self._parser.lang
+
+    async def parse(self, text: tp.Union[str, Doc], **kwargs) -> Doc:
+        if self._semaphore is None:
+            # created here to bind it to the running event loop
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        doc = Doc(text) if isinstance(text, str) else text
+        cancel_event = threading.Event()
+
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self._executor, self._process, doc, cancel_event, kwargs
+            )
+            try:
+                return await future
+            except asyncio.CancelledError:
+                cancel_event.set()
+                raise
+
+    async def capitalize(self, text: str) -> str:
+        doc = await self.parse(
+            text, disable_translit=True, disable_phonemizer=True, disable_stress=True
+        )
+        return doc.capitalize
+
+    def close(self):
+        if self._own_executor:
+            self._executor.shutdown(wait=False)
+
+    @contextmanager
+    def _guard_stage(self, name: str, cancel_event: threading.Event):
+        if cancel_event.is_set():
+            raise CancelledError
+        with self._locks[name]:
+            yield
+
+    def _process(self, doc: Doc, cancel_event: threading.Event, kwargs: dict) -> Doc:
+        # the same path as TextParser.process, so the cache, the concurrent
+        # stages and the metrics are used, the stages are run under their locks
+        return self._parser._process(
+            doc.copy(),
+            kwargs,
+            stage_guard=functools.partial(self._guard_stage, cancel_event=cancel_event),
+        )
+
+
+if __name__ == "__main__":
+
+    async def main():
+        utterances = [
+            "Фото на стр. 5 ярко иллюстрирует упомянутый выше феномен.",
+            "Объём продаж одноразовых масок в России снизился на 19% за 1,5 месяца.",
+        ]
+        async with AsyncTextParser(lang="RU", max_workers=2) as async_parser:
+            docs = await asyncio.gather(*[async_parser.parse(t) for t in utterances])
+            for doc in docs:
+                print(doc.capitalize)
+
+    asyncio.run(main())
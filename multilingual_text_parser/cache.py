@@ -0,0 +1,304 @@
+import os
+import sys
+import time
+import pickle
+import sqlite3
+import typing as tp
+import hashlib
+import threading
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from multilingual_text_parser._version import __version__
+from multilingual_text_parser.data_types import Sentence
+
+__all__ = [
+    "CachedSentence",
+    "SentenceCache",
+    "DiskSentenceCache",
+    "approx_sentence_size",
+]
+
+
+@dataclass
+class CachedSentence:
+    """Result of the pipeline for one sentence.
+
+    ``sentence`` is None if the sentence was dropped by the pipeline,
+    its exception messages are kept to be added to the document.
+
+    """
+
+    sentence: tp.Optional[Sentence]
+    exception_messages: tp.List[str] = field(default_factory=list)
+    size: int = 0
+
+
+def approx_sentence_size(sent: tp.Optional[Sentence]) -> int:
+    """Rough estimate of the memory used by a processed sentence, in bytes."""
+    if sent is None:
+        return 64
+
+    size = 512 + sys.getsizeof(sent.text_orig)
+    for token in sent.tokens:
+        size += 640 + 2 * sys.getsizeof(token.text)
+        if token.phonemes:
+            size += 64 + 8 * len(token.phonemes)
+    return size
+
+
+class SentenceCache:
+    """LRU cache of fully processed sentences.
+
+    Entries are evicted when either ``max_entries`` or ``max_bytes``
+    (estimated with approx_sentence_size) is exceeded.
+
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 256 * 1024 * 1024,
+        second_level: tp.Optional["DiskSentenceCache"] = None,
+    ):
+        """
+        :param second_level: slower cache (e.g. DiskSentenceCache) which is
+            looked up on a miss and receives all new entries
+
+        """
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("cache limits must be positive numbers")
+
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._second_level = second_level
+        self._entries: "OrderedDict[tp.Hashable, CachedSentence]" = OrderedDict()
+        self._num_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: tp.Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def num_bytes(self) -> int:
+        return self._num_bytes
+
+    @property
+    def stats(self) -> tp.Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self._num_bytes,
+        }
+
+    def get(self, key: tp.Hashable) -> tp.Optional[CachedSentence]:
+        """Return a copy of the cached result, so the caller may modify it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+
+        if entry is None:
+            entry = self._second_level.get(key) if self._second_level else None
+            with self._lock:
+                if entry is None:
+                    self.misses += 1
+                    return None
+                self.hits += 1
+
+            self._put(key, entry)
+
+        return CachedSentence(
+            sentence=entry.sentence.copy() if entry.sentence is not None else None,
+            exception_messages=list(entry.exception_messages),
+            size=entry.size,
+        )
+
+    def put(self, key: tp.Hashable, entry: CachedSentence):
+        """Store a copy of the entry."""
+        if self._second_level is not None:
+            self._second_level.put(key, entry)
+        self._put(key, entry)
+
+    def _put(self, key: tp.Hashable, entry: CachedSentence):
+        entry = CachedSentence(
+            sentence=entry.sentence.copy() if entry.sentence is not None else None,
+            exception_messages=list(entry.exception_messages),
+            size=entry.size if entry.size else approx_sentence_size(entry.sentence),
+        )
+        if entry.size > self._max_bytes:
+            return
+
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self._num_bytes -= old_entry.size
+
+            self._entries[key] = entry
+            self._num_bytes += entry.size
+
+            while (
+                len(self._entries) > self._max_entries
+                or self._num_bytes > self._max_bytes
+            ):
+                _, old_entry = self._entries.popitem(last=False)
+                self._num_bytes -= old_entry.size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._num_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+class DiskSentenceCache:
+    """Persistent cache of processed sentences in a sqlite database.
+
+    The database can be shared by all processes on a host and survives restarts.
+    Every entry is stored with the parser version, entries written by another
+    version are ignored and removed. The pipeline config is a part of the keys
+    created by TextParser. Values are pickled, so the database file must not
+    come from an untrusted source.
+
+    """
+
+    def __init__(
+        self,
+        path: tp.Union[str, Path],
+        max_entries: int = 1_000_000,
+        timeout: float = 30.0,
+        version: str = __version__,
+    ):
+        """
+        :param path: path to the database file
+        :param max_entries: the oldest entries are removed above this limit
+        :param timeout: how long to wait for a lock held by another process
+
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be a positive number")
+
+        self._path = Path(path)
+        self._max_entries = max_entries
+        self._timeout = timeout
+        self._version = version
+        self._lock = threading.Lock()
+        self._conn: tp.Optional[sqlite3.Connection] = None
+        self._pid: tp.Optional[int] = None
+        self._num_puts = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._connect()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        state["_conn"] = None
+        state["_pid"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite connections must not be shared with forked processes
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(
+                self._path.as_posix(),
+                timeout=self._timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentences ("
+                "key TEXT PRIMARY KEY, version TEXT, created REAL, value BLOB)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS sentences_created ON sentences (created)"
+            )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    @staticmethod
+    def _hash_key(key: tp.Hashable) -> str:
+        return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT COUNT(*) FROM sentences WHERE version = ?", (self._version,)
+                )
+                .fetchone()
+            )
+        return row[0]
+
+    @property
+    def stats(self) -> tp.Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+    def get(self, key: tp.Hashable) -> tp.Optional[CachedSentence]:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT version, value FROM sentences WHERE key = ?",
+                    (self._hash_key(key),),
+                )
+                .fetchone()
+            )
+            if row is None or row[0] != self._version:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return pickle.loads(row[1])
+
+    def put(self, key: tp.Hashable, entry: CachedSentence):
+        value = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO sentences VALUES (?, ?, ?, ?)",
+                (self._hash_key(key), self._version, time.time(), value),
+            )
+            self._num_puts += 1
+            if self._num_puts % 1000 == 0:
+                self._prune(conn)
+
+    def _prune(self, conn: sqlite3.Connection):
+        conn.execute("DELETE FROM sentences WHERE version != ?", (self._version,))
+        conn.execute(
+            "DELETE FROM sentences WHERE key IN ("
+            "SELECT key FROM sentences ORDER BY created DESC LIMIT -1 OFFSET ?)",
+            (self._max_entries,),
+        )
+
+    def clear(self):
+        with self._lock:
+            self._connect().execute("DELETE FROM sentences")
+            self.hits = 0
+            self.misses = 0
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
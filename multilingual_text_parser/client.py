@@ -0,0 +1,187 @@
+import time
+import uuid
+import pickle
+import typing as tp
+import logging
+
+from collections import deque
+
+import zmq
+
+from multilingual_text_parser.data_types import Doc
+from multilingual_text_parser.utils.doc_codec import decode_doc
+
+__all__ = ["ParserClient"]
+
+LOGGER = logging.getLogger("root")
+
+
+class ParserClient:
+    """Client of ParserServer.
+
+    Requests are sent through a DEALER socket, so any number of them may be in
+    flight at once: ``submit`` returns a request id immediately and ``result``
+    waits for the reply with this id. Replies to requests which already timed
+    out on the client side are discarded. The client is not thread-safe, use
+    one instance per thread.
+
+    """
+
+    def __init__(
+        self,
+        addr: str = "tcp://127.0.0.1:5555",
+        timeout: tp.Optional[int] = None,  # in milliseconds
+        binary: bool = True,
+    ):
+        """
+        :param addr: address of the server, e.g. tcp://127.0.0.1:5555
+        :param timeout: default timeout of a request, also sent to the server
+            so that a request which waited there too long is not processed
+        :param binary: receive documents in the compact binary format instead of
+            pickle, meta dicts of the documents are not transferred then
+
+        """
+        self._addr = addr
+        self._timeout = timeout
+        self._binary = binary
+        self._context = zmq.Context()
+        self._socket = self._context.socket(zmq.DEALER)
+        self._socket.setsockopt(zmq.LINGER, 0)
+        self._socket.connect(addr)
+        self._results: tp.Dict[bytes, tp.Union[Doc, Exception]] = {}
+        self._in_flight: tp.Set[bytes] = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def addr(self) -> str:
+        return self._addr
+
+    @property
+    def num_in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def submit(
+        self,
+        text: tp.Union[str, Doc],
+        timeout: tp.Optional[int] = None,  # in milliseconds
+        **kwargs,
+    ) -> bytes:
+        """Send a request without waiting for the reply.
+
+        :return: id of the request
+
+        """
+        timeout = timeout if timeout is not None else self._timeout
+        request_id = uuid.uuid4().bytes
+        payload = pickle.dumps(
+            (text, kwargs, self._binary), protocol=pickle.HIGHEST_PROTOCOL
+        )
+        timeout_frame = str(timeout).encode() if timeout else b""
+        self._socket.send_multipart([request_id, timeout_frame, payload])
+        self._in_flight.add(request_id)
+        return request_id
+
+    def result(
+        self,
+        request_id: bytes,
+        timeout: tp.Optional[int] = None,  # in milliseconds
+    ) -> Doc:
+        """Wait for the reply to the request and return the processed document.
+
+        Errors of the server are raised here, TimeoutError is raised if there
+        is no reply within the timeout.
+
+        """
+        if request_id not in self._in_flight and request_id not in self._results:
+            raise KeyError("unknown request id")
+
+        timeout = timeout if timeout is not None else self._timeout
+        deadline = time.monotonic() + timeout / 1000 if timeout else None
+        while request_id not in self._results:
+            wait = None
+            if deadline is not None:
+                wait = max(int((deadline - time.monotonic()) * 1000), 0)
+            if not self._socket.poll(timeout=wait):
+                self._in_flight.discard(request_id)
+                raise TimeoutError("no reply from the parser server")
+            self._receive()
+
+        result = self._results.pop(request_id)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _receive(self):
+        while True:
+            try:
+                frames = self._socket.recv_multipart(zmq.NOBLOCK, copy=False)
+            except zmq.Again:
+                return
+
+            request_id = frames[0].bytes
+            if request_id in self._in_flight:
+                self._in_flight.discard(request_id)
+                if len(frames) == 2:
+                    self._results[request_id] = pickle.loads(frames[1].buffer)
+                else:
+                    buffers = [frame.buffer for frame in frames[1:]]
+                    self._results[request_id] = decode_doc(buffers)
+            else:
+                LOGGER.debug(f"discard late reply {request_id.hex()}")
+
+    def process(
+        self,
+        text: tp.Union[str, Doc],
+        timeout: tp.Optional[int] = None,  # in milliseconds
+        **kwargs,
+    ) -> Doc:
+        return self.result(self.submit(text, timeout, **kwargs), timeout)
+
+    def imap(
+        self,
+        texts: tp.Iterable[tp.Union[str, Doc]],
+        max_in_flight: int = 64,
+        timeout: tp.Optional[int] = None,  # in milliseconds
+        **kwargs,
+    ) -> tp.Iterator[tp.Union[Doc, Exception]]:
+        """Process texts keeping up to ``max_in_flight`` requests on the server.
+
+        Results are yielded in the input order, a failed request is yielded
+        as its exception.
+
+        """
+        queue: tp.Deque[bytes] = deque()
+        for text in texts:
+            queue.append(self.submit(text, timeout, **kwargs))
+            if len(queue) >= max_in_flight:
+                yield self._result_or_exception(queue.popleft(), timeout)
+
+        while queue:
+            yield self._result_or_exception(queue.popleft(), timeout)
+
+    def _result_or_exception(
+        self, request_id: bytes, timeout: tp.Optional[int]
+    ) -> tp.Union[Doc, Exception]:
+        try:
+            return self.result(request_id, timeout)
+        except Exception as e:
+            return e
+
+    def close(self):
+        self._socket.close()
+        self._context.term()
+
+
+if __name__ == "__main__":
+    utterances = [
+        "Фото на стр. 5 ярко иллюстрирует упомянутый выше феномен.",
+        "Объём продаж одноразовых масок в России снизился на 19% за 1,5 месяца.",
+    ]
+    with ParserClient("tcp://127.0.0.1:5555", timeout=10000) as client:
+        for _doc in client.imap(utterances):
+            print(_doc if isinstance(_doc, Exception) else _doc.capitalize)
@@ -1,10 +1,12 @@
 import re
+import sys
 import enum
-import uuid
 import typing as tp
+import weakref
 import itertools
 
-from copy import deepcopy
+from copy import copy, deepcopy
+from operator import attrgetter
 
 from natasha import Segmenter
 from natasha.doc import Doc as NatashaDoc
@@ -20,64 +22,341 @@ from multilingual_text_parser._constants import (
 __all__ = ["Position", "Token", "Syntagma", "Sentence", "Doc", "TokenUtils"]
 
 
+def _copy_containers(attrs: tp.Dict[str, tp.Any]) -> tp.Dict[str, tp.Any]:
+    return {
+        k: v.copy() if isinstance(v, (list, dict, set)) else v for k, v in attrs.items()
+    }
+
+
+# Versions of sentences and documents are unique numbers, next() of the
+# counter is atomic, so concurrent changes never repeat an old version.
+_versions = itertools.count()
+
+
+def _notify(owners: tp.Tuple[weakref.ref, ...]):
+    """Change the versions of the alive owners of a modified object."""
+    for ref in owners:
+        owner = ref()
+        if owner is not None:
+            owner._touch()
+
+
+class _TrackedList(list):
+    """List which changes the versions of its owners on every in-place modification."""
+
+    __slots__ = ("_owners",)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._owners: tp.Tuple[weakref.ref, ...] = ()
+
+    def copy(self) -> "_TrackedList":
+        return _TrackedList(self)
+
+    def __reduce__(self):
+        return _TrackedList, (list(self),)
+
+
+def _tracked_method(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        _notify(self._owners)
+        return result
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+):
+    setattr(_TrackedList, _name, _tracked_method(_name))
+
+
+def _track(items: tp.Optional[tp.List]) -> tp.Optional[tp.List]:
+    if items is None or isinstance(items, _TrackedList):
+        return items
+    return _TrackedList(items)
+
+
+def _tracked_field(name: str) -> property:
+    """Property stored in the slot ``_<name>`` which notifies the token owners.
+
+    List values (e.g. the stress variants made by get_stress_from_tokens) are
+    stored as tracked lists, so their in-place changes notify the owners too.
+
+    """
+    slot = f"_{name}"
+    getter = attrgetter(slot)
+
+    def fset(self, value):
+        if type(value) is list:
+            value = _TrackedList(value)
+        if getter(self) is not value:
+            setattr(self, slot, value)
+            _notify(self._owners)
+
+    return property(getter, fset)
+
+
+class _CachedViews:
+    """Memoization of the views derived from tokens (text, stress, words, ...).
+
+    Sentences and documents have their own versions. The version changes when
+    the object's tracked list or an item of it (a token of a sentence, a
+    sentence of a document, a list value of a token field) is modified: before a view is computed, the object
+    registers itself with weak references as an owner of the list and of the
+    items. A cached value is valid while the version is unchanged, the values
+    are not pickled or copied.
+
+    """
+
+    _views: tp.Dict[tp.Any, tp.Any]
+    _views_version: int
+    _version: int
+    _ref: weakref.ref
+    _sole_owner: tp.Tuple[weakref.ref]
+    _owners: tp.Tuple[weakref.ref, ...]
+
+    def _init_views(self):
+        self._views = {}
+        self._views_version = -1
+        self._version = next(_versions)
+        self._ref = weakref.ref(self)
+        # tuple shared by the items owned only by this object
+        self._sole_owner = (self._ref,)
+        self._owners = ()
+
+    def _touch(self):
+        self._version = next(_versions)
+        _notify(self._owners)
+
+    def _register(self):
+        """Register the object as an owner of its tracked list and its items."""
+        raise NotImplementedError
+
+    def _adopt(self, items: tp.Iterable[tp.Any]):
+        ref, sole_owner = self._ref, self._sole_owner
+        for item in items:
+            owners = item._owners
+            if owners is sole_owner:
+                continue
+            if not owners:
+                item._owners = sole_owner
+            elif not any(owner is ref for owner in owners):
+                alive = tuple(owner for owner in owners if owner() is not None)
+                item._owners = alive + sole_owner
+
+    def _view(self, key: tp.Any, func: tp.Callable, *args):
+        version = self._version
+        if self._views_version != version:
+            self._views = {}
+            self._views_version = version
+            self._register()
+
+        views = self._views
+        if key in views:
+            return views[key]
+
+        value = func(*args)
+        # computing the value may change the tokens, e.g. get_stress_from_tokens
+        if self._version == version:
+            views[key] = value
+        return value
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in _CachedViews.__annotations__:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_views()
+
+
 class Position(enum.Enum):
     first = 0
     internal = 1
     last = 2
 
 
-class Token(DocToken):
-    def __init__(self, token: tp.Union[str, DocToken]):
-        self.__uuid = uuid.uuid4().hex
-        self._text: str = ""
+class Token:
+    """Token of a sentence.
+
+    Tokens are created for every word and punctuation mark of the processed
+    text, so the class uses __slots__ instead of a per-instance __dict__, the
+    meta dict is allocated on first access and texts are interned. Tokens are
+    compared by identity. The class is compatible with natasha.doc.DocToken
+    (the same attributes, iteration and lemmatize), which the natasha models
+    use to fill pos, feats, lemma and syntax relations.
+
+    """
+
+    __attributes__ = DocToken.__attributes__
+
+    __slots__ = (
+        "start",
+        "stop",
+        "_text",
+        "id",
+        "head_id",
+        "rel",
+        "pos",
+        "feats",
+        "lemma",
+        "text_orig",
+        "_norm",
+        "emphasis",
+        "_stress",
+        "_phonemes",
+        "attr",
+        "is_preposition",
+        "is_sub",
+        "_is_capitalize",
+        "_is_name",
+        "normalized",
+        "modifiers",
+        "interpret_as",
+        "tag",
+        "format",
+        "token_id",
+        "_meta",
+        "from_ssml",
+        "prosody",
+        "asr_pause",
+        "_owners",
+    )
+    # owners are not copied or pickled, the slot is the last one
+    _STATE_SLOTS = __slots__[:-1]
+
+    # fields read by the cached views of Sentence and Doc, they are stored in
+    # the slots with an underscore and their changes notify the owners
+    TRACKED_FIELDS = ("text", "norm", "stress", "phonemes", "is_capitalize", "is_name")
+
+    norm = _tracked_field("norm")
+    stress = _tracked_field("stress")
+    phonemes = _tracked_field("phonemes")
+    is_capitalize = _tracked_field("is_capitalize")
+    is_name = _tracked_field("is_name")
+
+    def __init__(self, token: tp.Union[str, DocToken, "Token"]):
         self.text_orig: str = ""
-        self.norm: str = ""
         self.emphasis: str = "no"
-        self.stress: tp.Optional[tp.Union[str, tp.List[str]]] = None
-        self.phonemes: tp.Optional[tp.Tuple[str, ...]] = None
+        self._phonemes: tp.Optional[tp.Tuple[str, ...]] = None
         self.attr: tp.Optional[dict] = None
         self.is_preposition: bool = False
         self.is_sub: bool = False
-        self.is_capitalize: bool = False
-        self.is_name: bool = False
+        self._is_capitalize: bool = False
+        self._is_name: bool = False
         self.normalized: bool = False
         self.modifiers = None
         self.interpret_as = None
         self.tag = None
         self.format = None
-        self.id: str = None  # type: ignore
         self.token_id: str = None  # type: ignore
-        self.rel: str = None  # type: ignore
-        self.meta: tp.Dict[str, tp.Any] = {}
+        self._meta: tp.Optional[tp.Dict[str, tp.Any]] = None
         self.from_ssml: bool = False
-        self.prosody: tp.Optional[int] = None
+        self.prosody: tp.Optional[str] = None
         self.asr_pause: tp.Optional[str] = None
+        self._owners: tp.Tuple[weakref.ref, ...] = ()
 
         if isinstance(token, str):
-            super().__init__(None, None, token)
+            values: tp.Tuple[tp.Any, ...] = (None, None, token)
         else:
-            super().__init__(*token.__dict__.values())
+            values = tuple(token)
+        values += (None,) * (len(self.__attributes__) - len(values))
+        (
+            self.start,
+            self.stop,
+            text,
+            self.id,
+            self.head_id,
+            self.rel,
+            self.pos,
+            self.feats,
+            self.lemma,
+        ) = values
+        self._stress, self._text, self._norm = self._parse_text(
+            text if text is not None else ""
+        )
 
     def __len__(self) -> int:
         return len(self.text) if self.text else 0
 
+    def __iter__(self):
+        return (getattr(self, name) for name in self.__attributes__)
+
+    def __repr__(self) -> str:
+        args = ", ".join(
+            f"{name}={getattr(self, name)!r}" for name in self.__attributes__
+        )
+        return f"{self.__class__.__name__}({args})"
+
     def __copy__(self):
-        new_token = Token("")
-        new_token.__dict__ = self.__dict__.copy()
-        new_token.__uuid = uuid.uuid4().hex
+        new_token = self.__class__.__new__(self.__class__)
+        for name in Token._STATE_SLOTS:
+            setattr(new_token, name, getattr(self, name))
+        new_token._owners = ()
         return new_token
 
     def __deepcopy__(self, memo):
-        new_token = Token("")
-        new_token.__dict__ = deepcopy(self.__dict__)
-        new_token.__uuid = uuid.uuid4().hex
+        new_token = self.__class__.__new__(self.__class__)
+        memo[id(self)] = new_token
+        for name in Token._STATE_SLOTS:
+            setattr(new_token, name, deepcopy(getattr(self, name), memo))
+        new_token._owners = ()
         return new_token
 
-    def __eq__(self, other):
-        if isinstance(other, Token):
-            return self.__uuid == other.__uuid
-        else:
-            return False
+    # identity equality and hashing of object are used,
+    # a copy of a token is a different token
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in Token._STATE_SLOTS)
+
+    def __setstate__(self, state):
+        for name, value in zip(Token._STATE_SLOTS, state):
+            setattr(self, name, value)
+        self._owners = ()
+
+    def copy(self) -> "Token":
+        """Cheap alternative to deepcopy, only mutable containers are copied."""
+        new_token = self.__class__.__new__(self.__class__)
+        for name in Token._STATE_SLOTS:
+            value = getattr(self, name)
+            if isinstance(value, (list, dict, set)):
+                value = value.copy()
+            setattr(new_token, name, value)
+        new_token._owners = ()
+        return new_token
+
+    def lemmatize(self, vocab):
+        self.lemma = vocab.lemmatize(self.text, self.pos, self.feats)
+
+    @property
+    def meta(self) -> tp.Dict[str, tp.Any]:
+        if self._meta is None:
+            self._meta = {}
+        return self._meta
+
+    @meta.setter
+    def meta(self, meta: tp.Dict[str, tp.Any]):
+        self._meta = meta
 
     @property
     def text(self) -> str:
@@ -86,13 +365,19 @@ class Token(DocToken):
     @text.setter
     def text(self, text: str):
         if text is not None:
-            if "+" in text and not text.startswith("+"):
-                self.stress = text
-                text = text.replace("+", "")
-            else:
-                self.stress = None
-            self._text = text
-            self.norm = self.remove_punctuation(text)
+            self.stress, text, self.norm = self._parse_text(text)
+            if text is not self._text:
+                self._text = text
+                _notify(self._owners)
+
+    @classmethod
+    def _parse_text(cls, text: str) -> tp.Tuple[tp.Optional[str], str, str]:
+        if "+" in text and not text.startswith("+"):
+            stress: tp.Optional[str] = text
+            text = text.replace("+", "")
+        else:
+            stress = None
+        return stress, sys.intern(text), sys.intern(cls.remove_punctuation(text))
 
     @property
     def is_punctuation(self) -> bool:
@@ -350,7 +635,7 @@ class Syntagma:
         }
 
 
-class Sentence(DocSent):
+class Sentence(_CachedViews, DocSent):
     def __init__(self, sent: DocSent = None, tokenize=True):
         from multilingual_text_parser._version import __version__
 
@@ -359,8 +644,9 @@ class Sentence(DocSent):
         self.lang = None
 
         self._text: str = ""
-        self._tokens: tp.List[Token] = []
+        self._tokens: tp.List[Token] = _TrackedList()
         self._syntagmas: tp.Optional[tp.List[Syntagma]] = None
+        self._init_views()
 
         self._add_space = re.compile(f"([{PUNCTUATION}])")
         self._remove_space = re.compile(r'\s([,.?!:;"](?:\s|$))')
@@ -412,9 +698,9 @@ class Sentence(DocSent):
     @tokens.setter
     def tokens(self, tokens: tp.List[Token]):
         if tokens and not isinstance(tokens[0], Token):
-            self._tokens = [Token(token) for token in tokens]
-        else:
-            self._tokens = tokens
+            tokens = [Token(token) for token in tokens]
+        self._tokens = _track(tokens)
+        self._touch()
 
     @property
     def syntagmas(self):
@@ -429,25 +715,28 @@ class Sentence(DocSent):
     @property
     def text(self):
         if self.tokens:
-            return TokenUtils.get_text_from_tokens(self.tokens)
+            return self._view("text", TokenUtils.get_text_from_tokens, self.tokens)
         else:
             return self._text
 
     @text.setter
     def text(self, text: str):
         self._text = text
+        self._touch()
 
     @property
     def capitalize(self):
         if self.tokens:
-            return TokenUtils.get_text_from_tokens(self.tokens, with_capitalize=True)
+            return self._view(
+                "capitalize", TokenUtils.get_text_from_tokens, self.tokens, False, True
+            )
         else:
             return self._text
 
     @property
     def stress(self):
         if self.tokens:
-            return TokenUtils.get_stress_from_tokens(self.tokens)
+            return self._view("stress", TokenUtils.get_stress_from_tokens, self.tokens)
         else:
             return self._text
 
@@ -457,11 +746,44 @@ class Sentence(DocSent):
 
     @property
     def num_words(self) -> int:
-        return len(self.get_words())
+        return len(self._words(True))
 
     @property
     def num_phonemes(self) -> int:
-        return sum([len(word) for word in self.get_phonemes()])
+        return sum([len(word) for word in self._phonemes_view(False)])
+
+    def copy(self) -> "Sentence":
+        """Cheap alternative to deepcopy, tokens and mutable containers are copied."""
+        new_sent = self.__class__.__new__(self.__class__)
+        new_sent.__dict__ = _copy_containers(self.__dict__)
+        new_sent._init_views()
+
+        if self._tokens:
+            new_sent._tokens = _TrackedList([token.copy() for token in self._tokens])
+
+        if self._syntagmas:
+            tokens_map = {
+                id(old): new for old, new in zip(self._tokens, new_sent._tokens)
+            }
+            new_sent._syntagmas = []
+            for syntagma in self._syntagmas:
+                new_syntagma = copy(syntagma)
+                new_syntagma.tokens = [tokens_map[id(t)] for t in syntagma.tokens]
+                new_sent._syntagmas.append(new_syntagma)
+
+        return new_sent
+
+    def _register(self):
+        tokens = self._tokens
+        if tokens is not None:
+            self._adopt((tokens,))
+            self._adopt(tokens)
+            self._adopt(
+                value
+                for token in tokens
+                for value in (token._stress, token._phonemes)
+                if type(value) is _TrackedList
+            )
 
     def remove(self, token: Token):
         if self._tokens:
@@ -474,45 +796,65 @@ class Sentence(DocSent):
     def as_norm(self) -> str:
         return " ".join([token.norm for token in self.tokens if len(token.norm) > 0])
 
-    def get_words(self, sil_as_word: bool = True) -> tp.List[Token]:
-        group = TokenUtils.group_tokens_by_word(self.tokens, sil_as_word)
+    def _get_words(self, sil_as_word: bool) -> tp.Tuple[Token, ...]:
         words: tp.List[Token] = []
-        for tokens in group:
-            word = self._find_word_tokens(tokens, sil_as_word)
+        for tokens in self._word_groups(sil_as_word):
+            word = self._find_word_tokens(tokens, sil_as_word)  # type: ignore
             if word:
                 words.append(word)
-        return words
+        return tuple(words)
+
+    def _words(self, sil_as_word: bool) -> tp.Tuple[Token, ...]:
+        return self._view(("words", sil_as_word), self._get_words, sil_as_word)
+
+    def get_words(self, sil_as_word: bool = True) -> tp.List[Token]:
+        # cached views are tuples, callers get their own lists
+        return list(self._words(sil_as_word))
+
+    def _group_tokens_by_word(self, sil_as_word: bool) -> tp.Tuple[tp.Tuple[Token, ...]]:
+        group = TokenUtils.group_tokens_by_word(self.tokens, sil_as_word)
+        return tuple(tuple(tokens) for tokens in group)
+
+    def _word_groups(self, sil_as_word: bool) -> tp.Tuple[tp.Tuple[Token, ...]]:
+        return self._view(
+            ("groups", sil_as_word), self._group_tokens_by_word, sil_as_word
+        )
 
     def get_words_with_punct(self, sil_as_word: bool = True) -> tp.List[tp.List[Token]]:
-        return TokenUtils.group_tokens_by_word(self.tokens, sil_as_word)
+        return [list(tokens) for tokens in self._word_groups(sil_as_word)]
 
     def get_attr(
         self, attr_name: str, with_punct: bool = True, group: bool = False
     ) -> tp.List[tp.Union[Token, tp.List[Token]]]:
         if group:
-            attr_by_words = TokenUtils.get_attr_by_words(
-                self.tokens, [attr_name], with_punct
+            attr_by_words = TokenUtils._get_attr(
+                self._word_groups(True), [attr_name], with_punct  # type: ignore
             )
             return [item[attr_name] for item in attr_by_words]
         else:
             attr = TokenUtils.get_attr(self.tokens, [attr_name], with_punct)
             return attr[attr_name]  # type: ignore
 
+    def _get_phonemes(self, as_tuple: bool) -> tp.Tuple:
+        if not as_tuple:
+            return tuple(word.phonemes for word in self._words(True) if word.phonemes)
+        else:
+            return tuple(itertools.chain.from_iterable(self._phonemes_view(False)))
+
+    def _phonemes_view(self, as_tuple: bool) -> tp.Tuple:
+        return self._view(("phonemes", as_tuple), self._get_phonemes, as_tuple)
+
     def get_phonemes(
         self, as_tuple: bool = False
     ) -> tp.Union[tp.List[tp.Tuple[str, ...]], tp.Tuple[str]]:
-        words = self.get_words()
-        if not as_tuple:
-            return [word.phonemes for word in words if word.phonemes]
-        else:
-            return tuple(itertools.chain.from_iterable(self.get_phonemes()))
+        phonemes = self._phonemes_view(as_tuple)
+        return phonemes if as_tuple else list(phonemes)
 
     def get_token_index(self, token: Token) -> int:
         return self.tokens.index(token)
 
     def get_word_index(self, word: Token) -> int:
-        words = self.get_words_with_punct()
-        for idx, tokens in enumerate(words):
+        for idx, tokens in enumerate(self._word_groups(True)):
             if word in tokens:
                 return idx
         else:
@@ -527,7 +869,7 @@ class Sentence(DocSent):
         return ret
 
 
-class Doc(NatashaDoc):
+class Doc(_CachedViews, NatashaDoc):
     def __init__(
         self,
         text: str,
@@ -540,6 +882,7 @@ class Doc(NatashaDoc):
 
         self._text: str = text
         self._sents: tp.Optional[tp.List[Sentence]] = None
+        self._init_views()
 
         self.tags_replacement_map = None
         self.pauses_durations = None
@@ -560,7 +903,7 @@ class Doc(NatashaDoc):
     @staticmethod
     def text_from_sentence(sents: tp.List[Sentence]) -> "Text":
         _text = Doc("", add_trailing_punct_token=False)
-        _text._sents = sents
+        _text._sents = _track(sents)
         _text._text = _text.text
         _text.text_orig = _text._text
         return _text
@@ -576,12 +919,13 @@ class Doc(NatashaDoc):
         else:
             return ValueError
 
+    def _get_tokens(self) -> tp.Tuple[Token, ...]:
+        return tuple(itertools.chain.from_iterable([sent.tokens for sent in self.sents]))
+
     @property
     def tokens(self):
         if self.sents:
-            return list(
-                itertools.chain.from_iterable([sent.tokens for sent in self.sents])
-            )
+            return list(self._view("tokens", self._get_tokens))
 
     @tokens.setter
     def tokens(self, tokens: tp.List[Token]):
@@ -593,7 +937,9 @@ class Doc(NatashaDoc):
 
     @sents.setter
     def sents(self, sents: tp.List[Sentence]):
-        self._sents = sents
+        # only the views of this document depend on the list of sentences
+        self._sents = _track(sents)
+        self._touch()
         if self.sents:
             self.tokens = list(
                 itertools.chain.from_iterable(
@@ -604,7 +950,7 @@ class Doc(NatashaDoc):
     @property
     def text(self):
         if self.sents is not None:
-            return " ".join([sent.text for sent in self.sents])
+            return self._view("text", self._join, "text")
         else:
             return self._text
 
@@ -615,17 +961,61 @@ class Doc(NatashaDoc):
     @property
     def capitalize(self):
         if self.sents is not None:
-            return " ".join([sent.capitalize for sent in self.sents])
+            return self._view("capitalize", self._join, "capitalize")
         else:
             return self._text
 
     @property
     def stress(self):
         if self.sents is not None:
-            return " ".join([sent.stress for sent in self.sents])
+            return self._view("stress", self._join, "stress")
         else:
             return self._text
 
+    def _register(self):
+        sents = self._sents
+        if sents is not None:
+            self._adopt((sents,))
+            self._adopt(sents)
+            # views of the document read the token lists of the sentences
+            for sent in sents:
+                sent._register()
+
+    def _join(self, view: str) -> str:
+        return " ".join([getattr(sent, view) for sent in self.sents])
+
+    def copy(self) -> "Doc":
+        """Cheap alternative to deepcopy, sentences and tokens are copied."""
+        new_doc = self.__class__.__new__(self.__class__)
+        new_doc.__dict__ = _copy_containers(self.__dict__)
+        new_doc._init_views()
+        if self._sents is not None:
+            new_doc._sents = _TrackedList([sent.copy() for sent in self._sents])
+        return new_doc
+
+    def to_bytes(self, phonemes: tp.Optional[tp.Sequence[str]] = None) -> bytes:
+        """Compact versioned binary encoding of the parse result.
+
+        Strings are stored once in a string table and phonemes as integer ids,
+        see multilingual_text_parser.utils.doc_codec. Meta dicts are not saved.
+
+        :param phonemes: phoneme inventory (e.g. TextParser.phonemes), the same
+            inventory must be passed to from_bytes
+
+        """
+        from multilingual_text_parser.utils.doc_codec import encode_doc, join_frames
+
+        return join_frames(encode_doc(self, phonemes))
+
+    @staticmethod
+    def from_bytes(
+        buffer: tp.Union[bytes, memoryview],
+        phonemes: tp.Optional[tp.Sequence[str]] = None,
+    ) -> "Doc":
+        from multilingual_text_parser.utils.doc_codec import decode_doc, split_frames
+
+        return decode_doc(split_frames(buffer), phonemes)
+
     def sentenize(self, tokenize: bool = True):
         self.sents = [
             Sentence(sent, tokenize)
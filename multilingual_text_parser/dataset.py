@@ -0,0 +1,411 @@
+import os
+import json
+import bisect
+import shutil
+import typing as tp
+
+from pathlib import Path
+
+import numpy as np
+
+from multilingual_text_parser.data_types import Doc, Position, Sentence
+from multilingual_text_parser.features import PAD_ID, FeatureExporter, split_phoneme
+
+__all__ = ["FORMAT_VERSION", "DatasetWriter", "DatasetReader"]
+
+FORMAT_VERSION = 1
+
+_META_FILE = "meta.json"
+
+# columns of strings are stored as utf-8 data, offsets and a mask of None values
+_SENT_STR = ("text", "stress")
+_SYNTAGMA_STR = ("text",)
+_TOKEN_STR = ("text", "norm", "pos", "stress")
+
+
+def _shard_name(idx: int) -> str:
+    return f"shard_{idx:05d}"
+
+
+def _load_phonemes(meta: dict) -> tp.List[str]:
+    # older writers saved tuples of IPA characters as JSON lists
+    return ["".join(ph) if isinstance(ph, list) else ph for ph in meta["phonemes"]]
+
+
+class _StringColumn:
+    def __init__(self):
+        self.values: tp.List[tp.Optional[str]] = []
+
+    def append(self, value: tp.Optional[str]):
+        self.values.append(value)
+
+    def save(self, path: Path, name: str):
+        encoded = [v.encode("utf-8") if v is not None else b"" for v in self.values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(v) for v in encoded], out=offsets[1:])
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        np.save(path / f"{name}.data.npy", data)
+        np.save(path / f"{name}.offsets.npy", offsets)
+        np.save(path / f"{name}.null.npy", np.array([v is None for v in self.values]))
+
+
+class DatasetWriter:
+    """Writes processed sentences to a sharded dataset.
+
+    Every shard is a directory of flat .npy arrays: sentences, syntagmas,
+    tokens and phonemes are stored one after another with offset arrays
+    pointing into the next level, strings are stored as utf-8 data with
+    offsets. Phonemes are stored as ids of FeatureExporter (id 0 is padding),
+    the inventory is saved in meta.json. Multi-character IPA phonemes are
+    stored as their symbols (see split_phoneme): symbols of the inventory if
+    it is given, otherwise the phoneme is one string symbol. A shard becomes
+    visible to readers only when it is complete, so an interrupted writer
+    loses at most the last ``shard_size`` sentences.
+
+    """
+
+    def __init__(
+        self,
+        path: tp.Union[str, Path],
+        phonemes: tp.Optional[tp.Sequence[str]] = None,
+        shard_size: int = 100_000,
+    ):
+        """
+        :param path: directory of the dataset, an existing dataset is appended
+        :param phonemes: phoneme inventory (e.g. TextParser.phonemes), if None
+            the inventory is collected from the written sentences
+        :param shard_size: number of sentences in a shard
+
+        """
+        self._path = Path(path)
+        self._path.mkdir(parents=True, exist_ok=True)
+        self._shard_size = shard_size
+
+        self._meta = self._load_meta()
+        if phonemes is not None:
+            if self._meta["phonemes"] and self._meta["phonemes"] != list(phonemes):
+                raise ValueError("the dataset was written with another phoneme inventory")
+            self._meta["phonemes"] = list(phonemes)
+        self._fixed_inventory = phonemes is not None
+        # the same mapping as FeatureExporter, a repeated symbol gets its first id
+        self._phoneme_index = FeatureExporter._build_table(self._meta["phonemes"])
+        self._reset()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def num_sentences(self) -> int:
+        return sum(self._meta["shards"].values()) + self._num_sents
+
+    def _load_meta(self) -> dict:
+        meta_path = self._path / _META_FILE
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if meta["format_version"] != FORMAT_VERSION:
+                raise ValueError(f"unsupported format version {meta['format_version']}")
+            meta["phonemes"] = _load_phonemes(meta)
+            return meta
+        return {"format_version": FORMAT_VERSION, "phonemes": [], "shards": {}}
+
+    def _save_meta(self):
+        tmp_path = self._path / f"{_META_FILE}.tmp"
+        tmp_path.write_text(json.dumps(self._meta, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self._path / _META_FILE)
+
+    def _reset(self):
+        self._num_sents = 0
+        self._sent_str = {name: _StringColumn() for name in _SENT_STR}
+        self._sent_position: tp.List[int] = []
+        self._sent_tokens: tp.List[int] = [0]
+        self._sent_syntagmas: tp.List[int] = [0]
+        self._syntagma_str = {name: _StringColumn() for name in _SYNTAGMA_STR}
+        self._syntagma_position: tp.List[int] = []
+        self._syntagma_bounds: tp.List[tp.Tuple[int, int]] = []
+        self._token_str = {name: _StringColumn() for name in _TOKEN_STR}
+        self._token_stress_is_list: tp.List[bool] = []
+        self._token_phonemes: tp.List[int] = [0]
+        self._token_phonemes_null: tp.List[bool] = []
+        self._phoneme_ids: tp.List[int] = []
+
+    def _phoneme_id(self, ph: str) -> int:
+        idx = self._phoneme_index.get(ph)
+        if idx is None:
+            if self._fixed_inventory:
+                raise ValueError(f"phoneme {ph!r} is not in the inventory")
+            self._meta["phonemes"].append(ph)
+            idx = self._phoneme_index[ph] = len(self._meta["phonemes"]) + PAD_ID
+        return idx
+
+    def add(self, doc: Doc):
+        for sent in doc.sents if doc.sents else []:
+            self.add_sentence(sent)
+
+    def add_sentence(self, sent: Sentence):
+        split_table = self._phoneme_index if self._fixed_inventory else None
+        token_offset = self._sent_tokens[-1]
+        for name in _SENT_STR:
+            self._sent_str[name].append(getattr(sent, name))
+        self._sent_position.append(sent.position.value)
+
+        for token in sent.tokens:
+            for name in ("text", "norm", "pos"):
+                self._token_str[name].append(getattr(token, name))
+            stress = token.stress
+            is_list = isinstance(stress, list)
+            if is_list:
+                stress = json.dumps(stress, ensure_ascii=False)
+            self._token_str["stress"].append(stress)
+            self._token_stress_is_list.append(is_list)
+
+            phonemes = token.phonemes
+            self._token_phonemes_null.append(phonemes is None)
+            for ph in phonemes if phonemes else ():
+                if isinstance(ph, str):
+                    self._phoneme_ids.append(self._phoneme_id(ph))
+                else:
+                    self._phoneme_ids += [
+                        self._phoneme_id(symbol)
+                        for symbol in split_phoneme(ph, split_table)
+                    ]
+            self._token_phonemes.append(len(self._phoneme_ids))
+
+        num_tokens = len(sent.tokens)
+        self._sent_tokens.append(token_offset + num_tokens)
+
+        begin = token_offset
+        for syntagma in sent.syntagmas if sent.syntagmas else []:
+            self._syntagma_str["text"].append(syntagma.text)
+            self._syntagma_position.append(syntagma.position.value)
+            self._syntagma_bounds.append((begin, begin + len(syntagma)))
+            begin += len(syntagma)
+        self._sent_syntagmas.append(len(self._syntagma_bounds))
+
+        self._num_sents += 1
+        if self._num_sents >= self._shard_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered sentences as a new shard."""
+        if self._num_sents == 0:
+            return
+
+        name = _shard_name(len(self._meta["shards"]))
+        while name in self._meta["shards"] or (self._path / name).exists():
+            name = _shard_name(int(name.split("_")[1]) + 1)
+
+        # the shard is written to a temporary directory and renamed when complete
+        tmp_path = self._path / f"{name}.tmp"
+        if tmp_path.exists():
+            shutil.rmtree(tmp_path)
+        tmp_path.mkdir()
+
+        for col_name, column in self._sent_str.items():
+            column.save(tmp_path, f"sent_{col_name}")
+        np.save(tmp_path / "sent_position.npy", np.array(self._sent_position, np.uint8))
+        np.save(tmp_path / "sent_tokens.npy", np.array(self._sent_tokens, np.int64))
+        np.save(tmp_path / "sent_syntagmas.npy", np.array(self._sent_syntagmas, np.int64))
+
+        for col_name, column in self._syntagma_str.items():
+            column.save(tmp_path, f"syntagma_{col_name}")
+        np.save(
+            tmp_path / "syntagma_position.npy",
+            np.array(self._syntagma_position, np.uint8),
+        )
+        np.save(
+            tmp_path / "syntagma_bounds.npy",
+            np.array(self._syntagma_bounds, np.int64).reshape(-1, 2),
+        )
+
+        for col_name, column in self._token_str.items():
+            column.save(tmp_path, f"token_{col_name}")
+        np.save(
+            tmp_path / "token_stress_is_list.npy", np.array(self._token_stress_is_list)
+        )
+        np.save(tmp_path / "token_phonemes.npy", np.array(self._token_phonemes, np.int64))
+        np.save(tmp_path / "token_phonemes_null.npy", np.array(self._token_phonemes_null))
+
+        ids_dtype = np.uint16 if len(self._meta["phonemes"]) < 0xFFFF else np.uint32
+        np.save(tmp_path / "phoneme_ids.npy", np.array(self._phoneme_ids, ids_dtype))
+
+        os.replace(tmp_path, self._path / name)
+        self._meta["shards"][name] = self._num_sents
+        self._save_meta()
+        self._reset()
+
+    def close(self):
+        self.flush()
+        self._save_meta()
+
+
+class _Shard:
+    def __init__(self, path: Path):
+        self._path = path
+        self._arrays: tp.Dict[str, np.ndarray] = {}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        array = self._arrays.get(name)
+        if array is None:
+            file_path = self._path / f"{name}.npy"
+            try:
+                array = np.load(file_path, mmap_mode="r")
+            except ValueError:
+                # empty arrays can not be memory-mapped
+                array = np.load(file_path)
+            self._arrays[name] = array
+        return array
+
+    def string(self, name: str, idx: int) -> tp.Optional[str]:
+        if self[f"{name}.null"][idx]:
+            return None
+        offsets = self[f"{name}.offsets"]
+        data = self[f"{name}.data"][offsets[idx] : offsets[idx + 1]]
+        return data.tobytes().decode("utf-8")
+
+
+class DatasetReader:
+    """Random access to the sentences of a dataset written by DatasetWriter.
+
+    Shards are memory-mapped on first access, reading a sentence touches only
+    its own slices of the arrays. The reader can be created in the main
+    process and used in forked dataloader workers.
+
+    """
+
+    def __init__(self, path: tp.Union[str, Path]):
+        self._path = Path(path)
+        meta = json.loads((self._path / _META_FILE).read_text(encoding="utf-8"))
+        if meta["format_version"] != FORMAT_VERSION:
+            raise ValueError(f"unsupported format version {meta['format_version']}")
+
+        self.phonemes: tp.Tuple[str, ...] = tuple(_load_phonemes(meta))
+        self._names = sorted(meta["shards"])
+        self._ends = list(np.cumsum([meta["shards"][name] for name in self._names]))
+        self._shards: tp.Dict[int, _Shard] = {}
+
+    def __len__(self) -> int:
+        return int(self._ends[-1]) if self._ends else 0
+
+    def __getitem__(self, idx: int) -> dict:
+        return self.to_dict(idx)
+
+    def __iter__(self) -> tp.Iterator[dict]:
+        for idx in range(len(self)):
+            yield self.to_dict(idx)
+
+    @property
+    def num_shards(self) -> int:
+        return len(self._names)
+
+    def _locate(self, idx: int) -> tp.Tuple[_Shard, int]:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("sentence index out of range")
+
+        shard_idx = bisect.bisect_right(self._ends, idx)
+        shard = self._shards.get(shard_idx)
+        if shard is None:
+            shard = self._shards[shard_idx] = _Shard(self._path / self._names[shard_idx])
+        begin = self._ends[shard_idx - 1] if shard_idx > 0 else 0
+        return shard, idx - int(begin)
+
+    def text(self, idx: int) -> str:
+        shard, local_idx = self._locate(idx)
+        return shard.string("sent_text", local_idx)  # type: ignore
+
+    def stress(self, idx: int) -> str:
+        shard, local_idx = self._locate(idx)
+        return shard.string("sent_stress", local_idx)  # type: ignore
+
+    def phoneme_ids(self, idx: int) -> np.ndarray:
+        """Phoneme ids of the sentence, a view of the memory-mapped array."""
+        shard, local_idx = self._locate(idx)
+        first, last = shard["sent_tokens"][local_idx : local_idx + 2]
+        begin, end = shard["token_phonemes"][[first, last]]
+        return shard["phoneme_ids"][begin:end]
+
+    def alignment(self, idx: int) -> np.ndarray:
+        """Phoneme offsets of the tokens of the sentence, (num_tokens + 1,)."""
+        shard, local_idx = self._locate(idx)
+        first, last = shard["sent_tokens"][local_idx : local_idx + 2]
+        offsets = shard["token_phonemes"][first : last + 1]
+        return offsets - offsets[0]
+
+    def syntagma_bounds(self, idx: int) -> np.ndarray:
+        """Token ranges of the syntagmas of the sentence, (num_syntagmas, 2)."""
+        shard, local_idx = self._locate(idx)
+        first_token = shard["sent_tokens"][local_idx]
+        begin, end = shard["sent_syntagmas"][local_idx : local_idx + 2]
+        return shard["syntagma_bounds"][begin:end] - first_token
+
+    def _token_dict(self, shard: _Shard, idx: int) -> dict:
+        stress = shard.string("token_stress", idx)
+        if shard["token_stress_is_list"][idx]:
+            stress = json.loads(stress)  # type: ignore
+
+        phonemes = None
+        if not shard["token_phonemes_null"][idx]:
+            begin, end = shard["token_phonemes"][idx : idx + 2]
+            ids = shard["phoneme_ids"][begin:end].tolist()
+            phonemes = tuple(self.phonemes[i - PAD_ID - 1] for i in ids)
+
+        return {
+            "text": shard.string("token_text", idx),
+            "norm": shard.string("token_norm", idx),
+            "pos": shard.string("token_pos", idx),
+            "accent": stress,
+            "phonemes": phonemes,
+        }
+
+    def to_dict(self, idx: int) -> dict:
+        """The sentence in the structure of Sentence.to_dict."""
+        shard, local_idx = self._locate(idx)
+        first, last = shard["sent_tokens"][local_idx : local_idx + 2]
+        tokens = [self._token_dict(shard, i) for i in range(first, last)]
+
+        ret = {
+            "text": shard.string("sent_text", local_idx),
+            "position": Position(shard["sent_position"][local_idx]).name,
+        }
+        begin, end = shard["sent_syntagmas"][local_idx : local_idx + 2]
+        if end > begin:
+            ret["syntagmas"] = []
+            for i in range(begin, end):
+                token_begin, token_end = shard["syntagma_bounds"][i] - first
+                ret["syntagmas"].append(
+                    {
+                        "text": shard.string("syntagma_text", i),
+                        "tokens": tokens[token_begin:token_end],
+                        "position": Position(shard["syntagma_position"][i]).name,
+                    }
+                )
+        else:
+            ret["tokens"] = tokens
+        return ret
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    from multilingual_text_parser.parser import TextParser
+
+    _parser = TextParser(lang="RU")
+    _doc = _parser.process(
+        Doc("Как тебя зовут? Фото на стр. 5 ярко иллюстрирует феномен.")
+    )
+
+    with tempfile.TemporaryDirectory() as _tmp_dir:
+        with DatasetWriter(_tmp_dir, phonemes=_parser.phonemes, shard_size=1) as _writer:
+            _writer.add(_doc)
+
+        _reader = DatasetReader(_tmp_dir)
+        for _idx in range(len(_reader)):
+            print(_reader.stress(_idx), _reader.phoneme_ids(_idx).tolist())
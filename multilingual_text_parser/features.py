@@ -0,0 +1,235 @@
+import typing as tp
+import itertools
+
+from dataclasses import dataclass
+from operator import attrgetter
+
+import numpy as np
+
+from multilingual_text_parser._constants import INTONATION_TYPES
+from multilingual_text_parser.data_types import Doc, Sentence, Token
+
+if tp.TYPE_CHECKING:
+    from multilingual_text_parser.parser import TextParser
+
+__all__ = ["PAD_ID", "DocFeatures", "FeatureExporter", "split_phoneme"]
+
+# id of padding and of missing values (e.g. pos of a pause), symbols start from 1
+PAD_ID = 0
+
+_get_phonemes = attrgetter("phonemes")
+_get_text = attrgetter("text")
+_get_pos = attrgetter("pos")
+_get_rel = attrgetter("rel")
+
+
+def split_phoneme(
+    phoneme: tp.Union[str, tp.Sequence[str]],
+    table: tp.Optional[tp.Container[str]] = None,
+) -> tp.Tuple[str, ...]:
+    """Symbols of the inventory which make up a phoneme.
+
+    Phonemizer stores multi-character IPA phonemes as tuples of characters,
+    e.g. ("t", "ʃ") or ("e", "̞"). Their string is one symbol if it is in the
+    table or if there is no table, otherwise it is split into the longest
+    symbols of the table: "tʃ" -> ("t", "ʃ"), "ˈe̞" -> ("ˈ", "e̞"). Characters
+    which are not in the table are returned as they are.
+
+    """
+    if isinstance(phoneme, str):
+        return (phoneme,)
+
+    text = "".join(phoneme)
+    if not text:
+        return ()
+    if table is None or text in table:
+        return (text,)
+
+    symbols = []
+    begin = 0
+    while begin < len(text):
+        end = len(text)
+        while end > begin + 1 and text[begin:end] not in table:
+            end -= 1
+        symbols.append(text[begin:end])
+        begin = end
+    return tuple(symbols)
+
+
+@dataclass
+class DocFeatures:
+    """Integer features of a processed document.
+
+    Ragged sequences are stored flat with offsets: phonemes of the i-th token
+    are ``phoneme_ids[token_offsets[i]:token_offsets[i + 1]]``, tokens of the
+    i-th sentence are ``sentence_offsets[i]:sentence_offsets[i + 1]``.
+    Multi-character IPA phonemes are stored as the ids of their symbols, see
+    split_phoneme.
+
+    """
+
+    phoneme_ids: np.ndarray  # (num_phonemes,)
+    phoneme_token_index: np.ndarray  # (num_phonemes,) token of every phoneme
+    token_offsets: np.ndarray  # (num_tokens + 1,) phoneme offsets of tokens
+    word_offsets: np.ndarray  # (num_words + 1,) phoneme offsets of word boundaries
+    pos_ids: np.ndarray  # (num_tokens,)
+    rel_ids: np.ndarray  # (num_tokens,)
+    punctuation_ids: np.ndarray  # (num_tokens,)
+    sentence_offsets: np.ndarray  # (num_sentences + 1,) token offsets of sentences
+    intonation_ids: np.ndarray  # (num_sentences,)
+
+    @property
+    def num_phonemes(self) -> int:
+        return len(self.phoneme_ids)
+
+    @property
+    def num_tokens(self) -> int:
+        return len(self.pos_ids)
+
+    @property
+    def num_words(self) -> int:
+        return len(self.word_offsets) - 1
+
+    def to_dict(self) -> tp.Dict[str, np.ndarray]:
+        return dict(self.__dict__)
+
+
+class FeatureExporter:
+    """Converts processed documents to NumPy arrays of symbol ids.
+
+    Lookup tables are built once from the symbol inventories of TextParser
+    (see from_parser), id 0 is reserved for padding and missing values.
+    Values of a document are collected in one pass over its tokens and mapped
+    to ids without Python loops over the arrays.
+
+    """
+
+    def __init__(
+        self,
+        phonemes: tp.Sequence[str],
+        pos: tp.Sequence[str] = (),
+        rel: tp.Sequence[str] = (),
+        punctuation: tp.Sequence[str] = (),
+        intonation: tp.Sequence[str] = (),
+    ):
+        self.symbols: tp.Dict[str, tp.Tuple[str, ...]] = {
+            "phonemes": tuple(phonemes),
+            "pos": tuple(pos),
+            "rel": tuple(rel),
+            "punctuation": tuple(punctuation),
+            "intonation": tuple(intonation),
+        }
+        self.tables: tp.Dict[str, tp.Dict[str, int]] = {
+            name: self._build_table(symbols) for name, symbols in self.symbols.items()
+        }
+
+    @classmethod
+    def from_parser(cls, parser: "TextParser") -> "FeatureExporter":
+        return cls(
+            phonemes=parser.phonemes,
+            pos=parser.pos,
+            rel=parser.rel,
+            punctuation=parser.punctuation,
+            intonation=parser.intonation,
+        )
+
+    @staticmethod
+    def _build_table(symbols: tp.Sequence[str]) -> tp.Dict[str, int]:
+        table: tp.Dict[str, int] = {}
+        for idx, symbol in enumerate(symbols, start=PAD_ID + 1):
+            # inventories of MULTILANG may repeat symbols, the first id is used
+            table.setdefault(symbol, idx)
+        return table
+
+    def vocab_size(self, name: str) -> int:
+        """Number of ids of the table including PAD_ID."""
+        return len(self.symbols[name]) + 1
+
+    def _lookup(self, name: str, values: tp.Iterable, count: int) -> np.ndarray:
+        table = self.tables[name]
+        ids = map(table.get, values, itertools.repeat(PAD_ID))
+        return np.fromiter(ids, dtype=np.int32, count=count)
+
+    def _phoneme_symbols(self, phonemes: tp.Sequence) -> tp.Sequence[str]:
+        if all(isinstance(ph, str) for ph in phonemes):
+            return phonemes
+        table = self.tables["phonemes"]
+        return [symbol for ph in phonemes for symbol in split_phoneme(ph, table)]
+
+    def _intonation(self, sent: Sentence) -> str:
+        for token in sent.tokens:
+            label = token.prosody
+            if label is not None and str(label).isdigit():
+                if int(label) in INTONATION_TYPES:
+                    return INTONATION_TYPES[int(label)]
+
+        for token in reversed(sent.tokens):
+            if token.is_punctuation:
+                for symbol in reversed(token.text):
+                    if symbol in INTONATION_TYPES:
+                        return INTONATION_TYPES[symbol]
+        return INTONATION_TYPES["."]
+
+    def export(self, doc: Doc) -> DocFeatures:
+        sents = doc.sents if doc.sents else []
+        tokens: tp.List[Token] = doc.tokens if sents else []
+        num_tokens = len(tokens)
+
+        phonemes = [
+            self._phoneme_symbols(ph) if ph else () for ph in map(_get_phonemes, tokens)
+        ]
+        lengths = np.fromiter(map(len, phonemes), dtype=np.int64, count=num_tokens)
+        token_offsets = np.zeros(num_tokens + 1, dtype=np.int64)
+        np.cumsum(lengths, out=token_offsets[1:])
+        num_phonemes = int(token_offsets[-1])
+
+        table = self.tables["phonemes"]
+        try:
+            phoneme_ids = np.fromiter(
+                map(table.__getitem__, itertools.chain.from_iterable(phonemes)),
+                dtype=np.int32,
+                count=num_phonemes,
+            )
+        except KeyError as e:
+            raise ValueError(f"phoneme {e.args[0]!r} is not in the inventory") from e
+
+        has_phonemes = lengths > 0
+        word_offsets = np.append(token_offsets[:-1][has_phonemes], num_phonemes)
+        phoneme_token_index = np.repeat(np.arange(num_tokens, dtype=np.int32), lengths)
+
+        num_sents = len(sents)
+        sentence_offsets = np.zeros(num_sents + 1, dtype=np.int64)
+        np.cumsum(
+            np.fromiter((len(s.tokens) for s in sents), dtype=np.int64, count=num_sents),
+            out=sentence_offsets[1:],
+        )
+
+        return DocFeatures(
+            phoneme_ids=phoneme_ids,
+            phoneme_token_index=phoneme_token_index,
+            token_offsets=token_offsets,
+            word_offsets=word_offsets,
+            pos_ids=self._lookup("pos", map(_get_pos, tokens), num_tokens),
+            rel_ids=self._lookup("rel", map(_get_rel, tokens), num_tokens),
+            punctuation_ids=self._lookup(
+                "punctuation", map(_get_text, tokens), num_tokens
+            ),
+            sentence_offsets=sentence_offsets,
+            intonation_ids=self._lookup(
+                "intonation", map(self._intonation, sents), num_sents
+            ),
+        )
+
+
+if __name__ == "__main__":
+    from multilingual_text_parser.parser import TextParser
+
+    _parser = TextParser(lang="RU")
+    _exporter = FeatureExporter.from_parser(_parser)
+
+    _doc = _parser.process(
+        Doc("Как тебя зовут? Фото на стр. 5 ярко иллюстрирует феномен.")
+    )
+    _features = _exporter.export(_doc)
+    for _name, _value in _features.to_dict().items():
+        print(_name, _value.tolist())
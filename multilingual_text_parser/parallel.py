@@ -0,0 +1,181 @@
+import gc
+import os
+import sys
+import typing as tp
+import logging
+import multiprocessing as mp
+
+from multilingual_text_parser.data_types import Doc
+from multilingual_text_parser.parser import TextParser
+
+__all__ = ["ParallelTextParser"]
+
+LOGGER = logging.getLogger("root")
+
+_PARSER: tp.Optional[TextParser] = None
+
+
+def _init_worker(
+    parser: tp.Optional[TextParser],
+    parser_kwargs: tp.Optional[dict],
+    num_threads: int,
+):
+    global _PARSER
+
+    # tokenizers use their own thread pool which is not fork-safe
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    try:
+        import torch
+
+        torch.set_num_threads(num_threads)
+    except ImportError:
+        pass
+
+    if parser is None:
+        parser = TextParser(**parser_kwargs)  # type: ignore
+
+    _PARSER = parser
+
+
+def _process(args: tp.Tuple[tp.Union[str, Doc], dict]) -> tp.Union[Doc, Exception]:
+    text, kwargs = args
+    try:
+        doc = Doc(text) if isinstance(text, str) else text
+        # the document is already a private copy received from the parent
+        return _PARSER.process(doc, copy=False, **kwargs)  # type: ignore
+    except Exception as e:
+        return e
+
+
+class ParallelTextParser:
+    """Run TextParser on several CPU cores.
+
+    The models are loaded once in the parent process, then the workers are forked
+    and share the weights copy-on-write. Objects created before the fork are
+    moved to the permanent generation with ``gc.freeze()``, so that the garbage
+    collector of the workers does not touch (and copy) the shared memory pages.
+    On platforms without fork, and for CUDA devices, every worker loads its own
+    TextParser.
+
+    """
+
+    def __init__(
+        self,
+        lang: str,
+        workers: tp.Optional[int] = None,
+        device: str = "cpu",
+        cfg: tp.Optional[dict] = None,
+        num_threads: int = 1,
+        chunksize: int = 1,
+    ):
+        """
+        :param lang: language of the TextParser
+        :param workers: number of worker processes (cpu count by default)
+        :param num_threads: number of torch threads in each worker
+        :param chunksize: number of documents sent to a worker at once
+
+        """
+        self._lang = TextParser.locale_to_language(lang)
+        self._workers = workers if workers else os.cpu_count() or 1
+        self._chunksize = chunksize
+        self._parser: tp.Optional[TextParser] = None
+
+        if sys.platform == "win32" or "cuda" in device:
+            ctx = mp.get_context("spawn")
+        else:
+            ctx = mp.get_context("fork")
+
+        if ctx.get_start_method() == "fork":
+            self._parser = TextParser(lang=lang, device=device, cfg=cfg)
+            self._parser.warmup()
+            initargs = (self._parser, None, num_threads)
+            gc.collect()
+            gc.freeze()
+        else:
+            parser_kwargs = {"lang": lang, "device": device, "cfg": cfg}
+            initargs = (None, parser_kwargs, num_threads)
+
+        try:
+            self._pool = ctx.Pool(
+                self._workers, initializer=_init_worker, initargs=initargs
+            )
+        finally:
+            if self._parser is not None:
+                gc.unfreeze()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
+        pool = getattr(self, "_pool", None)
+        if pool is not None:
+            pool.terminate()
+
+    @property
+    def lang(self) -> str:
+        return self._lang
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    @property
+    def parser(self) -> tp.Optional[TextParser]:
+        """TextParser instance of the parent process (None for spawned workers)."""
+        return self._parser
+
+    def process(self, doc: tp.Union[str, Doc], **kwargs) -> Doc:
+        result = self._pool.apply(_process, ((doc, kwargs),))
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def imap(
+        self, docs: tp.Iterable[tp.Union[str, Doc]], **kwargs
+    ) -> tp.Iterator[tp.Union[Doc, Exception]]:
+        """Process documents in the workers, results are yielded in the input order.
+
+        A failed document is yielded as its exception.
+
+        """
+        args = ((doc, kwargs) for doc in docs)
+        return self._pool.imap(_process, args, chunksize=self._chunksize)
+
+    def process_batch(
+        self, docs: tp.Iterable[tp.Union[str, Doc]], **kwargs
+    ) -> tp.List[tp.Union[Doc, Exception]]:
+        return list(self.imap(docs, **kwargs))
+
+    def terminate(self):
+        """Stop the workers immediately, unfinished documents are discarded."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+
+if __name__ == "__main__":
+    from multilingual_text_parser.utils.profiler import Profiler
+
+    utterances = [
+        "Фото на стр. 5 ярко иллюстрирует упомянутый выше феномен.",
+        "Объём продаж одноразовых масок в России снизился на 19% за 1,5 месяца.",
+        "PR-менеджер – это специалист по связям с общественностью.",
+    ] * 20
+
+    with ParallelTextParser(lang="RU", workers=4) as parallel_parser:
+        with Profiler(format=Profiler.format.ms):
+            for _doc in parallel_parser.imap(utterances):
+                if isinstance(_doc, Exception):
+                    print("error:", _doc)
+                else:
+                    print(_doc.capitalize)
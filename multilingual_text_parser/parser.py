@@ -1,10 +1,20 @@
 import os
 import sys
+import json
+import math
+import time
+import queue
 import typing as tp
+import hashlib
 import logging
+import functools
 import itertools
+import threading
+import collections
 
-from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from copy import copy as shallow_copy
 
 from multilingual_text_parser import processors
 from multilingual_text_parser._constants import (
@@ -19,14 +29,21 @@ from multilingual_text_parser._constants import (
     RU2IPA,
     UNIVERSAL_POS,
 )
-from multilingual_text_parser.data_types import Doc
+from multilingual_text_parser.cache import (
+    CachedSentence,
+    DiskSentenceCache,
+    SentenceCache,
+)
+from multilingual_text_parser.data_types import Doc, Sentence
+from multilingual_text_parser.scheduler import StagePlan, build_plan
 from multilingual_text_parser.thirdparty.ru.russian_g2p.Grapheme2Phoneme import (
     Grapheme2Phoneme,
 )
 from multilingual_text_parser.utils import lang_supported as stanza_utils
 from multilingual_text_parser.utils.init import init_class_from_config
 from multilingual_text_parser.utils.lang_supported import espeak_available_languages
-from multilingual_text_parser.utils.profiler import Profiler
+from multilingual_text_parser.utils.log_utils import trace
+from multilingual_text_parser.utils.metrics import MetricsRegistry
 
 __all__ = ["TextParser", "EmptyTextError"]
 
@@ -43,6 +60,48 @@ class EmptyTextError(Exception):
     pass
 
 
+@functools.lru_cache(maxsize=None)
+def _russian_phonemes() -> tp.Tuple[str, ...]:
+    # Grapheme2Phoneme loads its dictionaries, the inventory is created once
+    return tuple(Grapheme2Phoneme().russian_phonemes)
+
+
+def _num_exception_messages(docs: tp.Iterable[Doc]) -> int:
+    num = 0
+    for doc in docs:
+        num += len(doc.exception_messages)
+        if doc.sents:
+            num += sum(len(sent.exception_messages) for sent in doc.sents)
+    return num
+
+
+class _StreamFailure:
+    def __init__(self, exception: Exception):
+        self.exception = exception
+
+
+_STREAM_END = object()
+
+
+class _LazyComponents(tp.Mapping[str, tp.Any]):
+    """Read-only view of the pipeline components, a component is built when it
+    is looked up, iterating over the names builds nothing."""
+
+    def __init__(self, parser: "TextParser"):
+        self._parser = parser
+
+    def __getitem__(self, name: str):
+        if name not in self._parser._factories:
+            raise KeyError(name)
+        return self._parser.get_component(name)
+
+    def __iter__(self) -> tp.Iterator[str]:
+        return iter(self._parser._factories)
+
+    def __len__(self) -> int:
+        return len(self._parser._factories)
+
+
 class TextParser:
     languages = "RU", "EN", "PT-BR", "KK", "KY", "MULTILANG"
     languages_espeak = espeak_available_languages()
@@ -155,7 +214,22 @@ class TextParser:
         device: str = "cpu",
         with_profiler: bool = False,
         cfg: tp.Optional[dict] = None,
+        cache: tp.Optional[tp.Union[SentenceCache, DiskSentenceCache]] = None,
+        concurrent_stages: bool = False,
+        metrics: tp.Optional[MetricsRegistry] = None,
     ):
+        """
+        :param with_profiler: log the duration of every stage
+        :param cache: optional cache of processed sentences, on a hit the sentence
+            skips all stages after sentenization. DiskSentenceCache can be used
+            alone or as the second level of SentenceCache to share results between
+            processes and restarts.
+        :param concurrent_stages: run stages which do not conflict by the fields
+            they read and write concurrently in threads, see plan()
+        :param metrics: registry for latency and error metrics of the stages,
+            several parsers may share one registry
+
+        """
         lang = TextParser.locale_to_language(lang)
         if not self.check_language_support(lang):
             raise ValueError(f"{lang} is not supported")
@@ -164,6 +238,7 @@ class TextParser:
         self._lang = lang
         self._device = device
         self._with_profiler = with_profiler
+        self._metrics = metrics if metrics is not None else MetricsRegistry()
         self._apply_text_restore = False
 
         if lang == "RU":
@@ -179,7 +254,12 @@ class TextParser:
         else:
             self.pipe = self._cfg.get("pipe", self.pipe_multilingual)
 
-        self.components = {}
+        self._factories: tp.Dict[str, tp.Callable] = {}
+        self._handler_classes: tp.Dict[str, tp.Any] = {}
+        self._components: tp.Dict[str, tp.Any] = {}
+        self._components_lock = threading.RLock()
+        self._symbols: tp.Dict[str, tp.Tuple[str, ...]] = {}
+
         for i, step_name in enumerate(self.pipe):
             handler_cls = getattr(processors, step_name)
             cfg = self._cfg.get(step_name, {})
@@ -192,38 +272,446 @@ class TextParser:
             if is_multilang:
                 cfg["lang"] = lang  # type: ignore
 
-            handler = init_class_from_config(handler_cls, cfg)()  # type: ignore
-            self.components[f"{i}_{step_name}"] = handler
+            # components are created on first use, see get_component()
+            name = f"{i}_{step_name}"
+            self._factories[name] = init_class_from_config(handler_cls, cfg)  # type: ignore
+            self._handler_classes[name] = handler_cls
 
             if "TextModifier" in step_name:
                 self._apply_text_restore = True
 
+        self._cache = cache
+        self._concurrent_stages = concurrent_stages
+        self._plans: tp.Dict[tp.Tuple[str, ...], StagePlan] = {}
+        self._stage_executor: tp.Optional[ThreadPoolExecutor] = None
+        self._cfg_hash = hashlib.md5(
+            json.dumps(
+                {"pipe": self.pipe, "cfg": self._cfg}, sort_keys=True, default=str
+            ).encode("utf-8")
+        ).hexdigest()
+
     def __call__(self, utterance: str) -> str:
         if not isinstance(utterance, str):
             raise ValueError("The input variable must be of type string.")
         return self.process(
-            Doc(utterance), disable_translit=True, disable_phonemizer=True
+            Doc(utterance),
+            copy=False,
+            disable_translit=True,
+            disable_phonemizer=True,
+            disable_stress=True,
         ).capitalize
 
-    def process(self, doc: Doc, **kwargs) -> Doc:
-        doc = deepcopy(doc)
+    @property
+    def metrics(self) -> MetricsRegistry:
+        return self._metrics
+
+    @property
+    def cache(self) -> tp.Optional[tp.Union[SentenceCache, DiskSentenceCache]]:
+        return self._cache
+
+    @property
+    def stages(self) -> tp.List[str]:
+        return list(self._factories.keys())
+
+    @property
+    def components(self) -> tp.Mapping[str, tp.Any]:
+        """Components by stage name, they are built on lookup, see warmup() to
+        build all of them."""
+        return _LazyComponents(self)
+
+    def get_component(self, name: str):
+        handler = self._components.get(name)
+        if handler is None:
+            with self._components_lock:
+                handler = self._components.get(name)
+                if handler is None:
+                    handler = self._factories[name]()
+                    self._components[name] = handler
+        return handler
+
+    def warmup(self, text: tp.Optional[str] = None):
+        """Create all components of the pipeline.
+
+        :param text: if set, the text is also processed to initialize resources
+            which components load on the first request
+
+        """
+        for name in self._factories:
+            handler = self.get_component(name)
+            if hasattr(handler, "warmup"):
+                handler.warmup()
+        if text is not None:
+            self.process(Doc(text), copy=False)
+
+    def _is_noop(self, name: str, kwargs: dict) -> bool:
+        is_noop = getattr(self._handler_classes[name], "is_noop", None)
+        return is_noop is not None and is_noop(**kwargs)
+
+    def _iter_stages(self, kwargs: dict) -> tp.Iterator[tp.Tuple[str, tp.Any]]:
+        for name in self._factories:
+            if not self._is_noop(name, kwargs):
+                yield name, self.get_component(name)
+
+    def plan(self, **kwargs) -> StagePlan:
+        """Execution plan used with concurrent_stages for the given options.
+
+        ``print(parser.plan().to_text())`` shows the waves of stages,
+        ``to_dot()`` returns the dependency graph in Graphviz format.
+
+        """
+        kwargs.setdefault("lang", self._lang)
+        names = tuple(name for name in self._factories if not self._is_noop(name, kwargs))
+        plan = self._plans.get(names)
+        if plan is None:
+            plan = build_plan([(name, self._handler_classes[name]) for name in names])
+            self._plans[names] = plan
+        return plan
+
+    def _iter_waves(self, kwargs: dict) -> tp.Iterator[tp.List[tp.Tuple[str, tp.Any]]]:
+        if self._concurrent_stages:
+            for wave in self.plan(**kwargs).waves:
+                yield [(name, self.get_component(name)) for name in wave]
+        else:
+            for name, handler in self._iter_stages(kwargs):
+                yield [(name, handler)]
+
+    def _run_wave(
+        self,
+        wave: tp.List[tp.Tuple[str, tp.Any]],
+        doc: Doc,
+        kwargs: dict,
+        stage_guard: tp.Optional[tp.Callable[[str], tp.ContextManager]] = None,
+    ) -> Doc:
+        if len(wave) == 1:
+            name, handler = wave[0]
+            with stage_guard(name) if stage_guard else nullcontext():
+                with self._measure(name, [doc]):
+                    return self._apply_stage(handler, doc, **kwargs)
+
+        if self._stage_executor is None:
+            with self._components_lock:
+                if self._stage_executor is None:
+                    self._stage_executor = ThreadPoolExecutor(
+                        len(self._factories), thread_name_prefix="text_parser_stage"
+                    )
+
+        # processors of one wave modify the same document in place
+        futures = [
+            self._stage_executor.submit(self._run_wave, [stage], doc, kwargs, stage_guard)
+            for stage in wave
+        ]
+        for future in futures:
+            future.result()
+        return doc
+
+    @contextmanager
+    def _measure(self, name: str, docs: tp.Sequence[Doc] = ()):
+        """Measure the stage, new exception messages of the documents count as
+        an error: processors with exception_handler do not raise."""
+        begin_time = time.perf_counter()
+        num_messages = _num_exception_messages(docs)
+        with self._metrics.measure(self._lang, name) as measurement:
+            yield measurement
+            if _num_exception_messages(docs) > num_messages:
+                measurement.error = True
+        if self._with_profiler:
+            elapsed = round((time.perf_counter() - begin_time) * 1000, 2)
+            LOGGER.info(trace(self, message=f"{name} time: {elapsed} ms"))
+
+    def process(self, doc: Doc, copy: bool = True, **kwargs) -> Doc:
+        """Process the document.
+
+        :param doc: input document
+        :param copy: if False, the input document is modified in place, which
+            saves a copy for freshly created documents
+        :param kwargs: options passed to the processors, stages which do nothing
+            under them are skipped:
+            disable_translit - do not transliterate latin words (RU),
+            disable_phonemizer - do not transcribe words, the phonemizers and
+            HomographerEN are skipped,
+            disable_stress - do not put stress, HomographerRU and AccentorRU are
+            skipped, __call__ sets it because capitalization does not need stress
+
+        """
+        if copy:
+            doc = doc.copy()
+        return self._process(doc, kwargs)
+
+    def _process(
+        self,
+        doc: Doc,
+        kwargs: dict,
+        stage_guard: tp.Optional[tp.Callable[[str], tp.ContextManager]] = None,
+    ) -> Doc:
+        """
+        :param stage_guard: returns a context manager entered around every stage,
+            e.g. to hold a lock of the stage or to stop processing
+
+        """
         kwargs["lang"] = self._lang
 
-        for name, handler in self.components.items():
-            with Profiler(
-                name=name, format=Profiler.format.ms, enable=self._with_profiler  # type: ignore
-            ):
-                doc = handler(doc, **kwargs)
-                if self._apply_text_restore and isinstance(handler, processors.Tokenizer):
-                    doc = self.components["1_TextModifier"].restore(doc)
-                if (
-                    isinstance(handler, processors.SentenizerRU)
-                    or isinstance(handler, processors.Sentenizer)
-                    or isinstance(handler, processors.SSMLCollector)
+        with self._measure(MetricsRegistry.PIPELINE, [doc]):
+            waves = self._iter_waves(kwargs)
+            for wave in waves:
+                doc = self._run_wave(wave, doc, kwargs, stage_guard)
+
+                if self._cache is not None and isinstance(
+                    wave[-1][1], (processors.Sentenizer, processors.SentenizerRU)
                 ):
-                    if not doc.sents:
-                        raise EmptyTextError
+                    return self._process_cached(doc, waves, kwargs, stage_guard)
 
+            return self._finalize(doc)
+
+    def _process_cached(
+        self,
+        doc: Doc,
+        waves: tp.Iterator[tp.List[tp.Tuple[str, tp.Any]]],
+        kwargs: dict,
+        stage_guard: tp.Optional[tp.Callable[[str], tp.ContextManager]] = None,
+    ) -> Doc:
+        """Run the rest of the pipeline only for sentences missing in the cache."""
+        if doc.tags_replacement_map:
+            # SSML tags may span several sentences
+            for wave in waves:
+                doc = self._run_wave(wave, doc, kwargs, stage_guard)
+            return self._finalize(doc)
+
+        cache = self._cache
+        sents = doc.sents
+        keys = [self._cache_key(sent, kwargs) for sent in sents]
+        entries = [cache.get(key) for key in keys]
+        misses = [sent for sent, entry in zip(sents, entries) if entry is None]
+
+        survived = set()
+        if misses:
+            sub_doc = shallow_copy(doc)
+            sub_doc.sents = misses
+            for wave in waves:
+                sub_doc = self._run_wave(wave, sub_doc, kwargs, stage_guard)
+
+            doc.exception_messages = sub_doc.exception_messages
+            doc.meta = sub_doc.meta
+            survived = {id(sent) for sent in sub_doc.sents}
+
+        new_sents: tp.List[Sentence] = []
+        all_sents: tp.List[tp.Optional[Sentence]] = []
+        for key, sent, entry in zip(keys, sents, entries):
+            if entry is None:
+                is_survived = id(sent) in survived
+                if not sent.exception_messages:
+                    cache.put(key, CachedSentence(sent if is_survived else None))
+                if is_survived:
+                    new_sents.append(sent)
+                all_sents.append(sent)
+            elif entry.sentence is None:
+                doc.exception_messages += entry.exception_messages
+                all_sents.append(None)
+            else:
+                new_sents.append(entry.sentence)
+                all_sents.append(entry.sentence)
+
+        if processors.PhonemizerRU in self._handler_classes.values():
+            # sentence position depends on the whole document
+            processors.PhonemizerRU.set_positions(all_sents)
+
+        doc.sents = new_sents
+        return self._finalize(doc)
+
+    def _cache_key(self, sent: Sentence, kwargs: dict) -> tp.Tuple[str, ...]:
+        options = repr(sorted(kwargs.items()))
+        return self._lang, self._cfg_hash, options, sent.text_orig, sent.text
+
+    def process_batch(
+        self, docs: tp.Sequence[Doc], copy: bool = True, **kwargs
+    ) -> tp.List[tp.Union[Doc, Exception]]:
+        """Process several documents at once.
+
+        Processors that implement ``process_batch`` run over sentences of all
+        documents together, the rest are applied to each document in turn.
+        An error in one document does not break the others: its exception is
+        returned in place of the document.
+
+        """
+        begin_time = time.perf_counter()
+        results: tp.List[tp.Union[Doc, Exception]] = [
+            doc.copy() if copy else doc for doc in docs
+        ]
+        num_messages = [_num_exception_messages([doc]) for doc in results]
+        kwargs["lang"] = self._lang
+
+        for name, handler in self._iter_stages(kwargs):
+            live = [i for i, item in enumerate(results) if isinstance(item, Doc)]
+            with self._measure(name, [results[i] for i in live]) as measurement:
+                if len(live) > 1 and hasattr(handler, "process_batch"):
+                    try:
+                        batch = [results[i] for i in live]
+                        batch = handler.process_batch(batch, **kwargs)
+                        for i, doc in zip(live, batch):
+                            results[i] = self._after_stage(handler, doc)
+                        continue
+                    except Exception as e:
+                        LOGGER.warning(trace(self, e))
+
+                for i in live:
+                    try:
+                        results[i] = self._apply_stage(handler, results[i], **kwargs)
+                    except Exception as e:
+                        results[i] = e
+                        measurement.error = True
+
+        for i, item in enumerate(results):
+            if isinstance(item, Doc):
+                try:
+                    results[i] = self._finalize(item)
+                except Exception as e:
+                    results[i] = e
+
+        # every document waited for the whole batch
+        elapsed = time.perf_counter() - begin_time
+        for item, num in zip(results, num_messages):
+            error = isinstance(item, Exception) or _num_exception_messages([item]) > num
+            self._metrics.observe(self._lang, MetricsRegistry.PIPELINE, elapsed, error)
+
+        return results
+
+    def process_stream(
+        self,
+        texts: tp.Iterable[tp.Union[str, Doc]],
+        num_workers: int = 4,
+        queue_size: int = 16,
+        **kwargs,
+    ) -> tp.Iterator[tp.Union[Doc, Exception]]:
+        """Lazily process a stream of texts.
+
+        The pipeline is split into ``num_workers`` groups of consecutive stages.
+        Each group runs in its own thread and the groups are connected by bounded
+        queues, so the pure Python stages of one document overlap with model
+        inference for another one, and memory use does not depend on the length
+        of the stream. Documents are yielded in the input order, a failed document
+        is yielded as its exception (as in ``process_batch``).
+
+        :param texts: iterable of strings or Doc objects, may be unbounded
+        :param num_workers: number of stage groups running concurrently
+        :param queue_size: maximum number of documents waiting between two groups
+
+        """
+        kwargs["lang"] = self._lang
+
+        names = [name for name in self._factories if not self._is_noop(name, kwargs)]
+        num_workers = max(1, min(num_workers, len(names)))
+        step = math.ceil(len(names) / num_workers)
+        groups = [names[i : i + step] for i in range(0, len(names), step)]
+
+        stop = threading.Event()
+        # start time and number of exception messages of the documents in flight,
+        # documents leave the pipeline in the input order
+        started: tp.Deque[tp.Tuple[float, int]] = collections.deque()
+        queues: tp.List[queue.Queue] = [
+            queue.Queue(maxsize=queue_size) for _ in range(len(groups) + 1)
+        ]
+
+        def put(q: queue.Queue, item) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def get(q: queue.Queue):
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            return _STREAM_END
+
+        def feed():
+            try:
+                for text in texts:
+                    begin_time = time.perf_counter()
+                    try:
+                        item = Doc(text) if isinstance(text, str) else text.copy()
+                    except Exception as e:
+                        item = e
+                    num = _num_exception_messages([item]) if isinstance(item, Doc) else 0
+                    started.append((begin_time, num))
+                    if not put(queues[0], item):
+                        return
+            except Exception as e:
+                put(queues[0], _StreamFailure(e))
+            put(queues[0], _STREAM_END)
+
+        def work(stage_names: tp.List[str], q_in: queue.Queue, q_out: queue.Queue):
+            is_last = stage_names[-1] == names[-1]
+            while True:
+                item = get(q_in)
+                if isinstance(item, Doc):
+                    try:
+                        for name in stage_names:
+                            with self._measure(name, [item]):
+                                item = self._apply_stage(
+                                    self.get_component(name), item, **kwargs
+                                )
+                        if is_last:
+                            item = self._finalize(item)
+                    except Exception as e:
+                        item = e
+                if not put(q_out, item) or item is _STREAM_END:
+                    return
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        workers = [
+            threading.Thread(
+                target=work, args=(group, queues[i], queues[i + 1]), daemon=True
+            )
+            for i, group in enumerate(groups)
+        ]
+        feeder.start()
+        for t in workers:
+            t.start()
+
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, _StreamFailure):
+                    raise item.exception
+
+                begin_time, num = started.popleft()
+                error = (
+                    isinstance(item, Exception) or _num_exception_messages([item]) > num
+                )
+                self._metrics.observe(
+                    self._lang,
+                    MetricsRegistry.PIPELINE,
+                    time.perf_counter() - begin_time,
+                    error,
+                )
+                yield item
+        finally:
+            stop.set()
+            for t in workers:
+                t.join()
+
+    def _apply_stage(self, handler, doc: Doc, **kwargs) -> Doc:
+        return self._after_stage(handler, handler(doc, **kwargs))
+
+    def _after_stage(self, handler, doc: Doc) -> Doc:
+        if self._apply_text_restore and isinstance(handler, processors.Tokenizer):
+            doc = self.get_component("1_TextModifier").restore(doc)
+        if (
+            isinstance(handler, processors.SentenizerRU)
+            or isinstance(handler, processors.Sentenizer)
+            or isinstance(handler, processors.SSMLCollector)
+        ):
+            if not doc.sents:
+                raise EmptyTextError
+        return doc
+
+    def _finalize(self, doc: Doc) -> Doc:
         if doc.sents:
             all_exceptions = list(
                 itertools.chain(*[sent.exception_messages for sent in doc.sents])
@@ -249,9 +737,16 @@ class TextParser:
     def lang(self) -> str:
         return self._lang
 
+    def _get_symbols(self, name: str) -> tp.Tuple[str, ...]:
+        # inventories depend only on the language and are built on first access
+        symbols = self._symbols.get(name)
+        if symbols is None:
+            symbols = self._symbols[name] = getattr(self, f"_{name}")()
+        return symbols
+
     def _phonemes(self, version: tp.Optional[str] = None) -> tp.Tuple[str, ...]:
         if version is None:
-            phonemes_russian = Grapheme2Phoneme().russian_phonemes
+            phonemes_russian = _russian_phonemes()
             phonemes_english = PHONEMES_ENGLISH
             phonemes_ipa = PHONEMES_IPA
         else:
@@ -272,11 +767,14 @@ class TextParser:
 
     @property
     def phonemes(self) -> tp.Tuple[str, ...]:
-        return self._phonemes()
+        return self._get_symbols("phonemes")
+
+    def _ipa_phonemes(self) -> tp.Tuple[str, ...]:
+        return self._sort(PHONEMES_IPA)
 
     @property
     def ipa_phonemes(self) -> tp.Tuple[str, ...]:
-        return self._sort(PHONEMES_IPA)
+        return self._get_symbols("ipa_phonemes")
 
     @property
     def num_symbols_per_phoneme(self) -> int:
@@ -297,7 +795,7 @@ class TextParser:
 
     @property
     def punctuation(self):
-        return self._punctuation()
+        return self._get_symbols("punctuation")
 
     def _pos(self, version: tp.Optional[str] = None) -> tp.Tuple[str, ...]:
         if version is None:
@@ -307,7 +805,7 @@ class TextParser:
 
     @property
     def pos(self):
-        return self._pos()
+        return self._get_symbols("pos")
 
     def _rel(self, version: tp.Optional[str] = None) -> tp.Tuple[str, ...]:
         if version is None:
@@ -325,7 +823,7 @@ class TextParser:
 
     @property
     def rel(self):
-        return self._rel()
+        return self._get_symbols("rel")
 
     def _intonation(self, version: tp.Optional[str] = None) -> tp.Tuple[str, ...]:
         if version is None:
@@ -335,7 +833,7 @@ class TextParser:
 
     @property
     def intonation(self):
-        return self._intonation()
+        return self._get_symbols("intonation")
 
     @staticmethod
     def _sort(seq: tp.Union[tp.Tuple[str, ...], tp.List[str]]) -> tp.Tuple[str, ...]:
@@ -428,8 +926,8 @@ if __name__ == "__main__":
     text_processor = TextParser(lang=_lang, device=_device)
     text_processor.process(Doc(_doc))
 
-    with Profiler(format=Profiler.Format.ms):
-        _doc = text_processor.process(Doc(_doc))
+    _doc = text_processor.process(Doc(_doc))
+    print(text_processor.metrics.to_dict()[_lang][MetricsRegistry.PIPELINE])
 
     for idx, s in enumerate(_doc.sents):
         print(f"Sentence {idx+1}")
@@ -0,0 +1,339 @@
+import os
+import json
+import time
+import typing as tp
+import logging
+import argparse
+import itertools
+
+from pathlib import Path
+
+from multilingual_text_parser.data_types import Doc
+from multilingual_text_parser.parser import EmptyTextError
+from multilingual_text_parser.parallel import ParallelTextParser
+from multilingual_text_parser.utils.doc_codec import join_frames, split_frames
+from multilingual_text_parser.utils.log_utils import trace
+
+__all__ = ["CorpusPreprocessor", "read_binary_shard"]
+
+LOGGER = logging.getLogger("root")
+
+CHECKPOINT_NAME = "checkpoint.json"
+FAILURES_SUFFIX = ".failures.jsonl"
+OUTPUT_FORMATS = {"jsonl": ".jsonl", "binary": ".bin"}
+
+
+_Record = tp.Tuple[int, tp.Any, tp.Optional[str], tp.Optional[Exception]]
+
+
+def _read_corpus(
+    path: Path, text_key: str = "text", id_key: tp.Optional[str] = None
+) -> tp.Iterator[_Record]:
+    """Yield (line number, document id, text, error) for every line of the corpus.
+
+    A plain text corpus contains one document per line, a JSONL corpus one
+    object per line with the text in ``text_key``. Blank lines yield None
+    text, lines which can not be read yield the raw line and the error.
+
+    """
+    is_jsonl = path.suffix.lower() in (".jsonl", ".json")
+    with path.open("r", encoding="utf-8", errors="replace") as file:
+        for line_num, line in enumerate(file):
+            line = line.strip()
+            if not line:
+                yield line_num, line_num, None, None
+            elif is_jsonl:
+                try:
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise TypeError(
+                            f"expected a JSON object, got {type(record).__name__}"
+                        )
+                    doc_id = record.get(id_key, line_num) if id_key else line_num
+                    text = record.get(text_key)
+                    if text is not None and not isinstance(text, str):
+                        raise TypeError(f"{text_key} is {type(text).__name__}, not str")
+                except (ValueError, TypeError) as e:
+                    yield line_num, line_num, line, e
+                else:
+                    yield line_num, doc_id, text or None, None
+            else:
+                yield line_num, line_num, line, None
+
+
+def _write_atomic(path: Path, write: tp.Callable[[tp.IO], None], mode: str = "w"):
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    encoding = None if "b" in mode else "utf-8"
+    with tmp_path.open(mode, encoding=encoding) as file:
+        write(file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_binary_shard(path: tp.Union[str, Path]) -> tp.Iterator[tp.Tuple[tp.Any, Doc]]:
+    """Read (document id, Doc) pairs from a shard written in the binary format."""
+    buffer = Path(path).read_bytes()
+    for record in split_frames(buffer):
+        doc_id, doc_bytes = split_frames(record)
+        yield json.loads(bytes(doc_id)), Doc.from_bytes(doc_bytes)
+
+
+class CorpusPreprocessor:
+    """Process a text or JSONL corpus with ParallelTextParser.
+
+    The corpus is split into shards of ``shard_size`` lines. Results of a shard
+    are written to ``shard_XXXXX.jsonl`` (Doc.to_dict per line) or
+    ``shard_XXXXX.bin`` (Doc.to_bytes records, see read_binary_shard), and
+    documents which failed or have exception messages are written to
+    ``shard_XXXXX.failures.jsonl``. Files are written atomically, after that
+    the shard is marked as finished in ``checkpoint.json``, so an interrupted
+    run started again with the same arguments skips the finished shards.
+
+    """
+
+    def __init__(
+        self,
+        lang: str,
+        output_dir: tp.Union[str, Path],
+        output_format: str = "jsonl",
+        shard_size: int = 10000,
+        text_key: str = "text",
+        id_key: tp.Optional[str] = None,
+        **parallel_kwargs,
+    ):
+        """
+        :param output_format: jsonl or binary
+        :param shard_size: number of corpus lines in a shard
+        :param text_key: field of the text in a JSONL corpus
+        :param id_key: field of the document id in a JSONL corpus (line number by default)
+        :param parallel_kwargs: arguments of ParallelTextParser (workers, device, ...)
+
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"unknown output format {output_format!r}")
+        if shard_size < 1:
+            raise ValueError("shard_size must be positive")
+
+        self._lang = lang
+        self._output_dir = Path(output_dir)
+        self._output_format = output_format
+        self._shard_size = shard_size
+        self._text_key = text_key
+        self._id_key = id_key
+        self._parallel_kwargs = parallel_kwargs
+
+    @property
+    def output_dir(self) -> Path:
+        return self._output_dir
+
+    def shard_path(self, shard_idx: int) -> Path:
+        suffix = OUTPUT_FORMATS[self._output_format]
+        return self._output_dir / f"shard_{shard_idx:05d}{suffix}"
+
+    def failures_path(self, shard_idx: int) -> Path:
+        return self._output_dir / f"shard_{shard_idx:05d}{FAILURES_SUFFIX}"
+
+    def _config(self, corpus_path: Path) -> dict:
+        return {
+            "corpus": str(corpus_path.resolve()),
+            "lang": self._lang,
+            "output_format": self._output_format,
+            "shard_size": self._shard_size,
+            "text_key": self._text_key,
+            "id_key": self._id_key,
+        }
+
+    def _load_checkpoint(self, config: dict) -> dict:
+        path = self._output_dir / CHECKPOINT_NAME
+        if not path.exists():
+            return {"config": config, "shards": {}}
+
+        checkpoint = json.loads(path.read_text(encoding="utf-8"))
+        if checkpoint["config"] != config:
+            raise ValueError(
+                f"{path} was created with other arguments: {checkpoint['config']}"
+            )
+        return checkpoint
+
+    def _save_checkpoint(self, checkpoint: dict):
+        path = self._output_dir / CHECKPOINT_NAME
+        _write_atomic(path, lambda file: json.dump(checkpoint, file, indent=2))
+
+    def run(self, corpus_path: tp.Union[str, Path]) -> dict:
+        """Process the corpus, return statistics of all finished shards."""
+        corpus_path = Path(corpus_path)
+        self._output_dir.mkdir(parents=True, exist_ok=True)
+        checkpoint = self._load_checkpoint(self._config(corpus_path))
+        finished = checkpoint["shards"]
+
+        with corpus_path.open("rb") as file:
+            num_lines = sum(1 for _ in file)
+        num_shards = (num_lines + self._shard_size - 1) // self._shard_size
+        if len(finished) == num_shards:
+            LOGGER.info(trace(self, message=f"all {num_shards} shards are finished"))
+            return self._summary(finished)
+
+        LOGGER.info(
+            trace(
+                self,
+                message=f"{num_lines} lines, {num_shards} shards, "
+                f"{len(finished)} already finished",
+            )
+        )
+
+        records = _read_corpus(corpus_path, self._text_key, self._id_key)
+        parallel = ParallelTextParser(self._lang, **self._parallel_kwargs)
+        try:
+            for shard_idx in range(num_shards):
+                shard = list(itertools.islice(records, self._shard_size))
+                if str(shard_idx) in finished:
+                    continue
+
+                start = time.perf_counter()
+                stats = self._process_shard(parallel, shard_idx, shard)
+                finished[str(shard_idx)] = stats
+                self._save_checkpoint(checkpoint)
+
+                elapsed = time.perf_counter() - start
+                LOGGER.info(
+                    trace(
+                        self,
+                        message=f"shard {shard_idx + 1}/{num_shards}: "
+                        f"{stats['docs']} docs, {stats['failed']} failed, "
+                        f"{stats['docs'] / max(elapsed, 1e-6):.1f} docs/s",
+                    )
+                )
+        except BaseException:
+            parallel.terminate()
+            raise
+        else:
+            parallel.close()
+
+        return self._summary(finished)
+
+    @staticmethod
+    def _summary(finished: dict) -> dict:
+        summary = {"shards": len(finished)}
+        for stats in finished.values():
+            for key, value in stats.items():
+                summary[key] = summary.get(key, 0) + value
+        return summary
+
+    def _process_shard(
+        self,
+        parallel: ParallelTextParser,
+        shard_idx: int,
+        shard: tp.List[_Record],
+    ) -> tp.Dict[str, int]:
+        outputs: tp.List[tp.Union[str, bytes]] = []
+        failures: tp.List[str] = []
+        stats = {"docs": 0, "failed": 0, "with_exceptions": 0}
+
+        records = []
+        for line_num, doc_id, text, error in shard:
+            if error is not None:
+                stats["failed"] += 1
+                failure = {
+                    "line": line_num,
+                    "id": doc_id,
+                    "text": text,
+                    "error": type(error).__name__,
+                    "message": str(error),
+                    "empty": False,
+                }
+                failures.append(json.dumps(failure, ensure_ascii=False))
+            elif text is not None:
+                records.append((line_num, doc_id, text))
+
+        results = parallel.imap(text for _, _, text in records)
+        for (line_num, doc_id, text), result in zip(records, results):
+            if isinstance(result, Exception):
+                stats["failed"] += 1
+                error = {
+                    "line": line_num,
+                    "id": doc_id,
+                    "text": text,
+                    "error": type(result).__name__,
+                    "message": str(result),
+                    "empty": isinstance(result, EmptyTextError),
+                }
+                failures.append(json.dumps(error, ensure_ascii=False))
+                continue
+
+            stats["docs"] += 1
+            exceptions = result.exceptions
+            if exceptions:
+                stats["with_exceptions"] += 1
+                error = {
+                    "line": line_num,
+                    "id": doc_id,
+                    "text": text,
+                    "exceptions": exceptions,
+                }
+                failures.append(json.dumps(error, ensure_ascii=False))
+
+            if self._output_format == "binary":
+                doc_id_bytes = json.dumps(doc_id).encode("utf-8")
+                outputs.append(join_frames([doc_id_bytes, result.to_bytes()]))
+            else:
+                record = {"id": doc_id, **result.to_dict()}
+                outputs.append(json.dumps(record, ensure_ascii=False))
+
+        if self._output_format == "binary":
+            _write_atomic(
+                self.shard_path(shard_idx),
+                lambda file: file.write(join_frames(outputs)),  # type: ignore
+                mode="wb",
+            )
+        else:
+            _write_atomic(
+                self.shard_path(shard_idx),
+                lambda file: file.writelines(f"{line}\n" for line in outputs),
+            )
+        _write_atomic(
+            self.failures_path(shard_idx),
+            lambda file: file.writelines(f"{line}\n" for line in failures),
+        )
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process a corpus with TextParser")
+    parser.add_argument(
+        "corpus", type=str, help="text file (one document per line) or JSONL"
+    )
+    parser.add_argument("output_dir", type=str)
+    parser.add_argument("--lang", type=str, required=True)
+    parser.add_argument(
+        "--format", type=str, default="jsonl", choices=list(OUTPUT_FORMATS)
+    )
+    parser.add_argument("--shard_size", type=int, default=10000)
+    parser.add_argument("--text_key", type=str, default="text")
+    parser.add_argument("--id_key", type=str, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--num_threads", type=int, default=1)
+    parser.add_argument("--chunksize", type=int, default=8)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    preprocessor = CorpusPreprocessor(
+        lang=args.lang,
+        output_dir=args.output_dir,
+        output_format=args.format,
+        shard_size=args.shard_size,
+        text_key=args.text_key,
+        id_key=args.id_key,
+        workers=args.workers,
+        device=args.device,
+        num_threads=args.num_threads,
+        chunksize=args.chunksize,
+    )
+    summary = preprocessor.run(args.corpus)
+    LOGGER.info(f"finished: {summary}")
+
+
+if __name__ == "__main__":
+    main()
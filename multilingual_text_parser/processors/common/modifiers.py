@@ -16,6 +16,7 @@ from multilingual_text_parser.processors.common.ssml_processor import collect_ss
 from multilingual_text_parser.processors.ru.rulebased_normalizer import Utils
 from multilingual_text_parser.utils.decorators import exception_handler
 from multilingual_text_parser.utils.fs import get_root_dir
+from multilingual_text_parser.utils.vocab_rewriter import VocabRewriter
 
 __all__ = ["SymbolsModifier", "TextModifier", "SentencesModifier"]
 
@@ -56,6 +57,11 @@ class SymbolsModifier(BaseRawTextProcessor):
         self._alphabet_symbols_vocab = Utils.read_vocab(
             vocabs_dir / "alphabet_symbols.txt"
         )
+        # alphabet symbols follow punctuation symbols and are replaced only for RU and EN
+        self._symbols_rewriter = VocabRewriter(
+            list(self._punctuation_symbols_vocab.items())
+            + list(self._alphabet_symbols_vocab.items())
+        )
 
         self._sub_patterns = [
             (re.compile(r"([\d])(\s*)(\°F)([\s]*)"), r"\1\3\4"),
@@ -82,12 +88,12 @@ class SymbolsModifier(BaseRawTextProcessor):
     def _process_text(self, doc: Doc, **kwargs):
         _str = doc.text
 
-        for k, v in self._punctuation_symbols_vocab.items():
-            _str = _str.replace(k, v)
-
         if kwargs["lang"] in ["RU", "EN"]:
-            for k, v in self._alphabet_symbols_vocab.items():
-                _str = _str.replace(k, v)
+            _str = self._symbols_rewriter.replace(_str)
+        else:
+            _str = self._symbols_rewriter.replace(
+                _str, end=len(self._punctuation_symbols_vocab)
+            )
 
         for pattern, replasment in self._sub_patterns:
             _str = pattern.sub(replasment, _str)
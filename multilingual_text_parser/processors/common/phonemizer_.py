@@ -1,3 +1,5 @@
+import typing as tp
+
 import phonemizer
 
 from phonemizer.backend import BACKENDS
@@ -12,12 +14,19 @@ __all__ = ["Phonemizer"]
 
 
 class Phonemizer(BaseSentenceProcessor):
+    READS: tp.Tuple[str, ...] = ("text", "modifiers")
+    WRITES: tp.Tuple[str, ...] = ("phonemes",)
+
     def __init__(self):
         self._espeak_phonemizer = None
         self._supported_languages = espeak_available_languages()
         self._punctuation_marks = phonemizer.punctuation.Punctuation.default_marks()
         self._separator = phonemizer.separator.Separator(phone="-", word=" ")
 
+    @classmethod
+    def is_noop(cls, **kwargs) -> bool:
+        return kwargs.get("disable_phonemizer", False)
+
     @exception_handler
     def _process_sentence(self, sent: Sentence, **kwargs):
         if kwargs.get("disable_phonemizer", False):
@@ -1,5 +1,5 @@
+import typing as tp
 import logging
-import itertools
 
 import torch
 import stanza
@@ -10,6 +10,7 @@ from multilingual_text_parser.processors.base import (
     BaseTextProcessor,
 )
 from multilingual_text_parser.utils import lang_supported as stanza_utils
+from multilingual_text_parser.utils.batching import iter_length_buckets
 from multilingual_text_parser.utils.decorators import exception_handler
 from multilingual_text_parser.utils.fs import get_root_dir
 from multilingual_text_parser.utils.log_utils import trace
@@ -149,6 +150,8 @@ class SyntaxAnalyzer(BaseSentenceProcessor):
 class BatchSyntaxAnalyzer(BaseTextProcessor):
     GPU_CAPABLE: bool = True
     MULTILANG: bool = True
+    READS: tp.Tuple[str, ...] = ("text", "text_orig")
+    WRITES: tp.Tuple[str, ...] = ("id", "head_id", "rel", "pos", "feats", "syntagmas")
 
     def __init__(self, lang: str = "EN", device: str = "cpu", batch_size: int = 16):
         self._syntax_analyzer = SyntaxAnalyzer(lang, device)
@@ -156,24 +159,29 @@ class BatchSyntaxAnalyzer(BaseTextProcessor):
 
     @exception_handler
     def _process_text(self, doc: Doc, **kwargs):
+        self._process_sents(doc.sents)
+
+    def process_batch(self, docs: tp.List[Doc], **kwargs) -> tp.List[Doc]:
+        self._process_sents([sent for doc in docs for sent in doc.sents])
+        return docs
+
+    def _process_sents(self, sents: tp.List[Sentence]):
         list_tokens = []
-        for sent in doc.sents:
+        for sent in sents:
             tokens_upper = self._syntax_analyzer._preprocessing_sentence(sent)
             list_tokens.append(tokens_upper)
 
-        predict = []
-        iterator = iter(list_tokens)
-        while True:
-            batch = list(itertools.islice(iterator, self._batch_size))
-            if len(batch) > 0:
-                result = self._syntax_analyzer._run_nlp(batch)
-                predict += result.sentences
-            else:
-                break
+        predict: tp.List[tp.Any] = [None] * len(list_tokens)
+        lengths = [len(tokens) for tokens in list_tokens]
+        for indices in iter_length_buckets(lengths, self._batch_size):
+            batch = [list_tokens[idx] for idx in indices]
+            result = self._syntax_analyzer._run_nlp(batch)
+            for idx, predict_tokens in zip(indices, result.sentences):
+                predict[idx] = predict_tokens
 
-        assert len(doc.sents) == len(predict)
+        assert len(sents) == len(predict)
 
-        for sent, predict_tokens in zip(doc.sents, predict):
+        for sent, predict_tokens in zip(sents, predict):
             try:
                 self._syntax_analyzer._apply_result(sent, predict_tokens.words)
             except:
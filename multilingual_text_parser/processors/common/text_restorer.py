@@ -1,3 +1,5 @@
+import typing as tp
+
 from multilingual_text_parser.data_types import Sentence
 from multilingual_text_parser.processors.base import BaseSentenceProcessor
 from multilingual_text_parser.utils.decorators import exception_handler
@@ -6,6 +8,9 @@ __all__ = ["OriginalTextRestorer"]
 
 
 class OriginalTextRestorer(BaseSentenceProcessor):
+    READS: tp.Tuple[str, ...] = ("text", "normalized")
+    WRITES: tp.Tuple[str, ...] = ("text_orig",)
+
     def __init__(self):
         pass
 
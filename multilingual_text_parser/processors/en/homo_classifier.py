@@ -1,6 +1,7 @@
 import os
 import re
 import json
+import typing as tp
 
 import numpy as np
 import torch
@@ -10,11 +11,14 @@ from sklearn.model_selection import GridSearchCV, train_test_split
 from tqdm import tqdm
 from transformers import AutoTokenizer
 
-from multilingual_text_parser.data_types import Doc
+from multilingual_text_parser.data_types import Doc, Sentence, Token
 from multilingual_text_parser.processors.base import BaseSentenceProcessor
 from multilingual_text_parser.utils.decorators import exception_handler
 from multilingual_text_parser.utils.fs import get_root_dir
-from multilingual_text_parser.utils.model_loaders import load_transformer_model
+from multilingual_text_parser.utils.model_loaders import (
+    LayerEncoder,
+    load_transformer_model,
+)
 from multilingual_text_parser.utils.profiler import Profiler
 
 __all__ = ["HomographerEN"]
@@ -32,9 +36,7 @@ class HomographerEN(BaseSentenceProcessor):
             torch.cuda.set_device(int(device.replace("cuda:", "")))
 
         self._lang_model_dir = get_root_dir() / "data/en/homo_classifier/albert-base-v2"
-        self.model = load_transformer_model(
-            self._lang_model_dir, output_hidden_states=True
-        )
+        self.model = LayerEncoder(load_transformer_model(self._lang_model_dir))
         self.model.to(self._device).eval()
 
         self._tokenizer_model_path = get_root_dir() / "data/en/tokenizer/albert-base-v2"
@@ -61,8 +63,24 @@ class HomographerEN(BaseSentenceProcessor):
             clf.load_model(os.path.join(self.classifiers_dir, file))
             self.dict_clf[homo] = clf
 
-    @exception_handler
+    @classmethod
+    def is_noop(cls, **kwargs) -> bool:
+        return kwargs.get("disable_phonemizer", False)
+
+    def __call__(self, doc: Doc, **kwargs) -> Doc:
+        if not doc.sents:
+            raise RuntimeError("This handler must be used after Sentenizer")
+
+        self._classify(doc, doc.sents)
+        return doc
+
     def _process_sentence(self, sent, **kwargs):
+        self._classify(sent, [sent])
+
+    def _find_occurrences(
+        self, sent: Sentence
+    ) -> tp.List[tp.Tuple[Token, str, np.ndarray]]:
+        found = []
         sent_text = sent.text
         for w in self.phonemes.keys():
             if re.search(w, sent_text):
@@ -72,25 +90,45 @@ class HomographerEN(BaseSentenceProcessor):
                             if self.window:
                                 a = max(tok_id - self.window, 0)
                                 b = min(tok_id + self.window, len(sent.tokens))
-                                context = [t.text for t in sent.tokens[a:b]]
-                                answer = self.inference(context, w, tok_id - a)
-                                token.phonemes = answer
                             else:
-                                answer = self.inference(
-                                    [t.text for t in sent.tokens],
-                                    w,
-                                    token.text,
-                                    tok_id,
-                                )
-                                token.phonemes = answer
+                                a, b = 0, len(sent.tokens)
+                            context = [t.text for t in sent.tokens[a:b]]
+                            emb = self._get_emb(context, tok_id - a)
+                            found.append((token, w, emb))
 
-    def inference(self, context, regex, tok_id):
+        return found
+
+    @exception_handler
+    def _classify(self, text: tp.Union[Doc, Sentence], sents: tp.List[Sentence]):
+        """Predict all occurrences of a homograph in the sentences with one call
+        of its classifier."""
+        occurrences: tp.List[tp.Tuple[Token, str, np.ndarray]] = []
+        for sent in sents:
+            occurrences += self._find_occurrences(sent)
+
+        groups: tp.Dict[str, tp.List[int]] = {}
+        for idx, (_, regex, _) in enumerate(occurrences):
+            groups.setdefault(regex, []).append(idx)
+
+        answers: tp.Dict[int, tp.Any] = {}
+        for regex, indices in groups.items():
+            embeds = np.stack([occurrences[idx][2] for idx in indices])
+            answers.update(zip(indices, self._predict(regex, embeds)))
+
+        # in the order of occurrences, as a token may match several homographs
+        for idx in sorted(answers):
+            occurrences[idx][0].phonemes = answers[idx]
+
+    def _predict(self, regex: str, embeds: np.ndarray) -> tp.List[tp.Any]:
         clf = self.dict_clf[regex]
-        emb = self._get_emb(context, tok_id)
         tres = self.dict[regex]["threshold"]
-        cl = int(clf.predict_proba(emb.reshape(1, -1))[:, 1] >= tres)
-        pos = self.dict[regex]["homographs"][cl]
-        return self.phonemes[regex][pos]
+        classes = (clf.predict_proba(embeds)[:, 1] >= tres).astype(int)
+        homographs = self.dict[regex]["homographs"]
+        return [self.phonemes[regex][homographs[cl]] for cl in classes]
+
+    def inference(self, context, regex, tok_id):
+        emb = self._get_emb(context, tok_id)
+        return self._predict(regex, emb.reshape(1, -1))[0]
 
     def validate_all(self):
         filename = get_root_dir() / "data/en/homo_classifier/results.txt"
@@ -229,26 +267,22 @@ class HomographerEN(BaseSentenceProcessor):
             max_length=512,
             is_split_into_words=True,
         )
-        outputs = self.model(
-            input_ids=inp["input_ids"].to(self._device),
-            attention_mask=inp["attention_mask"].to(self._device),
-        )
+        with torch.inference_mode():
+            hidden = self.model(
+                input_ids=inp["input_ids"].to(self._device),
+                attention_mask=inp["attention_mask"].to(self._device),
+            )
         ids = inp.words()
 
         if tok_id + 1 in ids:
             embeds = (
-                outputs.last_hidden_state[0][ids.index(tok_id) : ids.index(tok_id + 1)]
+                hidden[0][ids.index(tok_id) : ids.index(tok_id + 1)]
                 .detach()
                 .cpu()
                 .numpy()
             )
         else:
-            embeds = (
-                outputs.last_hidden_state[0][ids.index(tok_id) : -1]
-                .detach()
-                .cpu()
-                .numpy()
-            )
+            embeds = hidden[0][ids.index(tok_id) : -1].detach().cpu().numpy()
         return np.mean(embeds, axis=0)
 
     def _get_embs(self, examples, re_expr):
@@ -1,6 +1,7 @@
 import re
 import sys
 import base64
+import typing as tp
 import logging
 
 from pathlib import Path
@@ -11,9 +12,10 @@ from num2words import num2words
 from transformers import AutoTokenizer
 
 from multilingual_text_parser._constants import PUNCTUATION
-from multilingual_text_parser.data_types import Sentence, Token
+from multilingual_text_parser.data_types import Doc, Sentence, Token
 from multilingual_text_parser.processors.base import BaseSentenceProcessor
 from multilingual_text_parser.processors.common import Corrector
+from multilingual_text_parser.utils.batching import iter_length_buckets
 from multilingual_text_parser.utils.decorators import exception_handler
 from multilingual_text_parser.utils.fs import get_root_dir
 
@@ -25,11 +27,12 @@ LOGGER = logging.getLogger("root")
 class NormalizerEN(BaseSentenceProcessor):
     GPU_CAPABLE: bool = True
 
-    def __init__(self, device: str = "cpu"):
+    def __init__(self, device: str = "cpu", batch_size: int = 32):
         if sys.platform == "win32":
             LOGGER.warning("NeMo NLP not support on Windows platform!")
 
         self._device = device
+        self._batch_size = batch_size
         self._classes = ["cardinal", "digit", "rcardinal", "rordinal", "plain", "same"]
         self._invalid_symbols = re.compile(f"[^a-zA-Z{PUNCTUATION} ]")
 
@@ -56,23 +59,65 @@ class NormalizerEN(BaseSentenceProcessor):
         ]
         self._add_space = re.compile(f"([{PUNCTUATION}])")
 
-    @exception_handler
-    def _process_sentence(self, sent: Sentence, **kwargs):
+    def _init_normalizer(self):
         if self._normalizer is None and sys.platform != "win32":
             from nemo_text_processing.text_normalization.normalize import Normalizer
 
             self._normalizer = Normalizer(input_case="cased", lang="en")
 
-        old = sent.tokens
-        tokens_orig = [token.text for token in old]
-        text = " ".join(tokens_orig)
+    @staticmethod
+    def _need_tagging(sent: Sentence, text: str) -> bool:
+        return not re.match("^[a-zA-Z -,.!?()]+$", text) or bool(
+            re.search(r"\b[IVXLCDM]+\b", sent.text_orig)
+        )
 
-        text = self.preprocessing(text, sent.text_orig)
-        if not re.match("^[a-zA-Z -,.!?()]+$", text) or re.search(
-            r"\b[IVXLCDM]+\b", sent.text_orig
-        ):
+    @exception_handler
+    def _process_sentence(self, sent: Sentence, **kwargs):
+        self._init_normalizer()
+
+        text = self._prepare_sentence(sent)
+        if text is None:
+            return
+
+        if self._need_tagging(sent, text):
             text = self.tagging(text)
 
+        self._normalize_sentence(sent, text)
+
+    def process_batch(self, docs: tp.List[Doc], **kwargs) -> tp.List[Doc]:
+        self._init_normalizer()
+
+        sents = []
+        texts = []
+        for doc in docs:
+            for sent in doc.sents:
+                text = self._prepare_sentence(sent)
+                if text is not None:
+                    sents.append(sent)
+                    texts.append(text)
+
+        need_tagging = [
+            idx for idx, text in enumerate(texts) if self._need_tagging(sents[idx], text)
+        ]
+        tagged = self.tagging_batch([texts[idx] for idx in need_tagging])
+        for idx, text in zip(need_tagging, tagged):
+            texts[idx] = text
+
+        for sent, text in zip(sents, texts):
+            self._normalize_sentence(sent, text)
+
+        return docs
+
+    @exception_handler
+    def _prepare_sentence(self, sent: Sentence) -> str:
+        text = " ".join([token.text for token in sent.tokens])
+        return self.preprocessing(text, sent.text_orig)
+
+    @exception_handler
+    def _normalize_sentence(self, sent: Sentence, text: str):
+        old = sent.tokens
+        tokens_orig = [token.text for token in old]
+
         if self._normalizer is not None:
             text = self._normalizer.normalize(text, verbose=False).lower()
 
@@ -175,6 +220,38 @@ class NormalizerEN(BaseSentenceProcessor):
         return text
 
     def tagging(self, text, max_length: int = 128):
+        return self.tagging_batch([text])[0]
+
+    def tagging_batch(self, texts: tp.List[str]) -> tp.List[str]:
+        batch = [self._split_for_tagging(text) for text in texts]
+        result: tp.List[str] = [""] * len(batch)
+        lengths = [len(tokens) for tokens in batch]
+        for indices in iter_length_buckets(lengths, self._batch_size):
+            tokenized_inputs = self._tokenizer(
+                [batch[idx] for idx in indices],
+                return_tensors="pt",
+                is_split_into_words=True,
+                padding=True,
+            ).to(self._device)
+            with torch.inference_mode():
+                res = self._tagger(**tokenized_inputs).logits.argmax(-1)
+
+            for row, idx in enumerate(indices):
+                word_ids = tokenized_inputs.word_ids(batch_index=row)
+                previous_word_idx = None
+                labels = []
+                for i, word_idx in enumerate(word_ids):
+                    if word_idx is not None:
+                        if word_idx != previous_word_idx:
+                            labels.append(self._classes[res[row][i]])
+                        previous_word_idx = word_idx
+
+                result[idx] = self._apply_labels(batch[idx], labels)
+
+        return result
+
+    @staticmethod
+    def _split_for_tagging(text: str) -> tp.List[str]:
         tokens = []
         tokens_before = text.split()
         for i, t in enumerate(tokens_before):
@@ -185,30 +262,14 @@ class NormalizerEN(BaseSentenceProcessor):
                 continue
             else:
                 tokens.append(t)
+        return tokens
 
-        tokenized_inputs = self._tokenizer(
-            tokens,
-            return_tensors="pt",
-            is_split_into_words=True,
-        ).to(self._device)
-        res = self._tagger(**tokenized_inputs).logits.argmax(-1)
-
-        word_ids = tokenized_inputs.word_ids()
-        previous_word_idx = None
-        labels = []
-        for i, word_idx in enumerate(word_ids):
-            if word_idx is not None:
-                if word_idx != previous_word_idx:
-                    labels.append(self._classes[res[0][i]])
-                previous_word_idx = word_idx
-
+    def _apply_labels(self, tokens: tp.List[str], labels: tp.List[str]) -> str:
         tokens_processed = []
+        cl = None
         for i, tok in enumerate(tokens):
-            try:
+            if i < len(labels):
                 cl = labels[i]
-            except Exception as e:
-                if max_length < 256:
-                    return self.tagging(text, int(max_length * 1.25))
 
             if cl == "cardinal":
                 tok = self.parse_cardinal(tok)
@@ -10,6 +10,10 @@ class PhonemizerEN(BaseSentenceProcessor):
     def __init__(self):
         self.g2p = G2p()
 
+    @classmethod
+    def is_noop(cls, **kwargs) -> bool:
+        return kwargs.get("disable_phonemizer", False)
+
     @exception_handler
     def _process_sentence(self, sent: Sentence, **kwargs):
         if kwargs.get("disable_phonemizer", False):
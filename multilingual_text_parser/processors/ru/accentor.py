@@ -7,12 +7,12 @@ from stressrnn import StressRNN
 
 from multilingual_text_parser.data_types import Doc, Sentence
 from multilingual_text_parser.processors.base import BaseSentenceProcessor
-from multilingual_text_parser.processors.ru.morph_analyzer import MorphAnalyzerRU
 from multilingual_text_parser.processors.ru.pos_tagger import PosTaggerRU
 from multilingual_text_parser.processors.ru.rulebased_normalizer import Utils
 from multilingual_text_parser.utils.decorators import exception_handler
 from multilingual_text_parser.utils.fs import get_root_dir
 from multilingual_text_parser.utils.profiler import Profiler
+from multilingual_text_parser.utils.resources import morph_analyzer_ru
 
 __all__ = ["AccentorRU"]
 
@@ -35,7 +35,7 @@ class AccentorRU(BaseSentenceProcessor):
     ):
         import dawg
 
-        self._morph = MorphAnalyzerRU()
+        self._morph = morph_analyzer_ru()
         self._stress_rnn = StressRNN()
         self._vocab_only = vocab_only
         self._skip_obvious = skip_obvious
@@ -70,6 +70,10 @@ class AccentorRU(BaseSentenceProcessor):
         with open(get_root_dir() / "data/ru/vocabularies/feats_dict.json") as json_file:
             self.feat_dict = json.load(json_file)
 
+    @classmethod
+    def is_noop(cls, **kwargs) -> bool:
+        return kwargs.get("disable_stress", False)
+
     def _stress_selection(
         self,
         word: str,
@@ -1,6 +1,7 @@
 import os
 import re
 import json
+import typing as tp
 import hashlib
 
 import numpy as np
@@ -11,11 +12,15 @@ from sklearn.model_selection import GridSearchCV, train_test_split
 from tqdm import tqdm
 from transformers import AutoTokenizer
 
-from multilingual_text_parser.data_types import Doc
+from multilingual_text_parser.data_types import Doc, Sentence
 from multilingual_text_parser.processors.base import BaseRawTextProcessor
+from multilingual_text_parser.utils.batching import iter_length_buckets
 from multilingual_text_parser.utils.decorators import exception_handler
 from multilingual_text_parser.utils.fs import get_root_dir
-from multilingual_text_parser.utils.model_loaders import load_transformer_model
+from multilingual_text_parser.utils.model_loaders import (
+    LayerEncoder,
+    load_transformer_model,
+)
 from multilingual_text_parser.utils.profiler import Profiler
 
 __all__ = ["HomographerRU"]
@@ -35,19 +40,57 @@ class Homograph:
 class HomographerRU(BaseRawTextProcessor):
     GPU_CAPABLE: bool = True
 
-    def __init__(self, device: str = "cpu", window=10):
+    # lexical patterns of the form prefix(?:ending|...)suffix match a finite set of words
+    _simple_pattern = re.compile(r"^(\w*)(?:\(\?:([\w|]*)\))?(\w*)$")
+    # classifiers of grammatical homographs applicable to a part of speech
+    FEATS_BY_POS: tp.Dict[str, tp.Tuple[str, ...]] = {
+        "NOUN": ("noun_num",),
+        "VERB": ("verbs_mood", "verbs_part"),
+    }
+
+    def __init__(
+        self,
+        device: str = "cpu",
+        window: tp.Optional[int] = None,
+        merge_gap: int = 0,
+        batch_size: int = 16,
+        max_tokens: tp.Optional[int] = 4096,
+        num_layer: int = 24,
+    ):
+        """
+        :param window: number of tokens of context on each side of a homograph,
+            by default whole sentences are encoded as in the training of the
+            classifiers; a window is faster on long sentences, check its
+            agreement with benchmarks/homographer.py before enabling it
+        :param merge_gap: windows of a sentence which overlap or are separated by
+            at most merge_gap tokens are encoded as one sample, larger values
+            give fewer but longer samples
+        :param batch_size: maximum number of samples in a forward pass
+        :param max_tokens: maximum number of subwords (with padding) in a forward pass
+        :param num_layer: layer of the encoder used for embeddings, the layers
+            after it are not computed
+
+        """
+        if window is not None and window < 0:
+            raise ValueError("window must be non-negative")
+        if merge_gap < 0:
+            raise ValueError("merge_gap must be non-negative")
+
         import xgboost as xgb
 
         self.voc = "([аеиоуыэюяёАЕИОУЫЭЮЯЁ])"
         self.window = window
+        self._merge_gap = merge_gap
         self._device = device
+        self._batch_size = batch_size
+        self._max_tokens = max_tokens
         if not device == "cpu" and device.replace("cuda:", "").isdigit():
             torch.cuda.set_device(int(device.replace("cuda:", "")))
 
         # Роберта (sberbank-ai/ruRoberta-large)
         model_dir = get_root_dir() / "data/ru/homo_classifier"
-        self.model = load_transformer_model(
-            model_dir / "ruRoBerta", output_hidden_states=True
+        self.model = LayerEncoder(
+            load_transformer_model(model_dir / "ruRoBerta"), num_layer=num_layer
         )
         self.model.to(self._device).eval()
         self.tokenizer = AutoTokenizer.from_pretrained(
@@ -91,135 +134,272 @@ class HomographerRU(BaseRawTextProcessor):
             feat_keys = [f"{key}" for key in self.dict_feats[feat]["homographs"].keys()]
             self.keys_feat.extend(feat_keys)
 
+        # indexes for the detection of candidates in constant time per token
+        self._keys_feat_set = frozenset(self.keys_feat)
+        # part of speech -> grammatical homograph -> its classifier, the first
+        # classifier in the dictionary order is used
+        self._feat_index: tp.Dict[str, tp.Dict[str, str]] = {}
+        for feat in self.dict_feats:
+            for pos, feats in self.FEATS_BY_POS.items():
+                if feat in feats:
+                    index = self._feat_index.setdefault(pos, {})
+                    for word in self.dict_feats[feat]["homographs"]:
+                        index.setdefault(word, feat)
+        self._lexical_index: tp.Dict[str, tp.List[int]] = {}
+        self._lexical_patterns: tp.List[tp.Tuple[int, tp.Pattern]] = []
+        for key_idx, key in enumerate(self.corpus_keys):
+            words = self._expand_pattern(key)
+            if words is None:
+                self._lexical_patterns.append((key_idx, re.compile(f"^{key}$")))
+            else:
+                for word in words:
+                    self._lexical_index.setdefault(word, []).append(key_idx)
+
+    @classmethod
+    def _expand_pattern(cls, pattern: str) -> tp.Optional[tp.List[str]]:
+        """Words matched by a simple lexical pattern, None for other patterns."""
+        match = cls._simple_pattern.match(pattern)
+        if match is None:
+            return None
+        prefix, group, suffix = match.groups()
+        endings = group.split("|") if group is not None else [""]
+        return [prefix + ending + suffix for ending in endings]
+
+    def _lexical_matches(self, word: str) -> tp.List[int]:
+        """Indices of the lexical homograph patterns which match the whole word."""
+        matches = self._lexical_index.get(word, [])
+        if self._lexical_patterns:
+            matches = matches + [
+                key_idx
+                for key_idx, pattern in self._lexical_patterns
+                if pattern.search(word)
+            ]
+            matches.sort()
+        return matches
+
+    @classmethod
+    def is_noop(cls, **kwargs) -> bool:
+        return kwargs.get("disable_stress", False)
+
     @exception_handler
     def _process_text(self, doc: Doc, **kwargs):
+        self._resolve([doc])
+
+    def process_batch(self, docs: tp.List[Doc], **kwargs) -> tp.List[Doc]:
+        self._resolve(docs)
+        return docs
+
+    def _resolve(self, docs: tp.List[Doc]):
         batch = []
+        for doc in docs:
+            batch += self._find_homographs(doc)
+
+        self.get_embeddings(batch)
+        tokens = []
+        homographs = []
+        for sample in batch:
+            for homograph in sample["homographs"]:
+                # the token may be cut off by truncation of a long sentence
+                if homograph.embedding is not None:
+                    tokens.append(sample["sent"].tokens[homograph.tok_id])
+                    homographs.append(homograph)
+
+        for token, stress in zip(tokens, self.inference_batch(homographs)):
+            token.stress = stress
+
+    def _find_homographs(self, doc: Doc) -> tp.List[tp.Dict[str, tp.Any]]:
+        batch: tp.List[tp.Dict[str, tp.Any]] = []
         for sent_id, sent in enumerate(doc.sents):
-            is_in_batch = False
             sent_text = " " + sent.text
-            homo_words = []
-
-            for w, short_w in zip(self.corpus_keys, self.short_keys):
-                if short_w in sent_text:
-                    homo_words.append((short_w, w))
+            homographs: tp.List[Homograph] = []
+            # whether the beginning of a lexical pattern occurs in the sentence
+            in_sentence: tp.Dict[int, bool] = {}
 
             for tok_id, token in enumerate(sent.tokens):
-                if not token.stress:
-                    if token.text in self.keys_feat:
-                        if not is_in_batch:
-                            batch.append(
-                                {"batch": [t.text for t in sent.tokens], "homographs": []}
-                            )
-                            is_in_batch = True
-                        batch[-1]["homographs"].append(
+                if token.stress:
+                    continue
+
+                if token.text in self._keys_feat_set:
+                    homographs.append(
+                        Homograph(
+                            sent_id,
+                            tok_id,
+                            token.text,
+                            token.text,
+                            "grammatical",
+                            token.pos,
+                        )
+                    )
+                    continue
+
+                for key_idx in self._lexical_matches(token.text):
+                    if key_idx not in in_sentence:
+                        in_sentence[key_idx] = self.short_keys[key_idx] in sent_text
+                    if in_sentence[key_idx]:
+                        homographs.append(
                             Homograph(
                                 sent_id,
                                 tok_id,
                                 token.text,
-                                token.text,
-                                "grammatical",
+                                self.corpus_keys[key_idx],
+                                "lexical",
                                 token.pos,
                             )
                         )
-                    elif homo_words:
-                        for short_w, w in homo_words:
-                            if short_w.strip() in token.text and re.search(
-                                f"^{w}$", token.text
-                            ):
-                                if not is_in_batch:
-                                    batch.append(
-                                        {
-                                            "batch": [t.text for t in sent.tokens],
-                                            "homographs": [],
-                                        }
-                                    )
-                                    is_in_batch = True
-                                batch[-1]["homographs"].append(
-                                    Homograph(
-                                        sent_id,
-                                        tok_id,
-                                        token.text,
-                                        w,
-                                        "lexical",
-                                        token.pos,
-                                    )
-                                )
 
-        self.get_embeddings(batch)
-        for sample in batch:
-            for homograph in sample["homographs"]:
-                doc.sents[homograph.sent_id].tokens[
-                    homograph.tok_id
-                ].stress = self.inference(homograph)
+            if homographs:
+                batch += self._split_windows(sent, homographs)
+
+        return batch
+
+    def _split_windows(
+        self, sent: Sentence, homographs: tp.List[Homograph]
+    ) -> tp.List[tp.Dict[str, tp.Any]]:
+        """Samples with the context windows of the homographs of a sentence.
+
+        Token indices of homographs stay relative to the sentence, the sample
+        keeps the offset of its first token.
+
+        """
+        words = [t.text for t in sent.tokens]
+        if self.window is None:
+            return [{"batch": words, "homographs": homographs, "sent": sent, "offset": 0}]
+
+        samples: tp.List[tp.Dict[str, tp.Any]] = []
+        end = -1
+        for homograph in sorted(homographs, key=lambda h: h.tok_id):
+            start = max(homograph.tok_id - self.window, 0)
+            if samples and start <= end + self._merge_gap:
+                samples[-1]["homographs"].append(homograph)
+            else:
+                samples.append({"homographs": [homograph], "sent": sent, "offset": start})
+            end = min(homograph.tok_id + self.window + 1, len(words))
+            samples[-1]["end"] = end
+
+        for sample in samples:
+            sample["batch"] = words[sample["offset"] : sample.pop("end")]
+        return samples
+
+    def get_embeddings(self, batch, is_split_into_words=True):
+        """Compute embeddings of the homographs of all samples.
+
+        The samples are tokenized at once and split into length-sorted batches
+        bounded by batch_size and max_tokens, the embedding of a homograph is
+        the mean of the hidden states of its subwords. Words of a sample start
+        from its "offset" token of the sentence.
+
+        """
+        if not batch:
+            return
+
+        encoding = self.tokenizer(
+            [sample["batch"] for sample in batch],
+            max_length=512,
+            is_split_into_words=is_split_into_words,
+            truncation=True,
+        )
+        lengths = [len(input_ids) for input_ids in encoding["input_ids"]]
+
+        for indices in iter_length_buckets(lengths, self._batch_size, self._max_tokens):
+            input_ids, attention_mask = self._pad(
+                [encoding["input_ids"][idx] for idx in indices]
+            )
+            homographs = []
+            spans = []
+            for row, idx in enumerate(indices):
+                ids = encoding.word_ids(idx)
+                # index of the closing special token
+                last = lengths[idx] - 1
+                offset = batch[idx].get("offset", 0)
+                for homograph in batch[idx]["homographs"]:
+                    tok_id = homograph.tok_id - offset
+                    if tok_id not in ids:
+                        continue
+                    if tok_id + 1 in ids:
+                        end = ids.index(tok_id + 1)
+                    else:
+                        end = last
+                    homographs.append(homograph)
+                    spans.append((row, ids.index(tok_id), end))
+
+            if not homographs:
+                continue
 
-    def get_embeddings(self, batch, num_layer=24, is_split_into_words=True):
-        for sample in batch:
             with torch.inference_mode():
-                inp = self.tokenizer(
-                    sample["batch"],
-                    return_tensors="pt",
-                    max_length=512,
-                    is_split_into_words=is_split_into_words,
-                    truncation=True,
-                    padding=True,
+                hidden = self.model(
+                    input_ids=input_ids.to(self._device),
+                    attention_mask=attention_mask.to(self._device),
                 )
-                outputs = self.model(
-                    input_ids=inp["input_ids"].to(self._device),
-                    attention_mask=inp["attention_mask"].to(self._device),
+                embeds = torch.stack(
+                    [hidden[row, start:end].mean(dim=0) for row, start, end in spans]
                 )
-                ids = inp[0].word_ids
-
-            for homograph in sample["homographs"]:
-                tok_id = homograph.tok_id
-                if tok_id + 1 in ids:
-                    embeds = (
-                        outputs[2][num_layer][0][
-                            ids.index(tok_id) : ids.index(tok_id + 1)
-                        ]
-                        .detach()
-                        .cpu()
-                        .numpy()
-                    )
-                else:
-                    embeds = (
-                        outputs[2][num_layer][0][ids.index(tok_id) : -1]
-                        .detach()
-                        .cpu()
-                        .numpy()
-                    )
-                homograph.embedding = np.mean(embeds, axis=0)
+                # one copy from the device for the whole batch
+                embeds = embeds.float().cpu().numpy()
+
+            for homograph, emb in zip(homographs, embeds):
+                homograph.embedding = emb
+
+    def _pad(
+        self, sequences: tp.List[tp.List[int]]
+    ) -> tp.Tuple[torch.Tensor, torch.Tensor]:
+        max_length = max(len(seq) for seq in sequences)
+        input_ids = torch.full(
+            (len(sequences), max_length), self.tokenizer.pad_token_id, dtype=torch.long
+        )
+        attention_mask = torch.zeros((len(sequences), max_length), dtype=torch.long)
+        for row, seq in enumerate(sequences):
+            input_ids[row, : len(seq)] = torch.tensor(seq, dtype=torch.long)
+            attention_mask[row, : len(seq)] = 1
+        return input_ids, attention_mask
 
-    def inference(self, homograph):
-        emb = homograph.embedding
+    def _classifier_name(self, homograph: Homograph) -> tp.Optional[str]:
         if homograph.type == "grammatical":
-            for feat in self.dict_feats:
-                if (feat == "noun_num" and homograph.pos == "NOUN") or (
-                    feat in ["verbs_mood", "verbs_part"] and homograph.pos == "VERB"
-                ):
-                    if homograph.regex in self.dict_feats[feat]["homographs"]:
-                        clf = self.dict_clf[feat]
-                        tres = self.dict_feats[feat]["threshold"]
-                        prob = clf.predict_proba(emb.reshape(1, -1))[:, 1]
-                        cl = int(prob >= tres)
-                        if cl == 0:
-                            return self.dict_feats[feat]["homographs"][
-                                homograph.regex
-                            ].split("|")[0]
-                        else:
-                            return self.dict_feats[feat]["homographs"][
-                                homograph.regex
-                            ].split("|")[1]
+            return self._feat_index.get(homograph.pos, {}).get(homograph.regex)
         elif homograph.type == "lexical":
-            clf = self.dict_clf[homograph.regex]
-            tres = self.dict[homograph.regex]["threshold"]
-            prob = clf.predict_proba(emb.reshape(1, -1))[:, 1]
-            cl = int(prob >= tres)
-            pos = int(self.dict[homograph.regex]["homographs"][cl])
+            return homograph.regex
+        else:
+            return None
+
+    def _stress_variant(self, homograph: Homograph, name: str, cl: int) -> str:
+        if homograph.type == "grammatical":
+            return self.dict_feats[name]["homographs"][homograph.regex].split("|")[cl]
+        else:
+            pos = int(self.dict[name]["homographs"][cl])
             chars = re.sub(self.voc, r"\1|", homograph.word).split("|")
             chars[pos - 1] += "+"
             return "".join(chars)
-        else:
-            return
+
+    def inference_batch(
+        self, homographs: tp.List[Homograph]
+    ) -> tp.List[tp.Optional[str]]:
+        """Resolve homographs with computed embeddings.
+
+        Homographs are grouped by classifier, so that each classifier predicts
+        all of its homographs in one call.
+
+        """
+        groups: tp.Dict[str, tp.List[int]] = {}
+        for idx, homograph in enumerate(homographs):
+            name = self._classifier_name(homograph)
+            if name is not None:
+                groups.setdefault(name, []).append(idx)
+
+        results: tp.List[tp.Optional[str]] = [None] * len(homographs)
+        for name, indices in groups.items():
+            if name in self.dict_feats:
+                tres = self.dict_feats[name]["threshold"]
+            else:
+                tres = self.dict[name]["threshold"]
+
+            embeds = np.stack([homographs[idx].embedding for idx in indices])
+            prob = self.dict_clf[name].predict_proba(embeds)[:, 1]
+            for idx, cl in zip(indices, (prob >= tres).astype(int)):
+                results[idx] = self._stress_variant(homographs[idx], name, int(cl))
+
+        return results
+
+    def inference(self, homograph):
+        return self.inference_batch([homograph])[0]
 
     def add_homograph(
         self, homo, in_corpus=True, var1=None, var2=None, texts1=None, texts2=None
@@ -350,9 +530,7 @@ class HomographerRU(BaseRawTextProcessor):
 
         self.dict_clf[re_expr] = clf
 
-    def _get_emb(
-        self, text, re_expr, num_layer=24, tok_id=None, is_split_into_words=True
-    ):
+    def _get_emb(self, text, re_expr, tok_id=None, is_split_into_words=True):
         with torch.inference_mode():
             inp = self.tokenizer(
                 text,
@@ -361,7 +539,7 @@ class HomographerRU(BaseRawTextProcessor):
                 is_split_into_words=is_split_into_words,
                 truncation=True,
             )
-            outputs = self.model(
+            hidden = self.model(
                 input_ids=inp["input_ids"].to(self._device),
                 attention_mask=inp["attention_mask"].to(self._device),
             )
@@ -370,18 +548,13 @@ class HomographerRU(BaseRawTextProcessor):
         if tok_id:
             if tok_id + 1 in ids:
                 embeds = (
-                    outputs[2][num_layer][0][ids.index(tok_id) : ids.index(tok_id + 1)]
+                    hidden[0][ids.index(tok_id) : ids.index(tok_id + 1)]
                     .detach()
                     .cpu()
                     .numpy()
                 )
             else:
-                embeds = (
-                    outputs[2][num_layer][0][ids.index(tok_id) : -1]
-                    .detach()
-                    .cpu()
-                    .numpy()
-                )
+                embeds = hidden[0][ids.index(tok_id) : -1].detach().cpu().numpy()
             return np.mean(embeds, axis=0)
 
         prev = None
@@ -401,7 +574,7 @@ class HomographerRU(BaseRawTextProcessor):
                 cur = tok
                 start = i
             if re.search(re_expr, cur):
-                embeds = outputs[2][num_layer][0][start : i + 1].detach().cpu().numpy()
+                embeds = hidden[0][start : i + 1].detach().cpu().numpy()
                 if embeds.shape == (1024,):
                     return embeds
                 return np.mean(embeds, axis=0)
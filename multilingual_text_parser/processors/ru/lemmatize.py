@@ -1,11 +1,10 @@
 import logging
 
-from natasha import MorphVocab
-
 from multilingual_text_parser.data_types import Sentence
 from multilingual_text_parser.processors.base import BaseSentenceProcessor
 from multilingual_text_parser.utils.decorators import exception_handler
 from multilingual_text_parser.utils.log_utils import trace
+from multilingual_text_parser.utils.resources import morph_vocab
 
 __all__ = ["LemmatizeRU"]
 
@@ -14,7 +13,7 @@ LOGGER = logging.getLogger("root")
 
 class LemmatizeRU(BaseSentenceProcessor):
     def __init__(self):
-        self._morph_vocab = MorphVocab()
+        self._morph_vocab = morph_vocab()
 
     @exception_handler
     def _process_sentence(self, sent: Sentence, **kwargs):
@@ -1,3 +1,5 @@
+import itertools
+
 from pathlib import Path
 
 import regex as re
@@ -10,10 +12,11 @@ from multilingual_text_parser.processors.base import (
 )
 from multilingual_text_parser.processors.common.modifiers import TextModifier
 from multilingual_text_parser.processors.ru.rulebased_normalizer import Utils
-from multilingual_text_parser.thirdparty.ru.e2yo.e2yo.core import E2Yo
 from multilingual_text_parser.utils.decorators import exception_handler
 from multilingual_text_parser.utils.fs import get_root_dir
 from multilingual_text_parser.utils.profiler import Profiler
+from multilingual_text_parser.utils.resources import e2yo
+from multilingual_text_parser.utils.vocab_rewriter import VocabRewriter
 
 __all__ = ["TextModifierRU", "SentencesModifierRU"]
 
@@ -43,7 +46,10 @@ class TextModifierRU(BaseRawTextProcessor):
                 else:
                     vocab[f" {key} "] = f" {value} "
 
-        self._e2yo = E2Yo()
+        self._abbreviations_rewriter = VocabRewriter(
+            self._abbreviations_with_point_vocab.items()
+        )
+        self._e2yo = e2yo()
         self._reshetka = re.compile(r"([\d])\#([\s]*)")
 
     @exception_handler
@@ -54,8 +60,7 @@ class TextModifierRU(BaseRawTextProcessor):
         _str = " " + doc.text.strip() + " "
         _str = self._reshetka.sub(r"\1" + " решётка " + r"\2", _str)
 
-        for word, replacement_word in self._abbreviations_with_point_vocab.items():
-            _str = _str.replace(word, replacement_word)
+        _str = self._abbreviations_rewriter.replace(_str)
 
         _str = self._e2yo.replace(_str)
 
@@ -136,6 +141,30 @@ class SentencesModifierRU(BaseSentenceProcessor):
                 )
                 vocab[f" {key} "] = f" {value} "
 
+        # vocabularies are applied one after another in this order
+        upper_rules = [
+            (word.upper(), replacement_word)
+            for word, replacement_word in self._abbreviation_stress_vocab_upper.items()
+        ]
+        self._upper_rewriter = VocabRewriter(
+            upper_rules + list(self._names_vocab.items())
+        )
+        lower_vocabs = [
+            self._interpret_as_vocab,
+            self._preposition_vocab,
+            self._abbreviation_with_hyphens_vocab,
+            self._abbreviation_stress_vocab_lower,
+            self._en_translit_vocab,
+        ]
+        self._lower_rewriter = VocabRewriter(
+            itertools.chain.from_iterable(vocab.items() for vocab in lower_vocabs),
+            wildcard="*",
+        )
+        # en_translit is the last one, it is skipped with disable_translit
+        self._num_rules_without_translit = len(self._lower_rewriter) - len(
+            self._en_translit_vocab
+        )
+
         self._sub_patterns = [
             (
                 re.compile(r"([\d*\s])([^\W0-9ЪIVXLCDMа-яa-z]{2,4})([\d*\s])"),
@@ -169,11 +198,7 @@ class SentencesModifierRU(BaseSentenceProcessor):
         _str = self._rm_double_space.sub(r" ", _str)
         _str = " " + _str.strip() + " "
 
-        for word, replacement_word in self._abbreviation_stress_vocab_upper.items():
-            _str = _str.replace(word.upper(), replacement_word)
-
-        for word, replacement_word in self._names_vocab.items():
-            _str = _str.replace(word, replacement_word)
+        _str = self._upper_rewriter.replace(_str)
 
         for pattern, replasment in self._sub_patterns:
             _str = pattern.sub(replasment, _str)
@@ -181,23 +206,12 @@ class SentencesModifierRU(BaseSentenceProcessor):
         _str = self._rm_end_hyphen.sub(r"\1 \2", _str)
         _str = _str.lower().replace(" ", "  ")
 
-        for vocab in [
-            self._interpret_as_vocab,
-            self._preposition_vocab,
-            self._abbreviation_with_hyphens_vocab,
-            self._abbreviation_stress_vocab_lower,
-            self._en_translit_vocab,
-        ]:
-            if kwargs.get("disable_translit", False):
-                if vocab == self._en_translit_vocab:
-                    continue
-
-            for word, replacement_word in vocab.items():
-                if "*" in word:
-                    replacement_word = replacement_word.replace("*", "\\1")
-                    _str = re.sub(word.replace("*", r"(\w*)"), replacement_word, _str)
-                else:
-                    _str = _str.replace(word, replacement_word)
+        if kwargs.get("disable_translit", False):
+            _str = self._lower_rewriter.replace(
+                _str, end=self._num_rules_without_translit
+            )
+        else:
+            _str = self._lower_rewriter.replace(_str)
 
         sent.text = _str
 
@@ -1,15 +1,20 @@
+import typing as tp
+
 from multilingual_text_parser.data_types import Sentence
 from multilingual_text_parser.processors.base import BaseSentenceProcessor
-from multilingual_text_parser.processors.ru.morph_analyzer import MorphAnalyzerRU
 from multilingual_text_parser.utils.decorators import exception_handler
 from multilingual_text_parser.utils.fs import get_root_dir
+from multilingual_text_parser.utils.resources import morph_analyzer_ru
 
 
 class NameFinder(BaseSentenceProcessor):
+    READS: tp.Tuple[str, ...] = ("text", "text_orig", "pos")
+    WRITES: tp.Tuple[str, ...] = ("is_name", "is_capitalize")
+
     def __init__(self):
         import dawg
 
-        self._morph = MorphAnalyzerRU()
+        self._morph = morph_analyzer_ru()
 
         # hagen_orf vocab containing no names
         _vocab_path = get_root_dir() / "data/ru/hagen_orf/stress_vocab_NOUN_1.dawg"
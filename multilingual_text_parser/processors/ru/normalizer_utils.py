@@ -11,6 +11,7 @@ from multilingual_text_parser.processors.ru.morph_analyzer import MorphAnalyzerR
 from multilingual_text_parser.processors.ru.num_to_words import NumToWords
 from multilingual_text_parser.utils.decorators import exception_handler
 from multilingual_text_parser.utils.log_utils import trace
+from multilingual_text_parser.utils.resources import morph_analyzer_ru
 
 __all__ = ["BaseRule", "BaseNormalizer", "Utils"]
 
@@ -39,7 +40,7 @@ class BaseRule:
 
 class BaseNormalizer(BaseSentenceProcessor):
     def __init__(self):
-        self._morph = MorphAnalyzerRU()
+        self._morph = morph_analyzer_ru()
         self._num2words = NumToWords(self._morph)
         self._rules_ssml: tp.List[tp.Callable] = []
         self._rules_begin: tp.List[tp.Callable] = []
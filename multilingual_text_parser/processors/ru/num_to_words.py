@@ -2,6 +2,7 @@ import os
 import sys
 import typing as tp
 import logging
+import weakref
 import subprocess
 
 from os import environ as env
@@ -9,16 +10,17 @@ from subprocess import Popen
 
 from num2words import num2words
 
-from multilingual_text_parser.processors.ru.morph_analyzer import MorphAnalyzerRU
-from multilingual_text_parser.thirdparty.ru.e2yo.e2yo.core import E2Yo
 from multilingual_text_parser.utils.fs import get_root_dir
 from multilingual_text_parser.utils.log_utils import trace
+from multilingual_text_parser.utils.resources import e2yo, morph_analyzer_ru
 from multilingual_text_parser.utils.zmq_patterns import ZMQPatterns, find_free_port
 
 __all__ = ["NumToWords"]
 
 LOGGER = logging.getLogger("root")
 
+_INSTANCES: "weakref.WeakSet[NumToWords]" = weakref.WeakSet()
+
 
 class NumToWords:
     def __init__(self, morph=None):
@@ -27,6 +29,14 @@ class NumToWords:
         self._cyriller_proc = None
         self._cyriller_client = None
         self._init = False
+        _INSTANCES.add(self)
+
+    def _reset_after_fork(self):
+        # the Cyriller process and the ZMQ context belong to the parent process,
+        # the child will start its own ones on the first request
+        self._cyriller_proc = None
+        self._cyriller_client = None
+        self._init = False
 
     def _lazy_init(self):
         if self._init:
@@ -34,9 +44,9 @@ class NumToWords:
 
         try:
             if self._morph is None:
-                self._morph = MorphAnalyzerRU()
+                self._morph = morph_analyzer_ru()
 
-            self._e2yo = E2Yo()
+            self._e2yo = e2yo()
 
             free_port = int(env.setdefault("CyrillerPort", str(find_free_port())))
             cyriller_path = get_root_dir() / "data/ru/cyriller/pyCyriller"
@@ -234,6 +244,16 @@ class NumToWords:
         return response
 
 
+def _reinit_after_fork():
+    env.pop("CyrillerPort", None)
+    for instance in list(_INSTANCES):
+        instance._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+
+
 if __name__ == "__main__":
     from multilingual_text_parser.utils.profiler import Profiler
 
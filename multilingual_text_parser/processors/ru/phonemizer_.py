@@ -15,7 +15,7 @@ __all__ = ["PhonemizerRU"]
 
 class PhonemizerRU(BaseSentenceProcessor):
     def __init__(self):
-        self._transcriptor = TranscriptorRU()
+        self._transcriptor: tp.Optional[TranscriptorRU] = None
 
         vocab_root = get_root_dir() / "data/ru/vocabularies"
         self._phonetic_vocab = Utils.read_vocab(vocab_root / "phonetic.txt")
@@ -23,6 +23,16 @@ class PhonemizerRU(BaseSentenceProcessor):
             k: tuple(v.split("|")) for k, v in self._phonetic_vocab.items()
         }
 
+    @property
+    def transcriptor(self) -> TranscriptorRU:
+        # not needed when the phonemizer is disabled, so it is created on demand
+        if self._transcriptor is None:
+            self._transcriptor = TranscriptorRU()
+        return self._transcriptor
+
+    def warmup(self):
+        _ = self.transcriptor
+
     def _find_next_word(
         self, num_phonemes, next_word, ph_by_phrase, is_trim: bool = False
     ) -> int:
@@ -78,9 +88,7 @@ class PhonemizerRU(BaseSentenceProcessor):
                         ph_word = tuple([prev_token.phonemes[-1]])
                         prev_token.phonemes = prev_token.phonemes[:-1]
                     else:
-                        ph_word = self._transcriptor.transcribe_word(
-                            tokens[token_idx - 1]
-                        )
+                        ph_word = self.transcriptor.transcribe_word(tokens[token_idx - 1])
                     break
                 idx -= 1
             else:
@@ -90,21 +98,29 @@ class PhonemizerRU(BaseSentenceProcessor):
         return ph_word, ph_phrase
 
     def __call__(self, doc: Doc, **kwargs) -> Doc:
-        for sent_idx, sent in enumerate(doc.sents):
+        self.set_positions(doc.sents)
+        for sent in doc.sents:
+            self._process_sentence(sent, **kwargs)
+        return doc
+
+    @staticmethod
+    def set_positions(sents: tp.Sequence[tp.Optional[Sentence]]):
+        for sent_idx, sent in enumerate(sents):
+            if sent is None:
+                continue
             if sent_idx == 0:
                 sent.position = Position.first
-            elif sent_idx + 1 == len(doc.sents):
+            elif sent_idx + 1 == len(sents):
                 sent.position = Position.last
-
-            self._process_sentence(sent, **kwargs)
-        return doc
+            else:
+                sent.position = Position.internal
 
     @exception_handler
     def _process_sentence(self, sent: Sentence, is_debug: bool = False, **kwargs):
         if kwargs.get("disable_phonemizer", False):
             return
 
-        ret = self._transcriptor.transcribe(sent)
+        ret = self.transcriptor.transcribe(sent)
         if not ret:
             sent.syntagmas = [Syntagma(sent.tokens)]
             return
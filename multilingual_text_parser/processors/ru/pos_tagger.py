@@ -1,23 +1,40 @@
-from natasha import NewsEmbedding, NewsMorphTagger
+import typing as tp
+
+from natasha import NewsMorphTagger
+from natasha.doc import inject_morph
 from navec import Navec
 from slovnet import Morph
 
 from multilingual_text_parser.data_types import Doc, Sentence
 from multilingual_text_parser.processors.base import BaseSentenceProcessor
 from multilingual_text_parser.utils.decorators import exception_handler
+from multilingual_text_parser.utils.resources import news_embedding
 
 __all__ = ["PosTaggerRU"]
 
 
 class PosTaggerRU(BaseSentenceProcessor):
+    READS: tp.Tuple[str, ...] = ("text",)
+    WRITES: tp.Tuple[str, ...] = ("pos", "feats")
+
     def __init__(self):
-        self._emb = NewsEmbedding()
+        self._emb = news_embedding()
         self._morph_tagger = NewsMorphTagger(self._emb)
 
     def __call__(self, doc: Doc, **kwargs) -> Doc:
         doc.tag_morph(self._morph_tagger)
         return super().__call__(doc, **kwargs)
 
+    def process_batch(self, docs: tp.List[Doc], **kwargs) -> tp.List[Doc]:
+        sents = [sent for doc in docs for sent in doc.sents]
+        # slovnet splits items into batches itself, sort them to reduce padding
+        order = sorted(range(len(sents)), key=lambda idx: len(sents[idx].tokens))
+        chunk = [[token.text for token in sents[idx].tokens] for idx in order]
+        for idx, markup in zip(order, self._morph_tagger.map(chunk)):
+            inject_morph(sents[idx].tokens, markup.tokens)
+
+        return [super(PosTaggerRU, self).__call__(doc, **kwargs) for doc in docs]
+
     @exception_handler
     def _process_sentence(self, sent: Sentence, **kwargs):
         for token in sent.tokens:
@@ -1,15 +1,21 @@
+import typing as tp
+
 from natasha import Doc as NatashaDoc
-from natasha import NewsEmbedding, NewsSyntaxParser, Segmenter
+from natasha import NewsSyntaxParser, Segmenter
 
 from multilingual_text_parser.data_types import Sentence
 from multilingual_text_parser.processors.base import BaseSentenceProcessor
+from multilingual_text_parser.utils.resources import news_embedding
 
 __all__ = ["SyntaxAnalyzerRU"]
 
 
 class SyntaxAnalyzerRU(BaseSentenceProcessor):
+    READS: tp.Tuple[str, ...] = ("text",)
+    WRITES: tp.Tuple[str, ...] = ("id", "head_id", "rel")
+
     def __init__(self):
-        self._emb = NewsEmbedding()
+        self._emb = news_embedding()
         self._syntax_parser = NewsSyntaxParser(self._emb)
 
     def _process_sentence(self, sent: Sentence, **kwargs):
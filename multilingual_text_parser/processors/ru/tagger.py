@@ -1,11 +1,14 @@
 import re
+import typing as tp
 
 import torch
 
 from transformers import AutoModelForTokenClassification, AutoTokenizer
 
 from multilingual_text_parser._constants import PUNCTUATION
+from multilingual_text_parser.data_types import Doc, Sentence
 from multilingual_text_parser.processors.base import BaseSentenceProcessor
+from multilingual_text_parser.utils.batching import iter_length_buckets
 from multilingual_text_parser.utils.decorators import exception_handler
 from multilingual_text_parser.utils.fs import get_root_dir
 
@@ -14,9 +17,12 @@ __all__ = ["TaggerRU"]
 
 class TaggerRU(BaseSentenceProcessor):
     GPU_CAPABLE: bool = True
+    READS: tp.Tuple[str, ...] = ("text", "interpret_as")
+    WRITES: tp.Tuple[str, ...] = ("tag",)
 
-    def __init__(self, device: str = "cpu"):
+    def __init__(self, device: str = "cpu", batch_size: int = 32):
         self._device = device
+        self._batch_size = batch_size
         self.num_to_class = [
             "same",
             "date",
@@ -63,41 +69,63 @@ class TaggerRU(BaseSentenceProcessor):
     def _process_sentence(self, sent, **kwargs):
         if self._clear.search(sent.text):
             tokens = [token.text for token in sent.tokens]
-            tags = self.get_preds(tokens)
-            for i, token in enumerate(sent.tokens):
-                if token.interpret_as in self.num_to_class:
-                    token.tag = token.interpret_as
-                elif self._num.search(token.text) and tags[i] == "same":
-                    token.tag = "digit"
-                else:
-                    token.tag = tags[i]
-
-                if token.tag == "digit":
-                    if any(token.text.endswith(s) for s in self._ordinal_suffix):
-                        token.tag = "ordinal"
-                    elif self._date.search(token.text):
-                        token.tag = "date"
+            self._apply_preds(sent, self.get_preds(tokens))
+
+    def process_batch(self, docs: tp.List[Doc], **kwargs) -> tp.List[Doc]:
+        sents = [
+            sent for doc in docs for sent in doc.sents if self._clear.search(sent.text)
+        ]
+        preds = self.get_preds_batch([[t.text for t in sent.tokens] for sent in sents])
+        for sent, tags in zip(sents, preds):
+            self._apply_preds(sent, tags)
+        return docs
+
+    @exception_handler
+    def _apply_preds(self, sent: Sentence, tags: tp.List[str]):
+        for i, token in enumerate(sent.tokens):
+            if token.interpret_as in self.num_to_class:
+                token.tag = token.interpret_as
+            elif self._num.search(token.text) and tags[i] == "same":
+                token.tag = "digit"
+            else:
+                token.tag = tags[i]
+
+            if token.tag == "digit":
+                if any(token.text.endswith(s) for s in self._ordinal_suffix):
+                    token.tag = "ordinal"
+                elif self._date.search(token.text):
+                    token.tag = "date"
 
     def get_preds(self, tokens: list) -> list:
-        with torch.inference_mode():
-            tokenized = self.tokenizer(
-                tokens,
-                truncation=True,
-                is_split_into_words=True,
-                return_tensors="pt",
-                max_length=512,
-            )
-            pred = self.model(
-                tokenized["input_ids"].to(self._device),
-                attention_mask=tokenized["attention_mask"].to(self._device),
-            ).logits.argmax(dim=2)[0]
-
-        word_ids = tokenized.word_ids()
-        res = []
-        prev = None
-        for i, j in enumerate(word_ids):
-            if j is not None and prev != j:
-                res.append(pred[i].item())
-            prev = j
-
-        return list(map(lambda x: self.num_to_class[x], res))
+        return self.get_preds_batch([tokens])[0]
+
+    def get_preds_batch(self, batch: tp.List[tp.List[str]]) -> tp.List[tp.List[str]]:
+        result: tp.List[tp.List[str]] = [[] for _ in batch]
+        lengths = [len(tokens) for tokens in batch]
+        for indices in iter_length_buckets(lengths, self._batch_size):
+            with torch.inference_mode():
+                tokenized = self.tokenizer(
+                    [batch[idx] for idx in indices],
+                    truncation=True,
+                    is_split_into_words=True,
+                    return_tensors="pt",
+                    max_length=512,
+                    padding=True,
+                )
+                pred = self.model(
+                    tokenized["input_ids"].to(self._device),
+                    attention_mask=tokenized["attention_mask"].to(self._device),
+                ).logits.argmax(dim=2)
+
+            for row, idx in enumerate(indices):
+                word_ids = tokenized.word_ids(batch_index=row)
+                res = []
+                prev = None
+                for i, j in enumerate(word_ids):
+                    if j is not None and prev != j:
+                        res.append(pred[row][i].item())
+                    prev = j
+
+                result[idx] = list(map(lambda x: self.num_to_class[x], res))
+
+        return result
@@ -0,0 +1,96 @@
+import typing as tp
+
+from dataclasses import dataclass, field
+
+__all__ = ["StagePlan", "build_plan"]
+
+
+def _fields(handler_cls, attr_name: str) -> tp.Optional[tp.FrozenSet[str]]:
+    value = getattr(handler_cls, attr_name, None)
+    return frozenset(value) if value is not None else None
+
+
+@dataclass
+class StagePlan:
+    """Execution plan of the pipeline.
+
+    Stages of one wave do not conflict with each other and may run concurrently,
+    waves run one after another.
+
+    """
+
+    waves: tp.List[tp.List[str]]
+    dependencies: tp.Dict[str, tp.List[str]] = field(default_factory=dict)
+
+    def to_text(self) -> str:
+        lines = []
+        for idx, wave in enumerate(self.waves):
+            mode = "parallel" if len(wave) > 1 else "serial"
+            lines.append(f"wave {idx} ({mode}): {', '.join(wave)}")
+        return "\n".join(lines)
+
+    def to_dot(self) -> str:
+        lines = ["digraph pipeline {", "  rankdir=LR;"]
+        for idx, wave in enumerate(self.waves):
+            lines.append(f"  subgraph cluster_{idx} {{")
+            lines.append(f'    label="wave {idx}";')
+            for name in wave:
+                lines.append(f'    "{name}";')
+            lines.append("  }")
+        for name, deps in self.dependencies.items():
+            for dep in deps:
+                lines.append(f'  "{dep}" -> "{name}";')
+        lines.append("}")
+        return "\n".join(lines)
+
+
+def _is_conflict(
+    a: tp.Tuple[tp.Optional[tp.FrozenSet[str]], tp.Optional[tp.FrozenSet[str]]],
+    b: tp.Tuple[tp.Optional[tp.FrozenSet[str]], tp.Optional[tp.FrozenSet[str]]],
+) -> bool:
+    (a_reads, a_writes), (b_reads, b_writes) = a, b
+    if a_reads is None or a_writes is None or b_reads is None or b_writes is None:
+        return True
+    return bool(a_writes & (b_reads | b_writes) or b_writes & a_reads)
+
+
+def build_plan(stages: tp.Sequence[tp.Tuple[str, tp.Any]]) -> StagePlan:
+    """Build a DAG of stages from the fields they read and write.
+
+    Processors declare ``READS`` and ``WRITES`` class attributes with names of the
+    token (or sentence) fields they use. Every processor implicitly reads
+    the token list, so a processor which adds or removes tokens must write
+    "tokens". A processor without declarations is a barrier: it runs alone,
+    after all previous stages and before all next ones.
+
+    :param stages: pairs of stage name and processor class in pipeline order
+    :return: plan where every stage is placed into the first wave after all
+        stages it depends on
+
+    """
+    declared = {}
+    for name, handler_cls in stages:
+        reads = _fields(handler_cls, "READS")
+        writes = _fields(handler_cls, "WRITES")
+        if reads is not None:
+            reads = reads | {"tokens"}
+        declared[name] = (reads, writes)
+
+    levels: tp.Dict[str, int] = {}
+    dependencies: tp.Dict[str, tp.List[str]] = {}
+    for idx, (name, _) in enumerate(stages):
+        deps = [
+            prev_name
+            for prev_name, _ in stages[:idx]
+            if _is_conflict(declared[prev_name], declared[name])
+        ]
+        dependencies[name] = deps
+        levels[name] = max((levels[dep] + 1 for dep in deps), default=0)
+
+    waves: tp.List[tp.List[str]] = [
+        [] for _ in range(max(levels.values(), default=-1) + 1)
+    ]
+    for name, _ in stages:
+        waves[levels[name]].append(name)
+
+    return StagePlan(waves=waves, dependencies=dependencies)
@@ -0,0 +1,338 @@
+import gc
+import os
+import sys
+import time
+import pickle
+import signal
+import typing as tp
+import logging
+import argparse
+import tempfile
+import threading
+import multiprocessing as mp
+
+from collections import deque
+
+import zmq
+
+from multilingual_text_parser.data_types import Doc
+from multilingual_text_parser.parser import TextParser
+from multilingual_text_parser.utils.doc_codec import encode_doc
+from multilingual_text_parser.utils.log_utils import trace
+from multilingual_text_parser.utils.zmq_patterns import find_free_port
+
+__all__ = ["ParserServer"]
+
+LOGGER = logging.getLogger("root")
+
+READY = b"READY"
+STOP = b"STOP"
+
+
+def _reply(result: tp.Union[Doc, Exception]) -> bytes:
+    try:
+        return pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        # the exception may carry objects which can not be pickled
+        return pickle.dumps(RuntimeError(str(result)))
+
+
+def _reply_frames(
+    result: tp.Union[Doc, Exception], binary: bool
+) -> tp.List[tp.Union[bytes, memoryview]]:
+    if binary and isinstance(result, Doc):
+        try:
+            return encode_doc(result)
+        except Exception as e:
+            result = e
+    return [_reply(result)]
+
+
+def _recv_all(sock: zmq.Socket, copy: bool = True) -> tp.Iterator[tp.List[tp.Any]]:
+    while True:
+        try:
+            yield sock.recv_multipart(zmq.NOBLOCK, copy=copy)
+        except zmq.Again:
+            return
+
+
+def _worker_main(
+    parser: tp.Optional[TextParser],
+    parser_kwargs: tp.Optional[dict],
+    backend_addr: str,
+    num_threads: int,
+):
+    # the broker is responsible for shutdown
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    try:
+        import torch
+
+        torch.set_num_threads(num_threads)
+    except ImportError:
+        pass
+
+    if parser is None:
+        parser = TextParser(**parser_kwargs)  # type: ignore
+
+    context = zmq.Context()
+    sock = context.socket(zmq.DEALER)
+    sock.setsockopt(zmq.LINGER, 0)
+    sock.connect(backend_addr)
+    sock.send(READY)
+
+    while True:
+        frames = sock.recv_multipart()
+        if frames[0] == STOP:
+            break
+
+        client, request_id, deadline, payload = frames
+        binary = False
+        if deadline and time.time() > float(deadline):
+            result = TimeoutError("request timed out in the queue")
+        else:
+            try:
+                text, kwargs, binary = pickle.loads(payload)
+                doc = Doc(text) if isinstance(text, str) else text
+                result = parser.process(doc, copy=False, **kwargs)
+            except Exception as e:
+                result = e
+
+        reply = _reply_frames(result, binary)
+        sock.send_multipart([client, request_id, *reply], copy=False)
+
+    sock.close()
+    context.term()
+
+
+class ParserServer:
+    """TextParser behind a ZMQ ROUTER/DEALER broker.
+
+    Clients (see ParserClient) connect to the frontend ROUTER socket, the broker
+    queues their requests and hands them to the first idle worker process.
+    Every request carries an id, which is returned with the reply, and an
+    optional timeout: a request which waited in the queue longer than its
+    timeout is answered with TimeoutError without processing. On stop the
+    server no longer accepts new requests, finishes the queued and running
+    ones (at most ``drain_timeout`` seconds) and stops the workers.
+
+    Processed documents are sent in the binary format of Doc.to_bytes (see
+    utils.doc_codec) as separate ZMQ frames without copying the arrays, or
+    pickled if the client asks for it. Requests and errors are pickled, so
+    the server must be reachable only by trusted clients.
+
+    """
+
+    def __init__(
+        self,
+        lang: str,
+        addr: str = "tcp://127.0.0.1:5555",
+        workers: int = 1,
+        device: str = "cpu",
+        cfg: tp.Optional[dict] = None,
+        num_threads: int = 1,
+        drain_timeout: float = 30.0,
+    ):
+        """
+        :param addr: frontend address, e.g. tcp://*:5555 or ipc:///tmp/parser.ipc
+        :param workers: number of worker processes
+        :param num_threads: number of torch threads in each worker
+        :param drain_timeout: how long to wait for running requests on stop, in seconds
+
+        """
+        self._lang = TextParser.locale_to_language(lang)
+        self._addr = addr
+        self._num_workers = workers
+        self._device = device
+        self._cfg = cfg
+        self._num_threads = num_threads
+        self._drain_timeout = drain_timeout
+        self._stop_event = threading.Event()
+        self._ready_event = threading.Event()
+        self._processes: tp.List[mp.process.BaseProcess] = []
+
+    @property
+    def lang(self) -> str:
+        return self._lang
+
+    @property
+    def addr(self) -> str:
+        return self._addr
+
+    def wait_ready(self, timeout: tp.Optional[float] = None) -> bool:
+        """Wait until all workers are connected to the broker."""
+        return self._ready_event.wait(timeout)
+
+    def stop(self):
+        """Request a graceful shutdown, can be called from any thread."""
+        self._stop_event.set()
+
+    def _backend_addr(self) -> str:
+        if sys.platform == "win32":
+            return f"tcp://127.0.0.1:{find_free_port()}"
+        return f"ipc://{tempfile.gettempdir()}/text_parser_{os.getpid()}_{id(self)}.ipc"
+
+    def _start_workers(self, backend_addr: str):
+        if sys.platform == "win32" or "cuda" in self._device:
+            ctx = mp.get_context("spawn")
+        else:
+            ctx = mp.get_context("fork")
+
+        if ctx.get_start_method() == "fork":
+            # the models are shared copy-on-write, see ParallelTextParser
+            parser = TextParser(lang=self._lang, device=self._device, cfg=self._cfg)
+            parser.warmup()
+            args = (parser, None, backend_addr, self._num_threads)
+            gc.collect()
+            gc.freeze()
+        else:
+            parser_kwargs = {"lang": self._lang, "device": self._device, "cfg": self._cfg}
+            args = (None, parser_kwargs, backend_addr, self._num_threads)
+
+        try:
+            for _ in range(self._num_workers):
+                process = ctx.Process(target=_worker_main, args=args, daemon=True)
+                process.start()
+                self._processes.append(process)
+        finally:
+            if ctx.get_start_method() == "fork":
+                gc.unfreeze()
+
+    def serve(self):
+        """Run the broker until stop() is called or SIGINT/SIGTERM is received."""
+        if threading.current_thread() is threading.main_thread():
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(sig, lambda *_: self.stop())
+
+        backend_addr = self._backend_addr()
+        # workers are forked before the ZMQ context is created in this process
+        self._start_workers(backend_addr)
+
+        context = zmq.Context()
+        frontend = context.socket(zmq.ROUTER)
+        frontend.setsockopt(zmq.LINGER, 0)
+        frontend.bind(self._addr)
+        backend = context.socket(zmq.ROUTER)
+        backend.setsockopt(zmq.LINGER, 0)
+        backend.bind(backend_addr)
+
+        workers: tp.Set[bytes] = set()
+        try:
+            self._broker_loop(frontend, backend, workers)
+        finally:
+            self._stop_workers(backend, workers)
+            frontend.close()
+            backend.close()
+            context.term()
+            if backend_addr.startswith("ipc://"):
+                try:
+                    os.remove(backend_addr[len("ipc://") :])
+                except OSError:
+                    pass
+
+    def _broker_loop(
+        self, frontend: zmq.Socket, backend: zmq.Socket, workers: tp.Set[bytes]
+    ):
+        idle: tp.Deque[bytes] = deque()
+        pending: tp.Deque[tp.Tuple[bytes, bytes, float, bytes]] = deque()
+        running: tp.Dict[bytes, tp.Tuple[bytes, bytes]] = {}
+        drain_deadline: tp.Optional[float] = None
+
+        poller = zmq.Poller()
+        poller.register(frontend, zmq.POLLIN)
+        poller.register(backend, zmq.POLLIN)
+
+        while True:
+            if self._stop_event.is_set() and drain_deadline is None:
+                LOGGER.info(trace(self, message="draining requests"))
+                drain_deadline = time.time() + self._drain_timeout
+
+            if drain_deadline is not None:
+                if not pending and not running:
+                    break
+                if time.time() > drain_deadline:
+                    LOGGER.warning(
+                        trace(
+                            self,
+                            message=f"{len(pending) + len(running)} requests are dropped",
+                        )
+                    )
+                    break
+
+            events = dict(poller.poll(100))
+            now = time.time()
+
+            for frames in _recv_all(backend, copy=False) if backend in events else ():
+                worker = frames[0].bytes
+                if frames[1].bytes == READY:
+                    workers.add(worker)
+                    if len(workers) == self._num_workers:
+                        self._ready_event.set()
+                else:
+                    frontend.send_multipart(frames[1:], copy=False)
+                    running.pop(worker, None)
+                idle.append(worker)
+
+            for frames in _recv_all(frontend) if frontend in events else ():
+                if len(frames) != 4:
+                    LOGGER.warning(trace(self, message="malformed request"))
+                    continue
+
+                client, request_id, timeout, payload = frames
+                if drain_deadline is not None:
+                    error = _reply(RuntimeError("server is shutting down"))
+                    frontend.send_multipart([client, request_id, error])
+                else:
+                    deadline = now + float(timeout) / 1000 if timeout else 0.0
+                    pending.append((client, request_id, deadline, payload))
+
+            while pending and idle:
+                client, request_id, deadline, payload = pending.popleft()
+                if deadline and deadline < now:
+                    error = _reply(TimeoutError("request timed out in the queue"))
+                    frontend.send_multipart([client, request_id, error])
+                    continue
+
+                worker = idle.popleft()
+                running[worker] = (client, request_id)
+                deadline_frame = repr(deadline).encode() if deadline else b""
+                backend.send_multipart(
+                    [worker, client, request_id, deadline_frame, payload]
+                )
+
+    def _stop_workers(self, backend: zmq.Socket, workers: tp.Set[bytes]):
+        # give the STOP messages time to reach the workers before the socket is closed
+        backend.setsockopt(zmq.LINGER, 1000)
+        for worker in workers:
+            backend.send_multipart([worker, STOP])
+
+        for process in self._processes:
+            process.join(timeout=5.0)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TextParser server")
+    parser.add_argument("--lang", type=str, required=True)
+    parser.add_argument("--addr", type=str, default="tcp://127.0.0.1:5555")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--num_threads", type=int, default=1)
+    parser.add_argument("--drain_timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    server = ParserServer(
+        lang=args.lang,
+        addr=args.addr,
+        workers=args.workers,
+        device=args.device,
+        num_threads=args.num_threads,
+        drain_timeout=args.drain_timeout,
+    )
+    server.serve()
+
+
+if __name__ == "__main__":
+    main()
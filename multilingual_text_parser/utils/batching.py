@@ -0,0 +1,35 @@
+import typing as tp
+
+__all__ = ["iter_length_buckets"]
+
+
+def iter_length_buckets(
+    lengths: tp.Sequence[int], batch_size: int, max_tokens: tp.Optional[int] = None
+) -> tp.Iterator[tp.List[int]]:
+    """Split items into batches of similar length.
+
+    :param lengths: length of each item (e.g. number of tokens in a sentence)
+    :param batch_size: maximum number of items per batch
+    :param max_tokens: maximum size of a padded batch (number of items times the
+        longest length), a longer item still forms a batch of its own
+    :return: lists of item indices, so that results can be scattered back in the
+        original order
+
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive number")
+
+    order = sorted(range(len(lengths)), key=lambda idx: lengths[idx])
+    batch: tp.List[int] = []
+    for idx in order:
+        # items are sorted, so the current one sets the padded length of the batch
+        is_full = len(batch) >= batch_size
+        if max_tokens is not None and (len(batch) + 1) * lengths[idx] > max_tokens:
+            is_full = True
+        if batch and is_full:
+            yield batch
+            batch = []
+        batch.append(idx)
+
+    if batch:
+        yield batch
@@ -0,0 +1,438 @@
+import json
+import zlib
+import struct
+import typing as tp
+
+from operator import attrgetter
+
+import numpy as np
+
+from multilingual_text_parser.data_types import Doc, Position, Sentence, Syntagma, Token
+from multilingual_text_parser.features import split_phoneme
+
+__all__ = ["FORMAT_VERSION", "encode_doc", "decode_doc", "join_frames", "split_frames"]
+
+FORMAT_VERSION = 3
+
+_MAGIC = b"MTPD"
+# magic, format version, number of sentences, tokens, strings, phoneme ids,
+# crc32 of the phoneme inventory (0 if the document has its own table)
+_HEADER = struct.Struct("<4sHIIIII")
+
+_STR_FIELDS = (
+    "text",
+    "text_orig",
+    "norm",
+    "stress",
+    "pos",
+    "rel",
+    "id",
+    "head_id",
+    "lemma",
+    "emphasis",
+    "interpret_as",
+    "tag",
+    "format",
+    "asr_pause",
+    "prosody",
+)
+_JSON_FIELDS = ("feats", "modifiers")
+_FLAGS = (
+    "is_preposition",
+    "is_sub",
+    "is_capitalize",
+    "is_name",
+    "normalized",
+    "from_ssml",
+)
+_STRESS_IS_LIST = 1 << len(_FLAGS)
+_PHONEMES_IS_LIST = _STRESS_IS_LIST << 1
+_FLAGS_MASK = _STRESS_IS_LIST - 1
+_FLAG_VALUES = [
+    tuple(bool(flags & (1 << bit)) for bit in range(len(_FLAGS)))
+    for flags in range(_STRESS_IS_LIST)
+]
+
+# columns of the token table, all int32
+_TOKEN_COLUMNS = _STR_FIELDS + _JSON_FIELDS + ("start", "stop", "flags")
+_NONE = -1
+
+
+class _StringTable:
+    """Every string is stored once, None is encoded as -1."""
+
+    def __init__(self):
+        self.index: tp.Dict[tp.Optional[str], int] = {None: _NONE}
+        self._json_index: tp.Dict[tp.Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.index) - 1
+
+    def add(self, value: tp.Optional[str]) -> int:
+        return self.index.setdefault(value, len(self.index) - 1)
+
+    def add_json(self, value: tp.Any) -> int:
+        if value is None:
+            return _NONE
+
+        # equal dicts (e.g. feats) are serialized only once
+        try:
+            key: tp.Optional[tp.Hashable] = (
+                tuple(value.items()) if isinstance(value, dict) else value
+            )
+            idx = self._json_index.get(key)  # type: ignore
+        except TypeError:
+            key, idx = None, None
+
+        if idx is None:
+            idx = self.add(json.dumps(value, ensure_ascii=False, sort_keys=True))
+            if key is not None:
+                self._json_index[key] = idx
+        return idx
+
+    def to_frames(self) -> tp.Tuple[np.ndarray, bytes]:
+        encoded = [s.encode("utf-8") for s in self.index if s is not None]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+        np.cumsum([len(s) for s in encoded], out=offsets[1:])
+        return offsets, b"".join(encoded)
+
+
+def _inventory_crc(phonemes: tp.Sequence[str]) -> int:
+    return zlib.crc32("\n".join(phonemes).encode("utf-8")) or 1
+
+
+def _as_frame(array: np.ndarray) -> memoryview:
+    return memoryview(array.reshape(-1).view(np.uint8))
+
+
+def _optional_int(value: tp.Optional[int]) -> int:
+    return _NONE if value is None else int(value)
+
+
+def encode_doc(
+    doc: Doc, phonemes: tp.Optional[tp.Sequence[str]] = None
+) -> tp.List[tp.Union[bytes, memoryview]]:
+    """Encode the parse result as a list of frames.
+
+    Frames are: header, string offsets, string data, token table, phoneme
+    lengths, phoneme ids and phoneme sizes. The arrays are returned as
+    memoryviews, so they can be sent with ZMQ without copying.
+
+    Multi-character IPA phonemes are tuples of characters (see Phonemizer),
+    they are stored as the ids of their symbols (see split_phoneme) and the
+    sizes frame keeps the number of symbols of every phoneme; the frame is
+    empty if all phonemes are strings.
+
+    :param phonemes: phoneme inventory (e.g. TextParser.phonemes), phonemes
+        are stored as indices in it; by default the document carries its
+        own table of phonemes
+
+    """
+    strings = _StringTable()
+    sents = doc.sents or []
+    tokens = [token for sent in sents for token in sent.tokens]
+
+    if phonemes is not None:
+        phoneme_index = {ph: i for i, ph in enumerate(phonemes)}
+        inventory_crc = _inventory_crc(phonemes)
+    else:
+        phoneme_index = {}
+        inventory_crc = 0
+
+    index, add_json = strings.index, strings.add_json
+    get_str_fields = attrgetter(*_STR_FIELDS)
+    stress_col = _STR_FIELDS.index("stress")
+    get_json_fields = attrgetter(*_JSON_FIELDS)
+    get_flags = attrgetter(*_FLAGS)
+
+    rows: tp.List[tp.List[int]] = []
+    phoneme_lengths: tp.List[int] = []
+    phoneme_ids: tp.List[int] = []
+    # 0 for a string, 1 + the number of symbols for a tuple of characters
+    phoneme_sizes: tp.List[int] = []
+    split_table = phoneme_index if inventory_crc else None
+
+    def symbol_id(symbol: str) -> int:
+        idx = phoneme_index.get(symbol)
+        if idx is None:
+            if inventory_crc:
+                raise ValueError(f"phoneme {symbol!r} is not in the inventory")
+            idx = phoneme_index[symbol] = len(phoneme_index)
+        return idx
+
+    for token in tokens:
+        row = [
+            index.setdefault(value, len(index) - 1)
+            for value in get_str_fields(token)
+            if not isinstance(value, list)
+        ]
+        if isinstance(token.stress, list):
+            value = json.dumps(token.stress, ensure_ascii=False)
+            row.insert(stress_col, strings.add(value))
+        row += [add_json(value) for value in get_json_fields(token)]
+
+        flags = 0
+        for bit, value in enumerate(get_flags(token)):
+            if value:
+                flags |= 1 << bit
+        if isinstance(token.stress, list):
+            flags |= _STRESS_IS_LIST
+        if isinstance(token.phonemes, list):
+            flags |= _PHONEMES_IS_LIST
+        row += [
+            _optional_int(token.start),
+            _optional_int(token.stop),
+            flags,
+        ]
+        rows.append(row)
+
+        if token.phonemes is None:
+            phoneme_lengths.append(_NONE)
+            continue
+
+        phoneme_lengths.append(len(token.phonemes))
+        for ph in token.phonemes:
+            if isinstance(ph, str):
+                phoneme_ids.append(symbol_id(ph))
+                phoneme_sizes.append(0)
+            else:
+                symbols = split_phoneme(ph, split_table)
+                phoneme_ids += [symbol_id(symbol) for symbol in symbols]
+                phoneme_sizes.append(len(symbols) + 1)
+
+    table = np.array(rows, dtype=np.int32).reshape(len(tokens), len(_TOKEN_COLUMNS))
+
+    sents_info = [
+        {
+            "num_tokens": len(sent.tokens),
+            "start": getattr(sent, "start", None),
+            "stop": getattr(sent, "stop", None),
+            "text_orig": sent.text_orig,
+            "text": None if sent.tokens else sent.text,
+            "position": sent.position.name,
+            "lang": sent.lang,
+            "ssml_insertions": sent.ssml_insertions,
+            "warning_messages": sent.warning_messages,
+            "exception_messages": sent.exception_messages,
+            "syntagmas": (
+                [[len(s), s.position.name] for s in sent.syntagmas]
+                if sent.syntagmas
+                else None
+            ),
+            "parser_version": sent.parser_version,
+        }
+        for sent in sents
+    ]
+    doc_info = {
+        "text_orig": doc.text_orig,
+        "text": doc.text if doc.sents is None else None,
+        "lang": doc.lang,
+        "exception_messages": doc.exception_messages,
+        "sents": sents_info,
+        "phonemes": None if inventory_crc else list(phoneme_index),
+    }
+    doc_info_idx = strings.add_json(doc_info)
+
+    offsets, data = strings.to_frames()
+    ids_dtype = np.uint16 if len(phoneme_index) <= 0xFFFF else np.uint32
+    ids = np.asarray(phoneme_ids, dtype=ids_dtype)
+    if not any(phoneme_sizes):
+        phoneme_sizes = []
+    elif max(phoneme_sizes) > 0xFF:
+        raise ValueError("a phoneme has more than 254 symbols")
+    header = _HEADER.pack(
+        _MAGIC,
+        FORMAT_VERSION,
+        len(sents),
+        len(tokens),
+        len(strings),
+        len(phoneme_ids),
+        inventory_crc,
+    )
+    header += struct.pack("<iB", doc_info_idx, ids.itemsize)
+    return [
+        header,
+        _as_frame(offsets),
+        data,
+        _as_frame(table),
+        _as_frame(np.array(phoneme_lengths, dtype=np.int32)),
+        _as_frame(ids),
+        _as_frame(np.array(phoneme_sizes, dtype=np.uint8)),
+    ]
+
+
+def decode_doc(
+    frames: tp.Sequence[tp.Union[bytes, memoryview]],
+    phonemes: tp.Optional[tp.Sequence[str]] = None,
+) -> Doc:
+    """Restore the document from the frames created by encode_doc."""
+    if len(frames) != 7:
+        raise ValueError("wrong number of frames")
+
+    header = bytes(frames[0])
+    magic, version, num_sents, num_tokens, num_strings, num_ids, crc = (
+        _HEADER.unpack_from(header)
+    )
+    if magic != _MAGIC:
+        raise ValueError("not an encoded Doc")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported format version {version}")
+    doc_info_idx, ids_itemsize = struct.unpack_from("<iB", header, _HEADER.size)
+
+    offsets = np.frombuffer(frames[1], dtype=np.uint32)
+    data = bytes(frames[2])
+    strings = [
+        data[offsets[i] : offsets[i + 1]].decode("utf-8") for i in range(num_strings)
+    ]
+    table = np.frombuffer(frames[3], dtype=np.int32).reshape(
+        num_tokens, len(_TOKEN_COLUMNS)
+    )
+    phoneme_lengths = np.frombuffer(frames[4], dtype=np.int32)
+    ids = np.frombuffer(frames[5], dtype=np.uint16 if ids_itemsize == 2 else np.uint32)
+    if len(ids) != num_ids:
+        raise ValueError("corrupted phoneme frame")
+    sizes = np.frombuffer(frames[6], dtype=np.uint8).tolist()
+
+    doc_info = json.loads(strings[doc_info_idx])
+    if crc:
+        if phonemes is None or _inventory_crc(phonemes) != crc:
+            raise ValueError("the document was encoded with another phoneme inventory")
+        inventory = list(phonemes)
+    else:
+        inventory = doc_info["phonemes"]
+
+    # tokens are created without __init__, which is the slowest part of decoding
+    template = Token("").__getstate__()
+    slot_index = {name: i for i, name in enumerate(Token.__slots__)}
+    # tracked fields are stored in the slots with an underscore
+    slot_index.update({name: slot_index[f"_{name}"] for name in Token.TRACKED_FIELDS})
+    str_keys = [slot_index[name] for name in _STR_FIELDS]
+    json_keys = [slot_index[name] for name in _JSON_FIELDS]
+    flag_keys = [slot_index[name] for name in _FLAGS]
+    text_key = slot_index["text"]
+    start_key, stop_key = slot_index["start"], slot_index["stop"]
+    phonemes_key = slot_index["phonemes"]
+    stress_col = _STR_FIELDS.index("stress")
+    num_str = len(_STR_FIELDS)
+    num_json = len(_JSON_FIELDS)
+    json_values: tp.Dict[int, tp.Any] = {}
+    rows = table.tolist()
+    lengths = phoneme_lengths.tolist()
+    ids_list = ids.tolist()
+
+    phoneme_offset = 0
+    id_offset = 0
+    token_idx = 0
+    sents = []
+    for sent_info in doc_info["sents"]:
+        sent = Sentence()
+        sent.start = sent_info["start"]
+        sent.stop = sent_info["stop"]
+        sent.spans = None
+        sent.text_orig = sent_info["text_orig"]
+        if sent_info["text"] is not None:
+            sent.text = sent_info["text"]
+        sent.position = Position[sent_info["position"]]
+        sent.lang = sent_info["lang"]
+        sent.ssml_insertions = [tuple(item) for item in sent_info["ssml_insertions"]]
+        sent.warning_messages = sent_info["warning_messages"]
+        sent.exception_messages = sent_info["exception_messages"]
+        sent.parser_version = sent_info["parser_version"]
+
+        sent_tokens = []
+        for row in rows[token_idx : token_idx + sent_info["num_tokens"]]:
+            state = list(template)
+            for key, i in zip(str_keys, row[:num_str]):
+                state[key] = strings[i] if i != _NONE else None
+            if state[text_key] is None:
+                state[text_key] = ""
+
+            flags = row[-1]
+            for key, idx in zip(json_keys, row[num_str : num_str + num_json]):
+                if idx == _NONE:
+                    state[key] = None
+                    continue
+                if idx not in json_values:
+                    json_values[idx] = json.loads(strings[idx])
+                value = json_values[idx]
+                state[key] = value.copy() if isinstance(value, (dict, list)) else value
+
+            start, stop = row[num_str + num_json : num_str + num_json + 2]
+            state[start_key] = None if start == _NONE else start
+            state[stop_key] = None if stop == _NONE else stop
+            for key, value in zip(flag_keys, _FLAG_VALUES[flags & _FLAGS_MASK]):
+                state[key] = value
+
+            num_phonemes = lengths[token_idx]
+            token_phonemes: tp.Optional[tp.List] = None
+            if num_phonemes != _NONE:
+                end = phoneme_offset + num_phonemes
+                if sizes:
+                    token_phonemes = []
+                    for size in sizes[phoneme_offset:end]:
+                        if size == 0:
+                            token_phonemes.append(inventory[ids_list[id_offset]])
+                            id_offset += 1
+                        else:
+                            symbols = ids_list[id_offset : id_offset + size - 1]
+                            text = "".join([inventory[i] for i in symbols])
+                            token_phonemes.append(tuple(text))
+                            id_offset += size - 1
+                else:
+                    token_phonemes = [inventory[i] for i in ids_list[id_offset:end]]
+                    id_offset = end
+                phoneme_offset = end
+                if not flags & _PHONEMES_IS_LIST:
+                    state[phonemes_key] = tuple(token_phonemes)
+
+            token = Token.__new__(Token)
+            token.__setstate__(state)
+            # the setters store the lists as tracked ones
+            if flags & _STRESS_IS_LIST:
+                token.stress = json.loads(strings[row[stress_col]])
+            if flags & _PHONEMES_IS_LIST:
+                token.phonemes = token_phonemes
+            sent_tokens.append(token)
+            token_idx += 1
+
+        sent.tokens = sent_tokens
+        if sent_info["syntagmas"]:
+            syntagmas, begin = [], 0
+            for length, position in sent_info["syntagmas"]:
+                syntagma = Syntagma(sent_tokens[begin : begin + length])
+                syntagma.position = Position[position]
+                syntagmas.append(syntagma)
+                begin += length
+            sent.syntagmas = syntagmas
+        sents.append(sent)
+
+    doc = Doc(doc_info["text_orig"], add_trailing_punct_token=False)
+    doc.lang = doc_info["lang"]
+    doc.exception_messages = doc_info["exception_messages"]
+    if doc_info["text"] is not None:
+        doc.text = doc_info["text"]
+    else:
+        doc.sents = sents
+    return doc
+
+
+def join_frames(frames: tp.Sequence[tp.Union[bytes, memoryview]]) -> bytes:
+    """Pack frames into one buffer, each frame is prefixed with its length."""
+    parts = []
+    for frame in frames:
+        frame = memoryview(frame)
+        parts.append(struct.pack("<I", frame.nbytes))
+        parts.append(frame)
+    return b"".join(parts)
+
+
+def split_frames(buffer: tp.Union[bytes, memoryview]) -> tp.List[memoryview]:
+    view = memoryview(buffer)
+    frames = []
+    pos = 0
+    while pos < len(view):
+        (size,) = struct.unpack_from("<I", view, pos)
+        pos += 4
+        frames.append(view[pos : pos + size])
+        pos += size
+    return frames
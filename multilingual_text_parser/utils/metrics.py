@@ -0,0 +1,182 @@
+import time
+import typing as tp
+import bisect
+import threading
+
+from contextlib import contextmanager
+
+__all__ = ["Histogram", "Measurement", "MetricsRegistry", "DEFAULT_BUCKETS"]
+
+# upper bounds of histogram buckets in seconds, from 50 us to ~105 s
+DEFAULT_BUCKETS: tp.Tuple[float, ...] = tuple(0.00005 * 2**i for i in range(22))
+
+
+class Histogram:
+    """Latency histogram with fixed buckets.
+
+    Recording a value is a binary search and two additions, quantiles are
+    estimated by linear interpolation inside the bucket.
+
+    """
+
+    __slots__ = ("bounds", "buckets", "count", "errors", "sum")
+
+    def __init__(self, bounds: tp.Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.errors = 0
+        self.sum = 0.0
+
+    def observe(self, value: float, error: bool = False):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if error:
+            self.errors += 1
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+
+        rank = q * self.count
+        cumulative = 0
+        for idx, num in enumerate(self.buckets):
+            if num and cumulative + num >= rank:
+                lower = self.bounds[idx - 1] if idx > 0 else 0.0
+                if idx == len(self.bounds):
+                    return lower
+                return lower + (self.bounds[idx] - lower) * (rank - cumulative) / num
+            cumulative += num
+
+        return self.bounds[-1]
+
+
+class Measurement:
+    __slots__ = ("error",)
+
+    def __init__(self):
+        self.error = False
+
+
+class MetricsRegistry:
+    """Per-stage latency and error metrics of TextParser.
+
+    Metrics are grouped by language and stage name, the whole pipeline is
+    recorded as the stage "pipeline". They can be read in-process with
+    ``to_dict()`` or exported in the Prometheus text format with
+    ``to_prometheus()``.
+
+    """
+
+    PIPELINE = "pipeline"
+
+    def __init__(
+        self, buckets: tp.Sequence[float] = DEFAULT_BUCKETS, enable: bool = True
+    ):
+        self._buckets = tuple(sorted(buckets))
+        self._histograms: tp.Dict[tp.Tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+        self.enable = enable
+
+    def observe(self, lang: str, stage: str, seconds: float, error: bool = False):
+        if not self.enable:
+            return
+
+        key = (lang, stage)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self._buckets)
+            histogram.observe(seconds, error)
+
+    @contextmanager
+    def measure(self, lang: str, stage: str):
+        """Record the duration of the block.
+
+        An exception raised in the block counts as an error, as well as setting
+        ``error`` of the yielded Measurement, e.g. when a processor reported the
+        failure in exception messages.
+
+        """
+        measurement = Measurement()
+        if not self.enable:
+            yield measurement
+            return
+
+        begin_time = time.perf_counter()
+        try:
+            yield measurement
+        except BaseException:
+            self.observe(lang, stage, time.perf_counter() - begin_time, error=True)
+            raise
+        self.observe(lang, stage, time.perf_counter() - begin_time, measurement.error)
+
+    def get(self, lang: str, stage: str) -> tp.Optional[Histogram]:
+        return self._histograms.get((lang, stage))
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def to_dict(self) -> tp.Dict[str, tp.Dict[str, tp.Dict[str, float]]]:
+        """Metrics as ``{lang: {stage: {count, errors, sum, p50, p95, p99}}}``.
+
+        Durations are in seconds.
+
+        """
+        with self._lock:
+            items = list(self._histograms.items())
+
+        result: tp.Dict[str, tp.Dict[str, tp.Dict[str, float]]] = {}
+        for (lang, stage), histogram in items:
+            result.setdefault(lang, {})[stage] = {
+                "count": histogram.count,
+                "errors": histogram.errors,
+                "sum": histogram.sum,
+                "p50": histogram.quantile(0.5),
+                "p95": histogram.quantile(0.95),
+                "p99": histogram.quantile(0.99),
+            }
+        return result
+
+    def to_prometheus(self, prefix: str = "text_parser") -> str:
+        """Metrics in the Prometheus text exposition format."""
+        with self._lock:
+            items = list(self._histograms.items())
+
+        name = f"{prefix}_stage_duration_seconds"
+        lines = [
+            f"# HELP {name} Duration of TextParser stages.",
+            f"# TYPE {name} histogram",
+        ]
+        for (lang, stage), histogram in items:
+            labels = f'lang="{lang}",stage="{stage}"'
+            cumulative = 0
+            for bound, num in zip(histogram.bounds, histogram.buckets):
+                cumulative += num
+                lines.append(f'{name}_bucket{{{labels},le="{bound:.6g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.9g}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+        errors_name = f"{prefix}_stage_errors_total"
+        lines.append(
+            f"# HELP {errors_name} Number of TextParser stages failed with an error."
+        )
+        lines.append(f"# TYPE {errors_name} counter")
+        for (lang, stage), histogram in items:
+            labels = f'lang="{lang}",stage="{stage}"'
+            lines.append(f"{errors_name}{{{labels}}} {histogram.errors}")
+
+        return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    metrics = MetricsRegistry()
+    for i in range(100):
+        with metrics.measure("RU", "sleep"):
+            time.sleep(0.001 * (i % 10))
+
+    print(metrics.to_dict())
+    print(metrics.to_prometheus())
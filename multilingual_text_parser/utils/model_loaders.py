@@ -1,10 +1,13 @@
 import json
+import typing as tp
 
 from pathlib import Path
 
+import torch
+
 from transformers import AutoModel
 
-__all__ = ["load_transformer_model"]
+__all__ = ["load_transformer_model", "LayerEncoder"]
 
 
 def load_transformer_model(model_dir: Path, **kwargs):
@@ -19,3 +22,67 @@ def load_transformer_model(model_dir: Path, **kwargs):
         raise NotImplementedError
 
     return AutoModel.from_pretrained(model_name, **kwargs)
+
+
+class LayerEncoder(torch.nn.Module):
+    """Transformer encoder which returns the hidden states of one layer.
+
+    Layers after num_layer are removed from the model, so its last hidden
+    state is the output of the layer, and neither the other hidden states
+    nor the pooler output are computed. Models with layers shared between
+    groups (ALBERT with several groups) can not be truncated, for them all
+    hidden states are returned by the model and the layer is selected.
+
+    """
+
+    def __init__(self, model: torch.nn.Module, num_layer: tp.Optional[int] = None):
+        """
+        :param model: transformers model, e.g. loaded with load_transformer_model
+        :param num_layer: 1-based index of the layer, the last layer by default
+
+        """
+        super().__init__()
+        config = model.config
+        num_layer = config.num_hidden_layers if num_layer is None else num_layer
+        if not 0 < num_layer <= config.num_hidden_layers:
+            raise ValueError(
+                f"num_layer must be in [1, {config.num_hidden_layers}], got {num_layer}"
+            )
+
+        self._select_layer = False
+        if num_layer < config.num_hidden_layers:
+            encoder = getattr(model, "encoder", None)
+            layers = getattr(encoder, "layer", None)
+            if isinstance(layers, torch.nn.ModuleList):
+                encoder.layer = layers[:num_layer]
+                config.num_hidden_layers = num_layer
+            elif getattr(config, "num_hidden_groups", 1) == 1:
+                # ALBERT applies the shared layer num_hidden_layers times
+                config.num_hidden_layers = num_layer
+            else:
+                self._select_layer = True
+
+        config.output_hidden_states = self._select_layer
+        if getattr(model, "pooler", None) is not None:
+            model.pooler = None
+
+        self.model = model
+        self.num_layer = num_layer
+
+    @property
+    def config(self):
+        return self.model.config
+
+    def forward(
+        self, input_ids: torch.Tensor, attention_mask: tp.Optional[torch.Tensor] = None
+    ) -> torch.Tensor:
+        """:return: hidden states of the layer (batch, sequence, hidden size)"""
+        outputs = self.model(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            output_hidden_states=self._select_layer,
+            return_dict=True,
+        )
+        if self._select_layer:
+            return outputs.hidden_states[self.num_layer]
+        return outputs.last_hidden_state
@@ -28,9 +28,6 @@ class Profiler:
 
     def __post_init__(self):
         self.reset()
-        if self.auto_logging and not LOGGER.handlers:
-            LOGGER.addHandler(logging.StreamHandler())
-            LOGGER.setLevel(10)
 
     def __enter__(self):
         if self.enable:
@@ -115,6 +112,8 @@ class Profiler:
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
     profiler = Profiler(format=Profiler.Format.ms)
     profiler.start("test")
 
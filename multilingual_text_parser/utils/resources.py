@@ -0,0 +1,82 @@
+import typing as tp
+import logging
+import threading
+
+from multilingual_text_parser.utils.log_utils import trace
+
+__all__ = [
+    "get_resource",
+    "clear_resources",
+    "loaded_resources",
+    "news_embedding",
+    "morph_analyzer_ru",
+    "morph_vocab",
+    "e2yo",
+]
+
+LOGGER = logging.getLogger("root")
+
+_RESOURCES: tp.Dict[tp.Hashable, tp.Any] = {}
+_LOCKS: tp.Dict[tp.Hashable, threading.Lock] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_resource(key: tp.Hashable, factory: tp.Callable[[], tp.Any]) -> tp.Any:
+    """Return the resource with the key, create it with factory on the first call.
+
+    Resources are shared by all processors and TextParser instances of the
+    process and must not be modified by them. Components of TextParser are
+    loaded in parallel threads, so the factory of a key is called once under
+    its own lock and different resources are loaded concurrently.
+
+    """
+    try:
+        return _RESOURCES[key]
+    except KeyError:
+        pass
+
+    with _REGISTRY_LOCK:
+        lock = _LOCKS.setdefault(key, threading.Lock())
+
+    with lock:
+        if key not in _RESOURCES:
+            LOGGER.debug(trace("resources", message=f"load {key}"))
+            _RESOURCES[key] = factory()
+        return _RESOURCES[key]
+
+
+def clear_resources():
+    """Drop references to the loaded resources, instances in use stay alive."""
+    with _REGISTRY_LOCK:
+        _RESOURCES.clear()
+        _LOCKS.clear()
+
+
+def loaded_resources() -> tp.List[tp.Hashable]:
+    return list(_RESOURCES.keys())
+
+
+def news_embedding():
+    from natasha import NewsEmbedding
+
+    return get_resource("natasha.NewsEmbedding", NewsEmbedding)
+
+
+def morph_analyzer_ru(vocab_only: bool = False):
+    from multilingual_text_parser.processors.ru.morph_analyzer import MorphAnalyzerRU
+
+    return get_resource(
+        ("MorphAnalyzerRU", vocab_only), lambda: MorphAnalyzerRU(vocab_only=vocab_only)
+    )
+
+
+def morph_vocab():
+    from natasha import MorphVocab
+
+    return get_resource("natasha.MorphVocab", MorphVocab)
+
+
+def e2yo():
+    from multilingual_text_parser.thirdparty.ru.e2yo.e2yo.core import E2Yo
+
+    return get_resource("E2Yo", E2Yo)
@@ -0,0 +1,150 @@
+import heapq
+import typing as tp
+
+import regex as re
+
+__all__ = ["VocabRewriter"]
+
+# characters which make a wildcard rule more than a sequence of literal fragments
+_REGEX_SPECIAL = frozenset(".^$+?{}[]\\|()")
+
+
+class VocabRewriter:
+    """Applies a vocabulary of replacement rules as consecutive str.replace calls.
+
+    The result is exactly the same as of
+
+        for key, value in rules:
+            text = text.replace(key, value)
+
+    but only the rules whose keys occur in the text are applied. The keys are
+    compiled into an Aho-Corasick automaton, which finds all of them in one
+    left-to-right pass over the text. After a rule has changed the text, the
+    text is scanned again for the remaining rules, because the replacement may
+    create new occurrences of them.
+
+    Keys with the wildcard symbol are applied as regular expressions, the
+    wildcard matches a word tail and is substituted into the value, like
+    ``re.sub(key.replace("*", r"(\\w*)"), value.replace("*", "\\1"), text)``.
+
+    """
+
+    def __init__(
+        self,
+        rules: tp.Iterable[tp.Tuple[str, str]],
+        wildcard: tp.Optional[str] = None,
+    ):
+        """
+        :param rules: (key, value) pairs in the order of application
+        :param wildcard: symbol of a word tail in the keys and values
+
+        """
+        self._keys: tp.List[str] = []
+        self._values: tp.List[str] = []
+        self._patterns: tp.List[tp.Optional[tp.Pattern]] = []
+        self._goto: tp.List[tp.Dict[str, int]] = [{}]
+        self._fail: tp.List[int] = [0]
+        self._out: tp.List[tp.Tuple[int, ...]] = [()]
+        always = []
+
+        for idx, (key, value) in enumerate(rules):
+            if wildcard and wildcard in key:
+                pattern = re.compile(key.replace(wildcard, r"(\w*)"))
+                value = value.replace(wildcard, "\\1")
+                trigger = self._trigger(key, wildcard)
+            else:
+                pattern = None
+                trigger = key
+
+            self._keys.append(key)
+            self._values.append(value)
+            self._patterns.append(pattern)
+            if trigger:
+                self._add(trigger, idx)
+            else:
+                always.append(idx)
+
+        self._always = tuple(always)
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def _trigger(key: str, wildcard: str) -> str:
+        """Literal part of a wildcard key which occurs in every match of it."""
+        fragments = key.split(wildcard)
+        if any(ch in _REGEX_SPECIAL for fragment in fragments for ch in fragment):
+            return ""
+        return max(fragments, key=len)
+
+    def _add(self, key: str, idx: int):
+        state = 0
+        for ch in key:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+        self._out[state] += (idx,)
+
+    def _build(self):
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, next_state in goto[state].items():
+                queue.append(next_state)
+                link = fail[state]
+                while link and ch not in goto[link]:
+                    link = fail[link]
+                link = goto[link].get(ch, 0)
+                fail[next_state] = link
+                # the suffix outputs are shared, not copied, for states without own keys
+                out[next_state] = (
+                    out[next_state] + out[link] if out[next_state] else out[link]
+                )
+
+    def _find(self, text: str) -> tp.Set[int]:
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set(self._always)
+        state = 0
+        for ch in text:
+            transitions = goto[state]
+            while state and ch not in transitions:
+                state = fail[state]
+                transitions = goto[state]
+            state = transitions.get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+    def replace(self, text: str, end: tp.Optional[int] = None) -> str:
+        """Apply the rules to the text.
+
+        :param end: apply only the rules with indices less than end
+
+        """
+        end = len(self._keys) if end is None else end
+        queue = [idx for idx in self._find(text) if idx < end]
+        queued = set(queue)
+        heapq.heapify(queue)
+
+        while queue:
+            idx = heapq.heappop(queue)
+            pattern = self._patterns[idx]
+            if pattern is None:
+                new_text = text.replace(self._keys[idx], self._values[idx])
+            else:
+                new_text = pattern.sub(self._values[idx], text)
+
+            if new_text != text:
+                text = new_text
+                for next_idx in self._find(text):
+                    if idx < next_idx < end and next_idx not in queued:
+                        queued.add(next_idx)
+                        heapq.heappush(queue, next_idx)
+
+        return text
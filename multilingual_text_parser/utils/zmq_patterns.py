@@ -7,7 +7,6 @@ from contextlib import closing
 from dataclasses import dataclass
 
 import zmq
-import zmq.asyncio
 
 from multilingual_text_parser.utils.log_utils import trace
 
@@ -61,6 +60,25 @@ class ZMQClient:
         self.send(message, serialize)
         return self.recv(deserialize, timeout)
 
+    def send_doc(self, doc, phonemes: tp.Optional[tp.Sequence[str]] = None):
+        """Send the document in the binary format of Doc.to_bytes, the arrays
+        are passed to ZMQ without copying."""
+        from multilingual_text_parser.utils.doc_codec import encode_doc
+
+        self.socket.send_multipart(encode_doc(doc, phonemes), copy=False)
+
+    def recv_doc(
+        self,
+        phonemes: tp.Optional[tp.Sequence[str]] = None,
+        timeout: tp.Optional[int] = None,  # in milliseconds
+    ):
+        from multilingual_text_parser.utils.doc_codec import decode_doc
+
+        if timeout is not None and self.socket.poll(timeout=timeout) == 0:
+            return None
+        frames = self.socket.recv_multipart(copy=False)
+        return decode_doc([frame.buffer for frame in frames], phonemes)
+
     def send_string(self, message: str):
         self.socket.send_string(message)
 
@@ -0,0 +1,68 @@
+import time
+import typing as tp
+import argparse
+import tracemalloc
+
+from copy import deepcopy
+
+from multilingual_text_parser.data_types import Doc
+
+UTTERANCE = (
+    "Объем валовой добавленной стоимости в сельском хозяйстве, охоте и лесном "
+    "хозяйстве России — 1,53 трлн руб. По данным Росстата, в 2007 г. общий валовой "
+    "продукт сельского хозяйства России составил 2099,6 млрд руб., из которых на "
+    "растениеводство (земледелие) приходилось 1174,9 млрд руб. (55,96%), а на "
+    "животноводство — 924,7 млрд руб. "
+)
+
+
+def measure(
+    copy_fn: tp.Callable[[Doc], Doc], doc: Doc, repeats: int
+) -> tp.Tuple[float, float]:
+    """Return average time (ms) and average allocated memory (KiB) per copy."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        copy_fn(doc)
+    elapsed = (time.perf_counter() - start) * 1000 / repeats
+
+    tracemalloc.start()
+    for _ in range(repeats):
+        copy_fn(doc)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of copying Doc objects")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    methods = {
+        "deepcopy": deepcopy,
+        "Doc.copy": lambda d: d.copy(),
+        "no copy": lambda d: d,
+    }
+
+    print(
+        f"{'paragraphs':>10} {'tokens':>8} {'doc state':>10} {'method':>10} {'ms':>10} {'KiB':>10}"
+    )
+    for size in args.sizes:
+        text = UTTERANCE * size
+        docs = {
+            "fresh": Doc(text),
+            "tokenized": Doc(text, sentenize=True, tokenize=True),
+        }
+        num_tokens = len(docs["tokenized"].tokens)
+        for state, doc in docs.items():
+            for name, fn in methods.items():
+                ms, kib = measure(fn, doc, args.repeats)
+                print(
+                    f"{size:>10} {num_tokens:>8} {state:>10} {name:>10} {ms:>10.3f} {kib:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -11,12 +11,14 @@ def parse(utterance: str, lang: str, device: str = "cpu", view: bool = False):
     text_parser = TextParser(lang=lang, device=device, with_profiler=False)
     text_parser.process(Doc(utterance))
 
-    prof = Profiler(format=Profiler.Format.ms, auto_logging=False)
+    prof = Profiler(name="process", format=Profiler.Format.ms, auto_logging=False)
 
     for _ in range(10):
+        prof.start()
         doc = text_parser.process(Doc(utterance))
+        prof.stop()
 
-    print(f"{lang}: {prof.get_time() / 10} ms")
+    print(f"{lang}: {prof.get_time()} ms")
     print("---------")
     print(doc.text)
     print("---------")
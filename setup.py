@@ -37,16 +37,24 @@ setuptools.setup(
     version=f"{about['__version__']}",
     description="Text normalizer and phonemizer for TTS systems",
     long_description=README,
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(
+        exclude=["tests", "tests.*", "benchmarks", "benchmarks.*"]
+    ),
     python_requires=">=3.8",
     install_requires=_load_requirements(HERE),
     package_data={"multilingual_text_parser": data},
+    entry_points={
+        "console_scripts": [
+            "text-parser-preprocess=multilingual_text_parser.preprocess:main",
+        ]
+    },
     # https://nuitka.net/doc/user-manual.html#use-case-5-setuptools-wheels
     command_options={
         "nuitka": {
             "--python-flag": "no_docstrings",
             "--nofollow-import-to": [
                 "tests.*",
+                "benchmarks.*",
             ],
         }
     },
@@ -48,3 +48,18 @@ def test_homographer(text, expected):
     doc = homographer(doc)
     sent = doc.sents[0]
     assert expected in sent.get_attr("phonemes")
+
+
+def test_homographer_exception_messages(monkeypatch):
+    def predict(regex, embeds):
+        raise ValueError("broken classifier")
+
+    monkeypatch.setattr(homographer, "_predict", predict)
+    doc = Doc(testdata[0][0])
+    doc = text_mode(symb_mode(doc, **{"lang": "EN"}))
+    doc = sentenizer(corrector(doc))
+    doc = ssmlcol(sent_mode(doc))
+    doc = ssmlapp(tokenizer(doc))
+    doc = homographer(normalizer(doc))
+    assert doc.exception_messages[0].startswith("HomographerEN, failed on")
+    assert testdata[0][1] not in doc.sents[0].get_attr("phonemes")
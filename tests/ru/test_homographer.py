@@ -1,4 +1,7 @@
+import re
+
 import pytest
+import torch
 
 from multilingual_text_parser.data_types import Doc
 from multilingual_text_parser.processors import (
@@ -45,8 +48,7 @@ testdata = [
 ]
 
 
-@pytest.mark.parametrize("text, expected", testdata)
-def test_homographer(text, expected):
+def _prepare(text: str) -> Doc:
     doc = Doc(text)
     doc = text_mode(symb_mode(doc, **{"lang": "RU"}))
     doc = text_mode_ru(symb_mode(doc))
@@ -54,7 +56,71 @@ def test_homographer(text, expected):
     doc = tokenizer(sent_mode(doc))
     doc = syntaxer(doc)
     doc = text_mode.restore(doc)
-    doc = normalizer(doc)
-    doc = homographer(doc)
+    return normalizer(doc)
+
+
+@pytest.mark.parametrize("text, expected", testdata)
+def test_homographer(text, expected):
+    doc = homographer(_prepare(text))
     sent = doc.sents[0]
     assert sent.get_attr("stress") == expected
+
+
+def test_homographer_batch(monkeypatch):
+    # a small token budget splits the documents into several forward passes
+    monkeypatch.setattr(homographer, "_max_tokens", 64)
+    docs = homographer.process_batch([_prepare(text) for text, _ in testdata])
+    for doc, (_, expected) in zip(docs, testdata):
+        assert doc.sents[0].get_attr("stress") == expected
+
+
+def test_homograph_index():
+    for key_idx, key in enumerate(homographer.corpus_keys):
+        for word in homographer._expand_pattern(key) or []:
+            assert re.search(f"^{key}$", word)
+            assert key_idx in homographer._lexical_matches(word)
+    assert homographer._lexical_matches("замочек") == []
+
+
+def test_homographer_window(monkeypatch):
+    # the homographs are farther apart than the windows
+    text = (
+        "он живет в замке, "
+        + "и каждый вечер он долго гуляет по саду, " * 3
+        + "а потом закрывается на замок."
+    )
+    words = [t.text for t in _prepare(text).sents[0].tokens]
+
+    samples = homographer._find_homographs(_prepare(text))
+    assert len(samples) == 1
+    tok_ids = sorted(h.tok_id for h in samples[0]["homographs"])
+    expected = homographer(_prepare(text)).sents[0].get_attr("stress")
+
+    monkeypatch.setattr(homographer, "window", 10)
+    samples = homographer._find_homographs(_prepare(text))
+    assert len(samples) > 1
+    windowed_tok_ids = []
+    for sample in samples:
+        begin, end = sample["offset"], sample["offset"] + len(sample["batch"])
+        assert sample["batch"] == words[begin:end]
+        for homograph in sample["homographs"]:
+            assert begin <= homograph.tok_id < end
+            windowed_tok_ids.append(homograph.tok_id)
+    assert sorted(windowed_tok_ids) == tok_ids
+
+    # the window keeps enough context to resolve the homographs as whole sentences
+    stresses = homographer(_prepare(text)).sents[0].get_attr("stress")
+    assert stresses == expected
+
+
+def test_layer_encoder():
+    inp = homographer.tokenizer("Он живет в замке", return_tensors="pt")
+    with torch.inference_mode():
+        hidden = homographer.model(inp["input_ids"], inp["attention_mask"])
+        outputs = homographer.model.model(
+            input_ids=inp["input_ids"],
+            attention_mask=inp["attention_mask"],
+            output_hidden_states=True,
+        )
+    assert len(outputs.hidden_states) == homographer.model.num_layer + 1
+    assert torch.equal(hidden, outputs.hidden_states[homographer.model.num_layer])
@@ -0,0 +1,12 @@
+from multilingual_text_parser.parser import TextParser
+from multilingual_text_parser.processors import NameFinder, PosTaggerRU, SyntaxAnalyzerRU
+from multilingual_text_parser.utils.resources import morph_analyzer_ru, news_embedding
+
+
+def test_shared_resources():
+    assert PosTaggerRU()._emb is SyntaxAnalyzerRU()._emb is news_embedding()
+    assert NameFinder()._morph is morph_analyzer_ru()
+
+    other_parser = TextParser(lang="RU")
+    name = next(name for name in other_parser.stages if name.endswith("_PosTaggerRU"))
+    assert other_parser.get_component(name)._emb is news_embedding()
@@ -121,3 +121,115 @@ def test_phonemizer(utterance, expected):
     attr = TokenUtils.get_attr(doc.tokens, ["phonemes"])
     phonemes = attr["phonemes"]
     assert phonemes == expected
+
+
+def test_process_batch():
+    utterances = [item[0] for item in testdata] + ["   "]
+    results = parser.process_batch([Doc(text) for text in utterances])
+
+    assert len(results) == len(utterances)
+    assert isinstance(results[-1], Exception)
+    for utterance, doc in zip(utterances, results):
+        if isinstance(doc, Exception):
+            continue
+        expected = parser.process(Doc(utterance))
+        assert doc.text == expected.text
+        assert doc.stress == expected.stress
+        assert TokenUtils.get_attr(doc.tokens, ["phonemes"]) == TokenUtils.get_attr(
+            expected.tokens, ["phonemes"]
+        )
+
+
+def test_process_stream():
+    utterances = [item[0] for item in testdata] * 3
+    results = list(parser.process_stream(iter(utterances), num_workers=3, queue_size=2))
+
+    assert len(results) == len(utterances)
+    for utterance, doc in zip(utterances, results):
+        expected = parser.process(Doc(utterance))
+        assert doc.text == expected.text
+        assert doc.stress == expected.stress
+
+
+def test_doc_copy():
+    doc = Doc("Ночь, улица, фонарь, аптека. Бессмысленный и тусклый свет.", True, True)
+    doc_copy = doc.copy()
+    doc_copy.sents[0].tokens[0].text = "день"
+    doc_copy.sents[0].tokens[0].meta["key"] = "value"
+    doc_copy.sents[1].exception_messages.append("error")
+
+    assert doc.text != doc_copy.text
+    assert doc.sents[0].tokens[0].meta == {}
+    assert doc.sents[1].exception_messages == []
+    assert doc_copy.sents[0].tokens[0] != doc.sents[0].tokens[0]
+
+
+def test_process_without_copy():
+    doc = Doc(testdata[0][0])
+    result = parser.process(doc, copy=False)
+    assert result is doc
+    assert result.text == parser.process(Doc(testdata[0][0])).text
+
+
+def test_lazy_components():
+    lazy_parser = TextParser(lang="RU")
+    assert lazy_parser("ночь улица фонарь аптека") == parser("ночь улица фонарь аптека")
+
+    loaded = [name for name in lazy_parser.stages if name in lazy_parser._components]
+    assert not any("AccentorRU" in name or "HomographerRU" in name for name in loaded)
+
+    components = lazy_parser.components
+    assert list(components) == lazy_parser.stages
+    name = next(name for name in components if name.endswith("_AccentorRU"))
+    assert name not in lazy_parser._components
+    assert components[name] is lazy_parser.get_component(name)
+
+
+def test_stage_plan():
+    waves = [[name.split("_", 1)[1] for name in wave] for wave in parser.plan().waves]
+    wave = next(wave for wave in waves if "PosTaggerRU" in wave)
+    assert {"OriginalTextRestorer", "SyntaxAnalyzerRU", "TaggerRU"} <= set(wave)
+    assert "NameFinder" not in wave
+
+    concurrent_parser = TextParser(lang="RU", concurrent_stages=True)
+    utterance = "Фото на стр. 5 ярко иллюстрирует упомянутый выше феномен."
+    doc = concurrent_parser.process(Doc(utterance))
+    expected = parser.process(Doc(utterance))
+    assert doc.stress == expected.stress
+    assert TokenUtils.get_attr(doc.tokens, ["pos", "head_id"]) == TokenUtils.get_attr(
+        expected.tokens, ["pos", "head_id"]
+    )
+
+
+def test_metrics():
+    metrics_parser = TextParser(lang="RU")
+    metrics_parser.process(Doc("Привет! Сегодня 5 мая."))
+    with pytest.raises(Exception):
+        metrics_parser.process(Doc("   "))
+
+    stats = metrics_parser.metrics.to_dict()["RU"]
+    assert stats["pipeline"]["count"] == 2
+    assert stats["pipeline"]["errors"] == 1
+    assert stats["pipeline"]["p50"] <= stats["pipeline"]["p99"]
+    assert all(name in stats for name in metrics_parser.stages)
+
+    text = metrics_parser.metrics.to_prometheus()
+    assert (
+        'text_parser_stage_duration_seconds_count{lang="RU",stage="pipeline"} 2' in text
+    )
+
+
+def test_metrics_exception_messages(monkeypatch):
+    metrics_parser = TextParser(lang="RU")
+    name = next(name for name in metrics_parser.stages if name.endswith("_Corrector"))
+    # the processor catches the exception and adds it to exception messages
+    monkeypatch.setattr(metrics_parser.get_component(name), "_patterns", [(None, None)])
+
+    doc = metrics_parser.process(Doc("Привет! Сегодня 5 мая."))
+    assert doc.exceptions
+    metrics_parser.process_batch([Doc("Привет!"), Doc("Пока!")])
+    list(metrics_parser.process_stream(["Привет!"], num_workers=2))
+
+    stats = metrics_parser.metrics.to_dict()["RU"]
+    assert stats[name]["errors"] == stats[name]["count"] == 3
+    assert stats["pipeline"]["count"] == stats["pipeline"]["errors"] == 4
@@ -0,0 +1,52 @@
+import asyncio
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from multilingual_text_parser.async_parser import AsyncTextParser
+from multilingual_text_parser.cache import SentenceCache
+from multilingual_text_parser.data_types import Doc
+from multilingual_text_parser.parser import TextParser
+
+parser = TextParser(lang="RU")
+
+texts = ["рыбки и икринки", "большой прирост заболевших", "ОТП"]
+
+
+def test_async_parser():
+    utterances = list(texts)
+
+    async def parse_all():
+        async_parser = AsyncTextParser(parser=parser, max_workers=2)
+        try:
+            return await asyncio.gather(*[async_parser.parse(t) for t in utterances])
+        finally:
+            async_parser.close()
+
+    results = asyncio.run(parse_all())
+    for utterance, doc in zip(utterances, results):
+        expected = parser.process(Doc(utterance))
+        assert doc.text == expected.text
+        assert doc.stress == expected.stress
+
+    # the pipeline can not be pickled to another process
+    with ProcessPoolExecutor(1) as executor, pytest.raises(ValueError):
+        AsyncTextParser(parser=parser, executor=executor)
+
+
+def test_async_parser_cache_and_metrics():
+    cached_parser = TextParser(lang="RU", cache=SentenceCache(), concurrent_stages=True)
+
+    async def parse_twice():
+        async with AsyncTextParser(parser=cached_parser, max_workers=2) as async_parser:
+            first = await async_parser.parse(texts[0])
+            second = await async_parser.parse(texts[0])
+            return first, second
+
+    first, second = asyncio.run(parse_twice())
+    assert first.stress == second.stress == parser.process(Doc(texts[0])).stress
+    assert cached_parser.cache.hits == 1
+
+    stats = cached_parser.metrics.to_dict()["RU"]
+    assert stats["pipeline"]["count"] == 2
@@ -0,0 +1,62 @@
+import threading
+
+from multilingual_text_parser.cache import (
+    CachedSentence,
+    DiskSentenceCache,
+    SentenceCache,
+)
+from multilingual_text_parser.data_types import Doc, TokenUtils
+from multilingual_text_parser.parser import TextParser
+
+parser = TextParser(lang="RU")
+
+
+def test_sentence_cache():
+    cached_parser = TextParser(lang="RU", cache=SentenceCache(max_entries=100))
+    utterance = "Привет! Сегодня 5 мая. Привет! Как дела?"
+
+    for _ in range(2):
+        doc = cached_parser.process(Doc(utterance))
+        expected = parser.process(Doc(utterance))
+        assert doc.text == expected.text
+        assert doc.stress == expected.stress
+        assert [s.position for s in doc.sents] == [s.position for s in expected.sents]
+        assert TokenUtils.get_attr(doc.tokens, ["phonemes"]) == TokenUtils.get_attr(
+            expected.tokens, ["phonemes"]
+        )
+
+    assert cached_parser.cache.hits > 0
+
+
+def test_sentence_cache_counters():
+    cache = SentenceCache(max_entries=4)
+    for key in range(4):
+        cache.put(key, CachedSentence(sentence=None))
+
+    def lookup():
+        for _ in range(1000):
+            for key in range(8):
+                cache.get(key)
+
+    threads = [threading.Thread(target=lookup) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.hits == cache.misses == 4 * 1000 * 4
+
+
+def test_disk_sentence_cache(tmp_path):
+    utterance = "Привет! Сегодня 5 мая."
+    expected = parser.process(Doc(utterance))
+
+    for _ in range(2):
+        disk_cache = DiskSentenceCache(tmp_path / "cache.db")
+        cached_parser = TextParser(
+            lang="RU", cache=SentenceCache(second_level=disk_cache)
+        )
+        doc = cached_parser.process(Doc(utterance))
+        assert doc.stress == expected.stress
+
+    assert disk_cache.hits == 2
@@ -0,0 +1,59 @@
+import pickle
+
+from multilingual_text_parser.data_types import Doc, Token
+from multilingual_text_parser.parser import TextParser
+
+parser = TextParser(lang="RU")
+
+
+def test_token_slots():
+    doc = parser.process(Doc("Ночь, улица, фонарь, аптека."))
+    token = doc.tokens[0]
+    assert not hasattr(token, "__dict__")
+    assert token.meta == {}
+
+    new_doc = pickle.loads(pickle.dumps(doc))
+    assert new_doc.stress == doc.stress
+    assert [tuple(t) for t in new_doc.tokens] == [tuple(t) for t in doc.tokens]
+    assert new_doc.tokens[0] != token
+    assert new_doc.tokens.index(new_doc.tokens[2]) == 2
+
+
+def test_cached_views():
+    doc = parser.process(
+        Doc("Ночь, улица, фонарь, аптека. Бессмысленный и тусклый свет.")
+    )
+    sent = doc.sents[0]
+    assert doc.text is doc.text
+    assert sent.get_words() == sent.get_words()
+
+    # getters return copies, changing them does not change the cached views
+    words = sent.get_words()
+    words.pop()
+    assert len(sent.get_words()) == len(words) + 1
+    groups = sent.get_words_with_punct()
+    groups[0].append(Token("!"))
+    assert sent.get_words_with_punct() != groups
+
+    sent.tokens[0].text = "день"
+    assert doc.text.startswith("день")
+    sent.tokens[0].stress = "де+нь"
+    assert doc.stress.startswith("де+нь")
+    # the stress variants list made by get_stress_from_tokens is tracked
+    sent.tokens[0].stress.append("дни+")
+    assert "{дни+}" in doc.stress
+
+    num_words = sent.num_words
+    sent.tokens.insert(1, Token("тихая"))
+    assert sent.num_words == num_words + 1
+    assert doc.tokens[1].text == "тихая"
+
+    doc.sents.pop()
+    assert doc.text == sent.text
+
+    # changes of other documents keep the cached views
+    other_doc = parser.process(Doc("Привет, мир."))
+    text = other_doc.text
+    sent.tokens[0].text = "утро"
+    assert other_doc.text is text
+    assert doc.text.startswith("утро")
@@ -0,0 +1,64 @@
+from multilingual_text_parser.data_types import Doc
+from multilingual_text_parser.dataset import DatasetReader, DatasetWriter
+from multilingual_text_parser.features import FeatureExporter
+from multilingual_text_parser.parser import TextParser
+
+parser = TextParser(lang="RU")
+
+texts = ["рыбки и икринки", "большой прирост заболевших", "ОТП"]
+
+
+def test_dataset(tmp_path):
+    docs = [parser.process(Doc(text)) for text in texts]
+    with DatasetWriter(tmp_path, phonemes=parser.phonemes, shard_size=4) as writer:
+        for doc in docs:
+            writer.add(doc)
+
+    reader = DatasetReader(tmp_path)
+    sents = [sent for doc in docs for sent in doc.sents]
+    assert len(reader) == len(sents)
+    assert reader.num_shards == (len(sents) + 3) // 4
+    for idx, sent in enumerate(sents):
+        assert reader[idx] == sent.to_dict()
+        assert reader.stress(idx) == sent.stress
+        phonemes = [reader.phonemes[i - 1] for i in reader.phoneme_ids(idx)]
+        assert tuple(phonemes) == sent.get_phonemes(as_tuple=True)
+
+
+def test_dataset_phoneme_ids(tmp_path):
+    # repeated symbols of an inventory get the first id, as in FeatureExporter
+    inventory = ["a", "b", "a", "c"]
+    doc = Doc("ab ca", sentenize=True, tokenize=True)
+    for token in doc.tokens:
+        token.phonemes = tuple(token.text) if token.is_word else None
+
+    with DatasetWriter(tmp_path, phonemes=inventory) as writer:
+        writer.add(doc)
+
+    features = FeatureExporter(phonemes=inventory).export(doc)
+    ids = DatasetReader(tmp_path).phoneme_ids(0)
+    assert list(ids) == features.phoneme_ids.tolist() == [1, 2, 4, 1]
+
+
+def test_dataset_ipa(tmp_path):
+    kk_parser = TextParser(lang="KK")
+    doc = kk_parser.process(Doc("Сәлем, әлем! Бүгін күн жылы."))
+    # multi-character phonemes are tuples of characters, see Phonemizer
+    doc.tokens[0].phonemes = ["a", ("t", "ʃ")]
+
+    with DatasetWriter(tmp_path / "inventory", phonemes=kk_parser.phonemes) as writer:
+        writer.add(doc)
+    reader = DatasetReader(tmp_path / "inventory")
+    features = FeatureExporter.from_parser(kk_parser).export(doc)
+    ids = [i for idx in range(len(reader)) for i in reader.phoneme_ids(idx).tolist()]
+    assert ids == features.phoneme_ids.tolist()
+    assert [reader.phonemes[i - 1] for i in ids[:3]] == ["a", "t", "ʃ"]
+
+    # without an inventory the phoneme is one symbol, the dataset can be appended
+    for _ in range(2):
+        with DatasetWriter(tmp_path / "collected") as writer:
+            writer.add(doc)
+    reader = DatasetReader(tmp_path / "collected")
+    assert len(reader) == 2 * len(doc.sents)
+    ids = reader.phoneme_ids(len(doc.sents))
+    assert [reader.phonemes[i - 1] for i in ids[:2]] == ["a", "tʃ"]
@@ -0,0 +1,50 @@
+import pytest
+
+from multilingual_text_parser.data_types import Doc, TokenUtils
+from multilingual_text_parser.parser import TextParser
+
+parser = TextParser(lang="RU")
+
+
+def test_doc_to_bytes():
+    doc = parser.process(Doc("Фото на стр. 5 ярко иллюстрирует упомянутый выше феномен."))
+
+    for phonemes in [None, parser.phonemes]:
+        new_doc = Doc.from_bytes(doc.to_bytes(phonemes), phonemes)
+        assert new_doc.stress == doc.stress
+        assert new_doc.capitalize == doc.capitalize
+        for attr in ["phonemes", "pos", "rel", "head_id", "text_orig"]:
+            assert TokenUtils.get_attr(new_doc.tokens, [attr]) == TokenUtils.get_attr(
+                doc.tokens, [attr]
+            )
+
+    with pytest.raises(ValueError):
+        Doc.from_bytes(doc.to_bytes(parser.phonemes))
+
+
+def test_doc_to_bytes_prosody():
+    doc = parser.process(
+        Doc(
+            '<speak><intonation label="-1">Ночь</intonation>, '
+            '<intonation label="3">улица</intonation>, фонарь.</speak>'
+        )
+    )
+    prosody = [token.prosody for token in doc.tokens]
+    assert "-1" in prosody and "3" in prosody
+
+    new_doc = Doc.from_bytes(doc.to_bytes())
+    assert [token.prosody for token in new_doc.tokens] == prosody
+
+
+def test_doc_to_bytes_ipa():
+    kk_parser = TextParser(lang="KK")
+    doc = kk_parser.process(Doc("Сәлем, әлем! Бүгін күн жылы."))
+    # multi-character phonemes are tuples of characters, see Phonemizer
+    doc.tokens[0].phonemes = ["s", ("t", "ʃ"), ("e", "̞"), ("ˈ", "a", "ː")]
+
+    for phonemes in [None, kk_parser.phonemes]:
+        new_doc = Doc.from_bytes(doc.to_bytes(phonemes), phonemes)
+        assert new_doc.stress == doc.stress
+        for new_token, token in zip(new_doc.tokens, doc.tokens):
+            assert new_token.phonemes == token.phonemes
+            assert type(new_token.phonemes) is type(token.phonemes)
@@ -0,0 +1,45 @@
+from multilingual_text_parser.data_types import Doc
+from multilingual_text_parser.features import FeatureExporter
+from multilingual_text_parser.parser import TextParser
+
+parser = TextParser(lang="RU")
+
+
+def test_feature_export():
+    assert parser.phonemes is parser.phonemes
+    exporter = FeatureExporter.from_parser(parser)
+    doc = parser.process(Doc("Как тебя зовут? Фото на стр. 5 ярко иллюстрирует феномен."))
+    features = exporter.export(doc)
+
+    phonemes = [ph for t in doc.tokens if t.phonemes for ph in t.phonemes]
+    assert [parser.phonemes[i - 1] for i in features.phoneme_ids] == phonemes
+    assert features.num_words == len([t for t in doc.tokens if t.phonemes])
+    assert features.token_offsets[-1] == features.word_offsets[-1] == len(phonemes)
+    for idx, token in enumerate(doc.tokens):
+        begin, end = features.token_offsets[idx : idx + 2]
+        assert (features.phoneme_token_index[begin:end] == idx).all()
+        if token.pos is not None:
+            assert parser.pos[features.pos_ids[idx] - 1] == token.pos
+
+    assert features.sentence_offsets.tolist() == [
+        0,
+        len(doc.sents[0].tokens),
+        len(doc.tokens),
+    ]
+    intonation = [parser.intonation[i - 1] for i in features.intonation_ids]
+    assert intonation == ["quest_type0", "dot_type"]
+
+
+def test_feature_export_ipa():
+    kk_parser = TextParser(lang="KK")
+    exporter = FeatureExporter.from_parser(kk_parser)
+    doc = kk_parser.process(Doc("Сәлем, әлем!"))
+    features = exporter.export(doc)
+    assert features.num_words == len([t for t in doc.tokens if t.phonemes])
+
+    # multi-character phonemes are tuples of characters, see Phonemizer
+    doc.tokens[0].phonemes = ["s", ("t", "ʃ"), ("e", "̞"), ("ˈ", "a", "ː")]
+    features = exporter.export(doc)
+    symbols = [kk_parser.phonemes[i - 1] for i in features.phoneme_ids]
+    assert symbols[:7] == ["s", "t", "ʃ", "e̞", "ˈ", "a", "ː"]
+    assert features.token_offsets[1] == 7
@@ -0,0 +1,19 @@
+from multilingual_text_parser.data_types import Doc
+from multilingual_text_parser.parallel import ParallelTextParser
+from multilingual_text_parser.parser import TextParser
+
+parser = TextParser(lang="RU")
+
+texts = ["рыбки и икринки", "большой прирост заболевших", "ОТП"]
+
+
+def test_parallel_parser():
+    utterances = texts * 2
+    with ParallelTextParser(lang="RU", workers=2) as parallel_parser:
+        results = list(parallel_parser.imap(utterances))
+
+    assert len(results) == len(utterances)
+    for utterance, doc in zip(utterances, results):
+        expected = parser.process(Doc(utterance))
+        assert doc.text == expected.text
+        assert doc.stress == expected.stress
@@ -0,0 +1,46 @@
+import json
+
+from multilingual_text_parser.data_types import Doc
+from multilingual_text_parser.parser import TextParser
+from multilingual_text_parser.preprocess import CorpusPreprocessor, read_binary_shard
+
+parser = TextParser(lang="RU")
+
+texts = ["рыбки и икринки", "большой прирост заболевших", "ОТП"]
+
+
+def test_preprocess(tmp_path):
+    utterances = texts + ["..."]
+    corpus = tmp_path / "corpus.txt"
+    corpus.write_text("\n".join(utterances), encoding="utf-8")
+
+    preprocessor = CorpusPreprocessor(
+        "RU", tmp_path / "out", output_format="binary", shard_size=3, workers=2
+    )
+    summary = preprocessor.run(corpus)
+    assert summary["docs"] + summary["failed"] == len(utterances)
+    last_shard = (len(utterances) - 1) // 3
+    assert "EmptyTextError" in preprocessor.failures_path(last_shard).read_text()
+
+    docs = dict(read_binary_shard(preprocessor.shard_path(0)))
+    for idx in range(3):
+        assert docs[idx].stress == parser.process(Doc(utterances[idx])).stress
+
+    # finished shards are not processed again
+    assert preprocessor.run(corpus) == summary
+
+
+def test_preprocess_broken_lines(tmp_path):
+    corpus = tmp_path / "corpus.jsonl"
+    lines = ['{"text": "Привет!", "id": "a"}', '{"text": "Привет', "[1, 2]", ""]
+    corpus.write_text("\n".join(lines + ['{"text": "Пока!", "id": "b"}']), "utf-8")
+
+    preprocessor = CorpusPreprocessor("RU", tmp_path / "out", id_key="id", workers=1)
+    summary = preprocessor.run(corpus)
+    assert summary["docs"] == 2 and summary["failed"] == 2
+
+    failures = preprocessor.failures_path(0).read_text(encoding="utf-8").splitlines()
+    errors = {json.loads(line)["line"]: json.loads(line)["error"] for line in failures}
+    assert errors == {1: "JSONDecodeError", 2: "TypeError"}
+    ids = [json.loads(line)["id"] for line in preprocessor.shard_path(0).open()]
+    assert ids == ["a", "b"]
@@ -0,0 +1,27 @@
+import threading
+
+from multilingual_text_parser.client import ParserClient
+from multilingual_text_parser.data_types import Doc
+from multilingual_text_parser.parser import TextParser
+from multilingual_text_parser.server import ParserServer
+
+parser = TextParser(lang="RU")
+
+
+def test_parser_server(tmp_path):
+    addr = f"ipc://{tmp_path / 'parser.ipc'}"
+    server = ParserServer(lang="RU", addr=addr, workers=2)
+    thread = threading.Thread(target=server.serve)
+    thread.start()
+    try:
+        assert server.wait_ready(timeout=300)
+        utterances = ["Привет! Сегодня 5 мая.", "   ", "ночь улица фонарь аптека"]
+        with ParserClient(addr, timeout=60000) as client:
+            docs = list(client.imap(utterances * 4, max_in_flight=8))
+    finally:
+        server.stop()
+        thread.join()
+
+    assert docs[0].stress == parser.process(Doc(utterances[0])).stress
+    assert isinstance(docs[1], Exception)
+    assert [doc.text for doc in docs[2::3]] == [docs[2].text] * 4
@@ -0,0 +1,30 @@
+import pytest
+import regex as re
+
+from multilingual_text_parser.utils.vocab_rewriter import VocabRewriter
+
+
+@pytest.mark.parametrize(
+    "text",
+    [" в на стр. 5 ", " гибели гибель и гибелью ", " на на на ", " стр стр. "],
+)
+def test_vocab_rewriter(text):
+    rules = [
+        (" на ", " ЪПпрЪна "),
+        (" стр. ", " страница "),
+        (" страница ", " страницу "),
+        ("ЪПпрЪ", "ЪПвнЪ"),
+        (" гибел* ", " ЪПрдЪгибел* "),
+        (" и ", " на "),
+    ]
+    expected = text
+    for key, value in rules:
+        if "*" in key:
+            expected = re.sub(
+                key.replace("*", r"(\w*)"), value.replace("*", "\\1"), expected
+            )
+        else:
+            expected = expected.replace(key, value)
+
+    rewriter = VocabRewriter(rules, wildcard="*")
+    assert rewriter.replace(text) == expected